@@ -0,0 +1,155 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from io import StringIO
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple
+import argparse
+import os
+
+from data_structures import Graph, Matching
+from find_maximum_matching import ALGORITHMS, find_maximum_matching
+from initial_matching import INITIAL_MATCHINGS
+from matrix_io import DEFAULT_OUTPUT_FORMATS, OUTPUT_FORMAT_EXTENSIONS, OUTPUT_FORMATS, sniff_graph_format, \
+    get_outfile_name, read_graph, write_matching
+
+# how many tasks to keep queued for each worker, so that the pool never runs dry but a stream of tens of thousands of
+# graphs is never all held in memory at once
+TASKS_PER_WORKER = 4
+
+
+def stream_results(executor: Executor, function: Callable, arguments: Iterable[Tuple], ordered: bool = True,
+                   window: int = TASKS_PER_WORKER * (os.cpu_count() or 1)) -> Iterator[Tuple[int, object]]:
+    """Call function on each tuple of arguments on the executor, yielding (index, result) pairs in the order of the
+    arguments if ordered is set and as they complete otherwise.  At most window calls are in flight at a time, and
+    the arguments are only read as calls finish, so they can be streamed from a generator"""
+    arguments = enumerate(arguments)
+    pending: Deque[Tuple[int, Future]] = deque()
+    running: Set[Future] = set()
+    future_indices = {}
+
+    def submit_next() -> bool:
+        next_arguments = next(arguments, None)
+        if next_arguments is None:
+            return False
+        index, function_arguments = next_arguments
+        future = executor.submit(function, *function_arguments)
+        if ordered:
+            pending.append((index, future))
+        running.add(future)
+        future_indices[future] = index
+        return True
+
+    while len(running) < window and submit_next():
+        pass
+    while running:
+        if ordered:
+            index, future = pending.popleft()
+            result = future.result()
+            running.discard(future)
+            del future_indices[future]
+            submit_next()
+            yield index, result
+        else:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.discard(future)
+                submit_next()
+                yield future_indices.pop(future), future.result()
+
+
+def find_maximum_matchings(graphs: Iterable[Graph], algorithm: str = "auto", initialiser: str = "empty",
+                           max_workers: Optional[int] = None, ordered: bool = True,
+                           executor: Optional[Executor] = None) -> Iterator[Tuple[int, Matching]]:
+    """
+    Find a maximum matching of every graph, yielding (index, matching) pairs where index is the position of the graph
+    in graphs.  The graphs are streamed through the given executor, or else a pool of max_workers processes that
+    lasts as long as the iteration, so there is no interpreter startup for each graph.  Matchings are yielded in the
+    order of the graphs if ordered is set, and as soon as each one is found otherwise.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    arguments = ((graph, algorithm, initialiser) for graph in graphs)
+    if executor is not None:
+        yield from stream_results(executor, find_maximum_matching, arguments, ordered, TASKS_PER_WORKER * workers)
+        return
+    with ProcessPoolExecutor(max_workers) as process_pool:
+        yield from stream_results(process_pool, find_maximum_matching, arguments, ordered, TASKS_PER_WORKER * workers)
+
+
+def match_graph_file(filename: str, algorithm: str, initialiser: str, output_format: Optional[str] = None) -> int:
+    """Read a graph file, find a maximum matching and write it next to the file, as the command line tool does.
+    Returns the size of the matching"""
+    with open(filename) as inhandle:
+        graph_format, graph_lines = sniff_graph_format(inhandle)
+        graph = read_graph(graph_lines, graph_format)
+    matching = find_maximum_matching(graph, algorithm, initialiser)
+    output_format = output_format or DEFAULT_OUTPUT_FORMATS[graph_format]
+    write_matching(matching, graph, output_format,
+                   get_outfile_name(filename, OUTPUT_FORMAT_EXTENSIONS[output_format]))
+    return len(matching)
+
+
+def match_graph_text(text: str, algorithm: str, initialiser: str) -> str:
+    """Find a maximum matching of a graph given as the text of a dense csv or an edge list, and return its matched
+    pairs of labels, one pair to a line"""
+    graph_format, graph_lines = sniff_graph_format(StringIO(text))
+    graph = read_graph(graph_lines, graph_format)
+    matching = find_maximum_matching(graph, algorithm, initialiser)
+    return "".join("{} {}\n".format(graph.labels.get_label(node), graph.labels.get_label(mate))
+                   for node, mate in matching.mates.items() if node < mate)
+
+
+def read_graph_blocks(inhandle) -> Iterator[str]:
+    """Split a file holding many graphs into the text of each one.  Graphs are separated by blank lines"""
+    block: List[str] = []
+    for line in inhandle:
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield "".join(block)
+            block = []
+    if block:
+        yield "".join(block)
+
+
+def list_graph_files(directory: str) -> List[str]:
+    """The graph files in a directory, skipping the matchings written by earlier runs"""
+    return [os.path.join(directory, filename) for filename in sorted(os.listdir(directory))
+            if os.path.isfile(os.path.join(directory, filename))
+            and not os.path.splitext(filename)[0].endswith("_matching")]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Calculate the maximal matchings of many graphs on a pool of workers")
+    parser.add_argument('--input', required=True,
+                        help="A directory of graph files, each of whose matchings is written next to it, or a file of "
+                             "graphs separated by blank lines, whose matchings are written to one file as blocks of "
+                             "matched pairs, each headed by a '# graph <index>' line")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS,
+                        help="For a directory, the format to write each matching in (default: as for a single graph)")
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default="auto",
+                        help="The augmenting path search to use (default: auto)")
+    parser.add_argument('--initialiser', choices=sorted(INITIAL_MATCHINGS), default="empty",
+                        help="The heuristic used to find a matching to start the search from (default: empty)")
+    parser.add_argument('--workers', type=int, help="The number of worker processes (default: one per cpu)")
+    parser.add_argument('--unordered', action='store_true',
+                        help="Report each graph as soon as it is matched rather than in order")
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(workers) as process_pool:
+        if os.path.isdir(args.input):
+            filenames = list_graph_files(args.input)
+            arguments = ((filename, args.algorithm, args.initialiser, args.output_format) for filename in filenames)
+            for index, matching_size in stream_results(process_pool, match_graph_file, arguments, not args.unordered,
+                                                       TASKS_PER_WORKER * workers):
+                print("{}: {} edges".format(filenames[index], matching_size))
+        else:
+            with open(args.input) as inhandle, \
+                    open(get_outfile_name(args.input, os.path.splitext(args.input)[1]), mode="w+") as outhandle:
+                arguments = ((text, args.algorithm, args.initialiser) for text in read_graph_blocks(inhandle))
+                for index, pairs in stream_results(process_pool, match_graph_text, arguments, not args.unordered,
+                                                   TASKS_PER_WORKER * workers):
+                    outhandle.write("# graph {}\n{}\n".format(index, pairs))
+
+
+if __name__ == "__main__":
+    main()
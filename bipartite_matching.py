@@ -0,0 +1,94 @@
+from collections import deque
+from typing import Dict, Optional
+
+from data_structures import *
+from matching_stats import MatchingStats
+
+
+def find_two_colouring(graph: Graph) -> Optional[Dict[str, bool]]:
+    """Colour the nodes of the graph with False and True so that every edge joins nodes of different colours, with a
+    breadth first search in O(V + E).  Returns None if the graph has an odd cycle, and so is not bipartite"""
+    colouring = {}
+    for start_node in graph.node_to_edges:
+        if start_node in colouring:
+            continue
+        colouring[start_node] = False
+        queue = deque([start_node])
+        while queue:
+            node = queue.popleft()
+            for neighbour in graph.get_neighbours(node):
+                if neighbour not in colouring:
+                    colouring[neighbour] = not colouring[node]
+                    queue.append(neighbour)
+                elif colouring[neighbour] == colouring[node]:
+                    return None
+    return colouring
+
+
+def find_shortest_augmenting_paths(graph: Graph, matching: Matching, colouring: Dict[str, bool],
+                                   stats: Optional[MatchingStats] = None) -> List[List[str]]:
+    """
+    One phase of the Hopcroft-Karp algorithm for a bipartite graph whose sides are given by the colouring.  A breadth
+    first search from the exposed nodes coloured False layers the graph by distance along alternating paths, and then a
+    depth first search along the layers finds a maximal set of vertex disjoint shortest augmenting paths.  Each phase
+    takes O(E), and only O(sqrt(V)) phases are needed before the matching is maximum.
+    """
+    mates = matching.mates
+    roots = [node for node in graph.node_to_edges if not colouring[node] and node not in mates]
+
+    # the layer of every node coloured False that can be reached, and the layer from which an exposed node coloured
+    # True is first reached, which is the length of the shortest augmenting paths
+    layers = {root: 0 for root in roots}
+    last_layer = None
+    queue = deque(roots)
+    while queue:
+        node = queue.popleft()
+        if last_layer is not None and layers[node] >= last_layer:
+            continue
+        if stats is not None:
+            stats.edges_scanned += graph.get_degree(node)
+        for neighbour in graph.get_neighbours(node):
+            mate = mates.get(neighbour)
+            if mate is None:
+                if last_layer is None:
+                    last_layer = layers[node]
+            elif mate not in layers:
+                layers[mate] = layers[node] + 1
+                queue.append(mate)
+    if last_layer is None:
+        return []
+
+    # nodes coloured False are retired from the search by moving them to layer -1, either because they are on a path
+    # that has been found or because every path onwards from them is a dead end
+    augmenting_paths = []
+    used_exposed_nodes = set()
+    for root in roots:
+        path = [root]
+        stack = [iter(graph.get_neighbours(root))]
+        while stack:
+            node = path[-1]
+            next_node = None
+            for neighbour in stack[-1]:
+                mate = mates.get(neighbour)
+                if mate is None:
+                    if layers[node] == last_layer and neighbour not in used_exposed_nodes:
+                        path.append(neighbour)
+                        break
+                elif layers.get(mate) == layers[node] + 1 and layers[node] < last_layer:
+                    next_node = mate
+                    path += [neighbour, mate]
+                    break
+            else:
+                # a dead end, so step back to the previous node coloured False
+                layers[node] = -1
+                stack.pop()
+                del path[-2:]
+                continue
+            if next_node is None:
+                augmenting_paths.append(path)
+                used_exposed_nodes.add(path[-1])
+                for path_node in path[::2]:
+                    layers[path_node] = -1
+                break
+            stack.append(iter(graph.get_neighbours(next_node)))
+    return augmenting_paths
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from array import array
+from typing import Hashable, Iterable, Iterator, List, Set, Tuple
+
+from data_structures import Edge, Graph, Matching, ReadOnlyAdjacency, ReadOnlyGraph
+
+
+class LabelTable:
+    """
+    An interning table that assigns each node label a dense integer id, in order of first appearance.
+
+    Fields
+    ======
+
+    labels: List[Hashable]
+        The label of every node, indexed by the node's id
+
+    label_to_id: Dict[Hashable, int]
+        The id assigned to every label
+    """
+    def __init__(self, labels: Iterable[Hashable] = ()):
+        self.labels = []
+        self.label_to_id = {}
+        for label in labels:
+            self.intern(label)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def intern(self, label: Hashable) -> int:
+        node_id = self.label_to_id.get(label)
+        if node_id is None:
+            node_id = len(self.labels)
+            self.label_to_id[label] = node_id
+            self.labels.append(label)
+        return node_id
+
+    def get_id(self, label: Hashable) -> int:
+        return self.label_to_id[label]
+
+    def get_label(self, node_id: int) -> Hashable:
+        return self.labels[node_id]
+
+    def matching_to_labels(self, matching: Matching) -> Matching:
+        """Translate a matching on node ids back into a matching on the original labels"""
+        return Matching.from_mates({self.labels[node]: self.labels[mate] for node, mate in matching.mates.items()})
+
+    def matching_to_ids(self, matching: Matching) -> Matching:
+        return Matching.from_mates({self.label_to_id[node]: self.label_to_id[mate]
+                                    for node, mate in matching.mates.items()})
+
+
+class _CSRAdjacency(ReadOnlyAdjacency):
+    """The adjacency of a CSRGraph, whose nodes are the ids 0, ..., n - 1"""
+
+    def __contains__(self, node) -> bool:
+        return isinstance(node, int) and 0 <= node < len(self)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self.graph.offsets) - 1
+
+
+class CSRGraph(ReadOnlyGraph):
+    """
+    A simple unweighted graph stored in compressed sparse row form.  Nodes are the dense integer ids
+    0, ..., n - 1, and the original node labels are kept in an interning table at the edge of the API.
+
+    Fields
+    ======
+
+    offsets: array
+        An array of n + 1 positions into neighbours.  The neighbours of node i are
+        neighbours[offsets[i]:offsets[i + 1]], in increasing order.  A graph loaded from a binary cache holds
+        memoryviews of the mapped file in place of the offsets and neighbours arrays
+
+    neighbours: array
+        The concatenated neighbour lists of all the nodes.  Every edge appears once in each direction
+
+    labels: LabelTable
+        The table translating between node ids and the original node labels
+
+    node_to_edges: Mapping[int, Set[int]]
+        A read-only view of the graph in the same shape as Graph.node_to_edges
+    """
+    def __init__(self, offsets: array, neighbours: array, labels: LabelTable):
+        if len(offsets) != len(labels) + 1:
+            raise ValueError("Expected {} offsets for {} labels but got {}".format(
+                len(labels) + 1, len(labels), len(offsets)))
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.labels = labels
+        self.node_to_edges = _CSRAdjacency(self)
+
+    def __getstate__(self) -> dict:
+        # a graph loaded by graph_cache.load_binary_graph holds memoryviews of a mapped file, which cannot be pickled
+        state = self.__dict__.copy()
+        if isinstance(self.offsets, memoryview):
+            state["offsets"], state["neighbours"] = array('q', self.offsets), array('i', self.neighbours)
+        return state
+
+    @classmethod
+    def from_id_pairs(cls, id_pairs: Iterable[Tuple[int, int]], labels: LabelTable) -> CSRGraph:
+        """Build the graph from a stream of (id, id) pairs.  Each pair may appear in either or both directions,
+        and self-loops are dropped"""
+        sources, targets = array('i'), array('i')
+        for first, second in id_pairs:
+            if first != second:
+                sources.append(first)
+                targets.append(second)
+        return cls._from_id_arrays(sources, targets, labels)
+
+    @classmethod
+    def from_labelled_pairs(cls, labelled_pairs: Iterable[Tuple[Hashable, Hashable]],
+                            labels: LabelTable = None) -> CSRGraph:
+        labels = LabelTable() if labels is None else labels
+        return cls.from_id_pairs(((labels.intern(first), labels.intern(second)) for first, second in labelled_pairs),
+                                 labels)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> CSRGraph:
+        labels = LabelTable(graph.node_to_edges)
+        return cls.from_id_pairs(((labels.label_to_id[node], labels.label_to_id[neighbour])
+                                  for node in graph.node_to_edges for neighbour in graph.get_neighbours(node)), labels)
+
+    @classmethod
+    def from_matrix(cls, matrix: List[List[int]]) -> CSRGraph:
+        """Like Graph.from_matrix, row i of the matrix becomes the node labelled str(i), which is given id i"""
+        return cls.from_id_pairs(((i, j) for i, row in enumerate(matrix) for j, value in enumerate(row) if value != 0),
+                                 LabelTable(str(i) for i in range(len(matrix))))
+
+    @classmethod
+    def from_edges(cls, edges: Set[Edge]) -> CSRGraph:
+        return cls.from_labelled_pairs((edge.node_one, edge.node_two) for edge in edges)
+
+    @classmethod
+    def _from_id_arrays(cls, sources: array, targets: array, labels: LabelTable) -> CSRGraph:
+        number_of_nodes = len(labels)
+        if sources and not 0 <= min(min(sources), min(targets)) <= max(max(sources), max(targets)) < number_of_nodes:
+            raise ValueError("Edges refer to node ids outside the {} labelled nodes".format(number_of_nodes))
+        degrees = array('q', bytes(8 * (number_of_nodes + 1)))
+        for node in sources:
+            degrees[node + 1] += 1
+        for node in targets:
+            degrees[node + 1] += 1
+        for node in range(number_of_nodes):
+            degrees[node + 1] += degrees[node]
+        # degrees now holds the offsets of the symmetrised, possibly duplicated, neighbour lists
+        cursors = array('q', degrees)
+        unsorted_neighbours = array('i', bytes(4 * degrees[number_of_nodes]))
+        for first, second in zip(sources, targets):
+            unsorted_neighbours[cursors[first]] = second
+            cursors[first] += 1
+            unsorted_neighbours[cursors[second]] = first
+            cursors[second] += 1
+
+        offsets, neighbours = array('q', [0]), array('i')
+        for node in range(number_of_nodes):
+            neighbours.extend(sorted(set(unsorted_neighbours[degrees[node]:degrees[node + 1]])))
+            offsets.append(len(neighbours))
+        return cls(offsets, neighbours, labels)
+
+    def get_neighbours(self, node: int) -> array:
+        return self.neighbours[self.offsets[node]:self.offsets[node + 1]]
+
+    def get_degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def get_nodes(self) -> Set[int]:
+        return set(range(len(self.labels)))
+
+    def get_edges(self) -> Set[Edge]:
+        return {Edge(node, neighbour) for node in range(len(self.labels))
+                for neighbour in self.get_neighbours(node) if node < neighbour}
+
+    def number_of_nodes(self) -> int:
+        return len(self.labels)
+
+    def number_of_edges(self) -> int:
+        return len(self.neighbours) // 2
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import Optional, List, Set, Dict
-from dataclasses import dataclass
-from copy import deepcopy
+from typing import Optional, List, Set, Dict, Iterable, Iterator, FrozenSet, Hashable, Tuple
+from collections.abc import Mapping
 
 
 class Edge:
     """
-    An edge of a graph
+    An edge of a graph.  Edges are created in large numbers, so they keep their two nodes in slots rather than in a
+    frozenset and a per-instance dictionary, and compare equal whichever way round the nodes were given
 
     Fields
     ======
@@ -21,90 +21,136 @@ class Edge:
     weight: float
         The weight of the edge
     """
+    __slots__ = ("node_one", "node_two", "weight")
+
     def __init__(self, node_one: str, node_two: str, weight: float = 1):
         if node_one == node_two:
             raise ValueError("Unable to create edge between nodes with identical label equal to: {}".format(node_one))
-        self.nodes = frozenset({node_one, node_two})
+        self.node_one = node_one
+        self.node_two = node_two
         self.weight = weight
 
-    def __key(self):
-        return self.nodes, self.weight
+    @property
+    def nodes(self) -> FrozenSet[str]:
+        return frozenset((self.node_one, self.node_two))
 
     def __hash__(self):
-        return hash((self.__key()))
+        first_hash, second_hash = hash(self.node_one), hash(self.node_two)
+        if first_hash > second_hash:
+            first_hash, second_hash = second_hash, first_hash
+        return hash((first_hash, second_hash, self.weight))
 
     def __eq__(self, other):
         if isinstance(other, Edge):
-            return self.__key() == other.__key()
+            return self.weight == other.weight and (
+                (self.node_one == other.node_one and self.node_two == other.node_two) or
+                (self.node_one == other.node_two and self.node_two == other.node_one))
         return NotImplemented
 
     def __str__(self):
         return "({}, {})".format(self.nodes, self.weight)
 
     def find_partner(self, query_node: str) -> str:
-        if query_node not in self.nodes:
-            raise ValueError("{} is not a node in edge")
-        for node in self.nodes:
-            if node != query_node:
-                return node
+        if query_node == self.node_one:
+            return self.node_two
+        if query_node == self.node_two:
+            return self.node_one
+        raise ValueError("{} is not a node in edge {}".format(query_node, self))
 
 
 class Matching:
     """
-    A matching on a graph
+    A matching on a graph, stored as a dictionary from each matched node to its partner so that nodes can be looked
+    up, and the matching augmented, without rebuilding any sets of edges
 
     Fields
     ======
 
-    edges: Set[Edge]
-        The edges in the matching
+    mates: Dict[str, str]
+        The partner of each matched node.  Every edge of the matching appears twice, once in each direction
     """
     def __init__(self, edges: Set[Edge]):
-        matching_node_list = [node for edge in edges for node in edge.nodes]
-        if len(matching_node_list) > len(set(matching_node_list)):
-            raise ValueError("Attempted to create a matching with invalid edge set!")
-        self.edges = edges
+        self.mates = {}
+        for edge in edges:
+            first_node, second_node = edge.node_one, edge.node_two
+            if first_node in self.mates or second_node in self.mates:
+                raise ValueError("Attempted to create a matching with invalid edge set!")
+            self.mates[first_node] = second_node
+            self.mates[second_node] = first_node
+        self._edges = frozenset(edges)
+
+    @classmethod
+    def from_mates(cls, mates: Dict[str, str]) -> Matching:
+        """Wrap a dictionary of partners, which must already be symmetric, without copying or validating it"""
+        matching = cls(set())
+        matching.mates = mates
+        matching._edges = None
+        return matching
 
     def __str__(self):
         return ", ".join([str(edge) for edge in self.edges])
 
+    def __len__(self) -> int:
+        return len(self.mates) // 2
+
+    @property
+    def edges(self) -> FrozenSet[Edge]:
+        """The edges in the matching, built on first use after each change to the matching"""
+        if self._edges is None:
+            self._edges = frozenset(Edge(node, mate) for node, mate in self.mates.items())
+        return self._edges
+
+    def copy(self) -> Matching:
+        return Matching.from_mates(self.mates.copy())
+
+    def mate(self, node: str) -> Optional[str]:
+        return self.mates.get(node)
+
+    def is_exposed(self, node: str) -> bool:
+        return node not in self.mates
+
+    def augment(self, path: List[str]) -> None:
+        """Flip the edges of an augmenting path in and out of the matching, in time proportional to its length.
+        Every node of the path is matched to its neighbour on the path's unmatched edges, which overwrites its
+        old partner"""
+        for i in range(0, len(path) - 1, 2):
+            self.mates[path[i]] = path[i + 1]
+            self.mates[path[i + 1]] = path[i]
+        self._edges = None
+
+    def unmatch(self, node: str) -> Optional[str]:
+        """Remove the edge covering the node from the matching, if there is one, and return the node's old partner"""
+        partner = self.mates.pop(node, None)
+        if partner is not None:
+            del self.mates[partner]
+            self._edges = None
+        return partner
+
     def get_nodes(self) -> Set[str]:
-        node_set = set()
-        for edge in self.edges:
-            node_set = node_set.union(edge.nodes)
-        return node_set
+        return set(self.mates)
 
     def matching_to_dictionary(self) -> Dict[str, str]:
-        matching_dict = {}
-        for edge in self.edges:
-            first_node, second_node = tuple(edge.nodes)
-            matching_dict[first_node] = second_node
-            matching_dict[second_node] = first_node
-        return matching_dict
+        return self.mates.copy()
 
     def contract_matching(self, blossom: Blossom) -> Matching:
+        """The matching on the graph with the blossom contracted.  At most one matched edge leaves a blossom, through
+        its stem, and that edge is redirected to the blossom's label"""
         blossom_nodes = blossom.get_nodes()
-        contracted_edges = set()
-        blossom_node = blossom.get_label()
-        for edge in self.edges:
-            if edge.nodes.intersection(blossom_nodes) == set():
-                contracted_edges.add(edge)
-            else:
-                if not edge.nodes.issubset(blossom_nodes):
-                    node_in_blossom = next(iter(edge.nodes.intersection(blossom_nodes)))
-                    partner = edge.find_partner(node_in_blossom)
-                    contracted_edges.add(Edge(blossom_node, partner))
-        return Matching(contracted_edges)
+        blossom_label = blossom.get_label()
+        contracted_mates = {}
+        for node, mate in self.mates.items():
+            if node not in blossom_nodes:
+                contracted_mates[node] = blossom_label if mate in blossom_nodes else mate
+            elif mate not in blossom_nodes:
+                contracted_mates[blossom_label] = mate
+        return Matching.from_mates(contracted_mates)
 
     def to_matrix(self, graph_size: int) -> List[List[int]]:
         """This method assumes that the nodes can be cast to ints, and so is most suitable for a matching on a graph
         whose nodes have been assigned default string-casted integers"""
         matching_matrix = [[0 for _ in range(graph_size)] for _ in range(graph_size)]
-        for edge in self.edges:
-            i, j = tuple(edge.nodes)
-            i, j = int(i), int(j)
-            matching_matrix[i][j] = 1
-            matching_matrix[j][i] = 1
+        for node, mate in self.mates.items():
+            matching_matrix[int(node)][int(mate)] = 1
         return matching_matrix
 
 
@@ -142,11 +188,8 @@ class Graph:
     def from_edges(cls, edges: Set[Edge]):
         node_to_edges_dict = {}
         for edge in edges:
-            for node in edge.nodes:
-                if node in node_to_edges_dict:
-                    node_to_edges_dict[node].add(edge.find_partner(node))
-                else:
-                    node_to_edges_dict[node] = {edge.find_partner(node)}
+            node_to_edges_dict.setdefault(edge.node_one, set()).add(edge.node_two)
+            node_to_edges_dict.setdefault(edge.node_two, set()).add(edge.node_one)
         return Graph(node_to_edges_dict)
 
     def get_edges(self) -> Set[Edge]:
@@ -159,18 +202,26 @@ class Graph:
     def get_nodes(self) -> Set[str]:
         return set(self.node_to_edges.keys())
 
+    def get_neighbours(self, node: str) -> Iterable[str]:
+        return self.node_to_edges[node]
+
+    def get_degree(self, node: str) -> int:
+        return len(self.node_to_edges[node])
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_to_edges)
+
+    def number_of_edges(self) -> int:
+        return sum(len(neighbours) for neighbours in self.node_to_edges.values()) // 2
+
     def get_exposed_nodes(self, matching: Matching) -> Set[str]:
-        unexposed_vertices = matching.get_nodes()
-        all_vertices = self.get_nodes()
-        return all_vertices.difference(unexposed_vertices)
+        return {node for node in self.node_to_edges if node not in matching.mates}
 
     def get_unmarked_edge(self, node: str, marked_edges: set[Edge]) -> Optional[Edge]:
-        edges_connected_to_node = {Edge(node, neighbouring_node) for neighbouring_node in
-                                   self.node_to_edges[node]}
-        unmarked_edges = edges_connected_to_node.difference(marked_edges)
-        if unmarked_edges == set():
-            return None
-        return next(iter(unmarked_edges))
+        """Return the first edge from the node that is not in marked_edges, or None if every edge is marked.  Edges are
+        built only as far as the first unmarked one, rather than for every neighbour of the node"""
+        return next((edge for edge in (Edge(node, neighbouring_node) for neighbouring_node in self.get_neighbours(node))
+                     if edge not in marked_edges), None)
 
     def contract_blossom(self, blossom: Blossom) -> Graph:
         blossom_nodes = blossom.get_nodes()
@@ -189,21 +240,211 @@ class Graph:
                     contracted_graph_dict[node] = self.node_to_edges[node]
         return Graph(contracted_graph_dict)
 
-    def delete_node(self, node_to_delete: str) -> Graph:
-        graph_dict = {}
-        for node in self.node_to_edges:
-            if node != node_to_delete:
-                graph_dict[node] = {neighbour for neighbour in self.node_to_edges[node] if neighbour != node_to_delete}
-        return Graph(graph_dict)
+    def add_node(self, node: str) -> None:
+        """Add an isolated node to the graph in place, if it is not already there"""
+        self.node_to_edges.setdefault(node, set())
+
+    def add_edge(self, node_one: str, node_two: str) -> None:
+        """Add an edge to the graph in place, adding either node if it is not already there"""
+        if node_one == node_two:
+            raise ValueError("Unable to create edge between nodes with identical label equal to: {}".format(node_one))
+        self.node_to_edges.setdefault(node_one, set()).add(node_two)
+        self.node_to_edges.setdefault(node_two, set()).add(node_one)
+
+    def remove_edge(self, node_one: str, node_two: str) -> None:
+        """Remove an edge from the graph in place, in constant time.  Unlike delete_edge, the nodes are kept"""
+        self.node_to_edges[node_one].remove(node_two)
+        self.node_to_edges[node_two].remove(node_one)
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and its edges from the graph in place, in time proportional to its degree"""
+        for neighbour in self.node_to_edges.pop(node):
+            self.node_to_edges[neighbour].discard(node)
+
+    def without(self, nodes: Iterable[str] = (), edges: Iterable[Edge] = ()) -> GraphView:
+        """A view of the graph with the given nodes and edges deleted, made without copying the graph"""
+        return GraphView(self, nodes, edges)
+
+    def delete_node(self, node_to_delete: str) -> GraphView:
+        return self.without((node_to_delete,))
+
+    def delete_edge(self, edge: Edge) -> GraphView:
+        """The graph without the edge and both of its nodes, as is left to match once the edge is in a matching"""
+        return self.without((edge.node_one, edge.node_two))
+
+
+class ReadOnlyAdjacency(Mapping):
+    """
+    A read-only dictionary view of a graph's adjacency, for graphs that do not store a dictionary of sets, so that
+    code written against Graph.node_to_edges keeps working.  Subclasses say which nodes are in the graph, and the
+    neighbours of a node are looked up with graph.get_neighbours.  Copying gives an ordinary dictionary of sets.
+
+    Fields
+    ======
+
+    graph: Graph
+        The graph whose adjacency this is
+    """
+    def __init__(self, graph: Graph):
+        self.graph = graph
+
+    def __getitem__(self, node: Hashable) -> Set:
+        if node not in self:
+            raise KeyError(node)
+        return set(self.graph.get_neighbours(node))
+
+    def copy(self) -> Dict[Hashable, Set]:
+        return {node: self[node] for node in self}
+
+    def __deepcopy__(self, memo) -> Dict[Hashable, Set]:
+        return self.copy()
+
+
+class _GraphViewAdjacency(ReadOnlyAdjacency):
+    """The adjacency of a GraphView: the nodes of its base graph that have not been deleted"""
+
+    def __contains__(self, node) -> bool:
+        return node in self.graph.base.node_to_edges and node not in self.graph.deleted_nodes
+
+    def __iter__(self) -> Iterator[str]:
+        deleted_nodes = self.graph.deleted_nodes
+        return (node for node in self.graph.base.node_to_edges if node not in deleted_nodes)
 
-    def delete_edge(self, edge: Edge) -> Graph:
-        edge_deleted_graph = Graph(deepcopy(self.node_to_edges))
-        for node in edge.nodes:
-            edge_deleted_graph = edge_deleted_graph.delete_node(node)
-        return edge_deleted_graph
+    def __len__(self) -> int:
+        return self.graph.base.number_of_nodes() - len(self.graph.deleted_nodes)
+
+
+class ReadOnlyGraph(Graph):
+    """
+    A graph that is not stored as a dictionary of sets, and so cannot be changed in place.  Graph's add_node,
+    add_edge, remove_edge and remove_node raise a TypeError rather than changing a throwaway copy of the adjacency.
+    Graph(graph.node_to_edges) makes an ordinary graph that can be changed.
+    """
+    def _read_only(self) -> TypeError:
+        return TypeError("A {} cannot be changed in place, copy it with Graph(graph.node_to_edges) first".format(
+            type(self).__name__))
+
+    def add_node(self, node: str) -> None:
+        raise self._read_only()
+
+    def add_edge(self, node_one: str, node_two: str) -> None:
+        raise self._read_only()
+
+    def remove_edge(self, node_one: str, node_two: str) -> None:
+        raise self._read_only()
+
+    def remove_node(self, node: str) -> None:
+        raise self._read_only()
+
+
+class GraphView(ReadOnlyGraph):
+    """
+    A read-only view of a graph with some of its nodes and edges deleted.  The view shares the graph it was made from
+    rather than copying it, and skips the deleted nodes and edges as neighbours are looked up, so it can be used
+    anywhere a Graph can.  Deleting from a view makes another view over the same base graph in O(1): the sets of
+    deleted nodes and edges are only gathered from the chain of views when the new view is first read.  As the base
+    graph is shared it must not be changed in place while views of it are in use, and Graph(view.node_to_edges) makes
+    an independent copy of a view.
+
+    Fields
+    ======
+
+    base: Graph
+        The graph the view is of
+
+    deleted_nodes: FrozenSet[str]
+        The nodes of base that are not in the view
+
+    node_to_edges: Mapping[str, Set[str]]
+        A read-only view of the graph in the same shape as Graph.node_to_edges
+    """
+    def __init__(self, base: Graph, deleted_nodes: Iterable[str] = (), deleted_edges: Iterable[Edge] = ()):
+        if isinstance(base, GraphView):
+            deleted_nodes = base.deleted_nodes.union(deleted_nodes)
+            deleted_pairs = base._get_deleted_pairs().union(GraphView._to_pairs(deleted_edges))
+            base = base.base
+        else:
+            deleted_pairs = GraphView._to_pairs(deleted_edges)
+        self.base = base
+        self._parent = None
+        self._deleted_nodes = frozenset(node for node in deleted_nodes if node in base.node_to_edges)
+        self._deleted_pairs = deleted_pairs
+        self.node_to_edges = _GraphViewAdjacency(self)
+
+    @staticmethod
+    def _to_pairs(edges: Iterable[Edge]) -> FrozenSet[Tuple[Hashable, Hashable]]:
+        """Deleted edges are kept as pairs of nodes in both orders, which are quicker to build and hash than Edges"""
+        pairs = set()
+        for edge in edges:
+            pairs.add((edge.node_one, edge.node_two))
+            pairs.add((edge.node_two, edge.node_one))
+        return frozenset(pairs)
+
+    def without(self, nodes: Iterable[str] = (), edges: Iterable[Edge] = ()) -> GraphView:
+        view = GraphView.__new__(GraphView)
+        view.base = self.base
+        view._parent = self
+        view._deleted_nodes = frozenset(nodes)
+        view._deleted_pairs = GraphView._to_pairs(edges)
+        view.node_to_edges = _GraphViewAdjacency(view)
+        return view
+
+    def _gather_deletions(self) -> None:
+        """Add the deletions of the views this one was made from to its own, from the oldest view down, so that a long
+        chain of views does not recurse"""
+        chain = []
+        view = self
+        while view._parent is not None:
+            chain.append(view)
+            view = view._parent
+        for view in reversed(chain):
+            parent = view._parent
+            view._deleted_nodes = parent._deleted_nodes.union(
+                node for node in view._deleted_nodes if node in view.base.node_to_edges)
+            view._deleted_pairs = parent._deleted_pairs.union(view._deleted_pairs)
+            view._parent = None
+
+    @property
+    def deleted_nodes(self) -> FrozenSet[str]:
+        if self._parent is not None:
+            self._gather_deletions()
+        return self._deleted_nodes
+
+    def _get_deleted_pairs(self) -> FrozenSet[Tuple[Hashable, Hashable]]:
+        if self._parent is not None:
+            self._gather_deletions()
+        return self._deleted_pairs
+
+    def get_neighbours(self, node: str) -> List[str]:
+        deleted_nodes = self.deleted_nodes
+        if node in deleted_nodes:
+            raise KeyError(node)
+        deleted_pairs = self._deleted_pairs
+        if deleted_pairs:
+            return [neighbour for neighbour in self.base.get_neighbours(node)
+                    if neighbour not in deleted_nodes and (node, neighbour) not in deleted_pairs]
+        return [neighbour for neighbour in self.base.get_neighbours(node) if neighbour not in deleted_nodes]
+
+    def get_degree(self, node: str) -> int:
+        return len(self.get_neighbours(node))
+
+
+class BlossomLabel:
+    """
+    The node that stands for a contracted blossom.  Every label is a distinct object numbered in order of creation,
+    so it is cheap to hash and can never be confused with a node of the original graph
+    """
+    __slots__ = ("id",)
+    _next_id = 0
+
+    def __init__(self):
+        self.id = BlossomLabel._next_id
+        BlossomLabel._next_id += 1
+
+    def __repr__(self):
+        return "blossom:{}".format(self.id)
 
 
-@dataclass
 class Blossom:
     """
     A data structure representing a blossom.  The class keeps track of the stem and the two branches that were joined by an
@@ -222,36 +463,61 @@ class Blossom:
 
     right_branch: List[str]
         The path from the stem to the other leaf
+
+    label: BlossomLabel
+        The node that replaces the blossom when it is contracted
+
+    nodes: FrozenSet[str]
+        Every node in the blossom, including the stem
     """
+    __slots__ = ("stem", "left_branch", "right_branch", "label", "nodes", "_branch_positions")
 
-    stem: str
-    left_branch: List[str]
-    right_branch: List[str]
+    def __init__(self, stem: str, left_branch: List[str], right_branch: List[str]):
+        self.stem = stem
+        self.left_branch = left_branch
+        self.right_branch = right_branch
+        self.label = BlossomLabel()
+        self.nodes = frozenset(left_branch).union(right_branch, (stem,))
+        # the branch containing each node, as True for the left branch, and the node's position in it
+        self._branch_positions = {node: (False, index) for index, node in enumerate(right_branch)}
+        self._branch_positions.update((node, (True, index)) for index, node in enumerate(left_branch))
 
-    def get_label(self):
-        return str(hash("".join(sorted(self.get_nodes()))))
+    def __repr__(self):
+        return "Blossom(stem={!r}, left_branch={!r}, right_branch={!r})".format(
+            self.stem, self.left_branch, self.right_branch)
 
-    def get_nodes(self) -> Set[str]:
-        return set(self.left_branch).union(set(self.right_branch)).union({self.stem})
+    def get_label(self) -> BlossomLabel:
+        return self.label
+
+    def get_nodes(self) -> FrozenSet[str]:
+        return self.nodes
 
     def get_branch(self, node: str) -> (List[str], List[str]):
         """Given a node, return a tuple where the first element
         is the branch containing the node, and the second element is the other branch"""
-        if node not in self.get_nodes():
+        if node not in self.nodes:
             raise ValueError("Node {} does not exist in blossom {}".format(node, self))
-        return (self.left_branch, self.right_branch) if node in self.left_branch else (self.right_branch, self.left_branch)
+        is_left, _ = self._branch_positions.get(node, (False, None))
+        return (self.left_branch, self.right_branch) if is_left else (self.right_branch, self.left_branch)
+
+    def _get_branch_position(self, node: str) -> (List[str], List[str], int):
+        """The branch containing the node, the other branch and the position of the node in its branch"""
+        if node not in self._branch_positions:
+            raise ValueError("Node {} is not on a branch of blossom {}".format(node, self))
+        is_left, index = self._branch_positions[node]
+        if is_left:
+            return self.left_branch, self.right_branch, index
+        return self.right_branch, self.left_branch, index
 
     def get_direct_path_from_stem(self, node: str) -> List[str]:
         """A 'direct' path goes directly from the stem to the node"""
-        branch, _ = self.get_branch(node)
-        return [self.stem] + branch[0:branch.index(node) + 1]
+        branch, _, node_index = self._get_branch_position(node)
+        return [self.stem] + branch[0:node_index + 1]
 
     def get_indirect_path_from_stem(self, node: str) -> List[str]:
         """An 'indirect' path goes from the stem down the branch not containing the node,
         then back up to the node via the branch that does contain the node"""
-        branch, other_branch = self.get_branch(node)
-
-        node_index = branch.index(node)
+        branch, other_branch, node_index = self._get_branch_position(node)
         if node_index == 0:
             return [self.stem] + other_branch + branch[::-1]
         return [self.stem] + other_branch + branch[:node_index - 1:-1]
@@ -273,45 +539,62 @@ class Tree(Graph):
     distance_to_root: Dict[str, int]
         A dictionary that keeps track of the distances from the root to all the nodes of the tree.
         This only gets updated when extend_tree is called
+
+    parents: Dict[str, str]
+        A dictionary from every node other than the root to its parent.  If it is not given on construction it is
+        worked out from node_to_edges and distance_to_root, and afterwards it only gets updated when extend_tree is
+        called
     """
-    def __init__(self, node_to_edges: Dict[str, Set[str]], root: str, distance_to_root: Dict[str, int]):
+    def __init__(self, node_to_edges: Dict[str, Set[str]], root: str, distance_to_root: Dict[str, int],
+                 parents: Optional[Dict[str, str]] = None):
         super(Tree, self).__init__(node_to_edges)
         self.root = root
         self.distance_to_root = distance_to_root
+        self.parents = self._find_parents() if parents is None else parents
+
+    def _find_parents(self) -> Dict[str, str]:
+        parents = {}
+        for node in self.node_to_edges:
+            if node != self.root:
+                candidate_parents = {neighbour for neighbour in self.node_to_edges[node]
+                                     if self.distance_to_root[neighbour] == self.distance_to_root[node] - 1}
+                if len(candidate_parents) != 1:
+                    raise ValueError("Node {} does not have a unique parent".format(node))
+                parents[node] = candidate_parents.pop()
+        return parents
 
     def is_distance_to_root_even(self, node: str) -> bool:
         return self.distance_to_root[node] % 2 == 0
 
     def get_parent(self, node: str) -> str:
-        parents = set(filter(lambda neighbour: self.distance_to_root[neighbour] == self.distance_to_root[node] - 1,
-                        self.node_to_edges[node]))
-        if len(parents) > 1:
-            raise ValueError("Node {} does not have a unique parent".format(node))
-        return parents.pop()
+        return self.parents[node]
 
     def path_to_root(self, node: str) -> List[str]:
         path = [node]
         current_node = node
         while current_node != self.root:
-            parent = self.get_parent(current_node)
-            path.append(parent)
-            current_node = parent
+            current_node = self.parents[current_node]
+            path.append(current_node)
         return path
 
     def find_blossom(self, first_node: str, second_node: str) -> Blossom:
-        root_to_first_path, root_to_second_path = self.path_to_root(first_node)[::-1], self.path_to_root(second_node)[
-                                                                                       ::-1]
-        try:
-            first_divergence = next(
-            i for (i, (a, b)) in enumerate(zip(root_to_first_path, root_to_second_path)) if a != b)
-            return Blossom(root_to_first_path[first_divergence - 1], root_to_first_path[first_divergence:],
-                           root_to_second_path[first_divergence:])
-        # if the two paths never diverge, then one must be a subset of the other
-        except StopIteration:
-            long_path, short_path = (root_to_first_path, root_to_second_path) if len(root_to_first_path) > len(
-                root_to_second_path) else (root_to_second_path, root_to_first_path)
-            stem_index = len(short_path) - 1
-            return Blossom(long_path[stem_index], long_path[stem_index + 1:], [])
+        """Walk up from both nodes in lockstep, once the deeper one has caught up, until they meet at the stem.
+        This only visits the nodes of the blossom, however deep it is in the tree"""
+        first_branch, second_branch = [], []
+        while self.distance_to_root[first_node] > self.distance_to_root[second_node]:
+            first_branch.append(first_node)
+            first_node = self.parents[first_node]
+        while self.distance_to_root[second_node] > self.distance_to_root[first_node]:
+            second_branch.append(second_node)
+            second_node = self.parents[second_node]
+        while first_node != second_node:
+            first_branch.append(first_node)
+            second_branch.append(second_node)
+            first_node, second_node = self.parents[first_node], self.parents[second_node]
+        # if one node is an ancestor of the other, the whole blossom is a single branch
+        if not first_branch:
+            return Blossom(first_node, second_branch[::-1], [])
+        return Blossom(first_node, first_branch[::-1], second_branch[::-1])
 
 
 class Forest:
@@ -354,6 +637,7 @@ class Forest:
             tree.node_to_edges[parent].add(new_node)
         tree.node_to_edges[new_node] = {parent}
         tree.distance_to_root[new_node] = tree.distance_to_root[parent] + 1
+        tree.parents[new_node] = parent
         self.node_to_tree_dict[new_node] = tree
 
     def is_distance_to_root_even(self, node: str) -> bool:
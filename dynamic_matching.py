@@ -0,0 +1,74 @@
+from data_structures import *
+from find_maximum_matching import augment_matching_with_path, choose_augmenting_path_finder, find_maximum_matching
+from matching_stats import MatchingStats, timed
+
+
+class DynamicMatcher:
+    """
+    A graph and a maximum matching of it, both updated in place as edges and vertices are added and removed.
+
+    A single update changes the size of a maximum matching by at most one, so after each update the matching is
+    repaired with at most one augmenting path search, warm started from the previous matching, rather than being
+    found again from scratch:
+
+      * adding a vertex, or removing an edge or vertex that is not matched, leaves the matching maximum
+      * adding an edge can only create augmenting paths that use it, and one augmentation makes the matching maximum
+        again.  If both ends are exposed the edge is matched without any search
+      * removing a matched edge or vertex exposes one or two nodes and loses one edge, which at most one augmenting
+        path can win back
+
+    Fields
+    ======
+
+    graph: Graph
+        The current graph, a copy of the one the matcher was created with
+
+    matching: Matching
+        A maximum matching of the current graph
+
+    algorithm: str
+        The augmenting path search used to repair the matching, one of ALGORITHMS.  For "auto" the graph is checked for
+        being bipartite again before every repair, as updates can change that
+
+    stats: Optional[MatchingStats]
+        If given, collects counters and timings for every search, including the one that finds the first matching
+    """
+    def __init__(self, graph: Graph, algorithm: str = "edmonds", initialiser: str = "empty",
+                 stats: Optional[MatchingStats] = None):
+        self.graph = Graph({node: set(graph.get_neighbours(node)) for node in graph.node_to_edges})
+        self.algorithm = algorithm
+        self.stats = stats
+        self.matching = find_maximum_matching(self.graph, algorithm, initialiser, stats=stats)
+
+    def add_vertex(self, node: str) -> None:
+        self.graph.add_node(node)
+
+    def add_edge(self, node_one: str, node_two: str) -> None:
+        self.graph.add_edge(node_one, node_two)
+        if self.matching.is_exposed(node_one) and self.matching.is_exposed(node_two):
+            augment_matching_with_path(self.matching, [node_one, node_two])
+        else:
+            self._repair()
+
+    def remove_edge(self, node_one: str, node_two: str) -> None:
+        self.graph.remove_edge(node_one, node_two)
+        if self.matching.mate(node_one) == node_two:
+            self.matching.unmatch(node_one)
+            self._repair()
+
+    def remove_vertex(self, node: str) -> None:
+        self.graph.remove_node(node)
+        if self.matching.unmatch(node) is not None:
+            self._repair()
+
+    def _repair(self) -> None:
+        """Augment the matching along an augmenting path, if one exists.  Each update needs at most one"""
+        find_augmenting_paths = choose_augmenting_path_finder(self.graph, self.algorithm, self.stats)
+        with timed(self.stats, "search"):
+            augmenting_paths = find_augmenting_paths(self.graph, self.matching, self.stats)
+        if self.stats is not None:
+            self.stats.searches += 1
+            self.stats.augmentations += len(augmenting_paths)
+        with timed(self.stats, "augment"):
+            for augmenting_path in augmenting_paths:
+                augment_matching_with_path(self.matching, augmenting_path)
@@ -1,18 +1,22 @@
 from data_structures import *
-from copy import deepcopy
+from collections import deque
+from matching_stats import MatchingStats, timed
 
 
 def lift_path(augmenting_path: List[str], blossom: Blossom, forest: Forest, graph: Graph) -> List[str]:
-    if blossom.get_label() not in augmenting_path:
+    blossom_label = blossom.get_label()
+    if blossom_label not in augmenting_path:
         return augmenting_path
     else:
-        if augmenting_path.index(blossom.get_label()) % 2 == 0:
+        blossom_index = augmenting_path.index(blossom_label)
+        if blossom_index % 2 == 0:
             correctly_oriented_path = augmenting_path
         else:
             correctly_oriented_path = augmenting_path[::-1]
-        blossom_index = correctly_oriented_path.index(blossom.get_label())
+            blossom_index = len(augmenting_path) - 1 - blossom_index
         node_outside_blossom = correctly_oriented_path[blossom_index + 1]
-        partner_node_in_blossom = next(node for node in graph.node_to_edges[node_outside_blossom] if node in blossom.get_nodes())
+        blossom_nodes = blossom.get_nodes()
+        partner_node_in_blossom = next(node for node in graph.get_neighbours(node_outside_blossom) if node in blossom_nodes)
         relevant_tree = forest.node_to_tree_dict[blossom.stem]
         if relevant_tree.is_distance_to_root_even(partner_node_in_blossom):
             if partner_node_in_blossom == blossom.stem:
@@ -24,20 +28,24 @@ def lift_path(augmenting_path: List[str], blossom: Blossom, forest: Forest, grap
         return correctly_oriented_path[0: blossom_index] + path_to_add + correctly_oriented_path[blossom_index + 1:]
 
 
-def find_augmenting_path(graph: Graph, matching: Matching) -> List[str]:
-    matching_dict = matching.matching_to_dictionary()
-    marked_nodes = set()
-    marked_edges = deepcopy(matching.edges)
-    forest = Forest({Tree({node: set()}, node, {node: 0}) for node in graph.get_exposed_nodes(matching)})
+def find_augmenting_path(graph: Graph, matching: Matching, stats: Optional[MatchingStats] = None) -> List[str]:
+    matching_dict = matching.mates
+    exposed_nodes = graph.get_exposed_nodes(matching)
+    forest = Forest({Tree({node: set()}, node, {node: 0}) for node in exposed_nodes})
+    # a worklist of the nodes at an even distance from their roots, each of which has its edges scanned exactly once.
+    # Edges to odd nodes (which include every matched edge) need no marking as odd nodes are never scanned
+    even_nodes = deque(exposed_nodes)
 
-    while (relevant_nodes := forest.get_relevant_nodes(marked_nodes)) != set():
-        v = next(iter(relevant_nodes))
-        while (e := graph.get_unmarked_edge(v, marked_edges)) is not None:
-            w = e.find_partner(v)
-            if w not in forest.get_nodes():
+    while even_nodes:
+        v = even_nodes.popleft()
+        if stats is not None:
+            stats.edges_scanned += graph.get_degree(v)
+        for w in graph.get_neighbours(v):
+            if w not in forest.node_to_tree_dict:
                 x = matching_dict[w]
                 forest.extend_tree(v, w)
                 forest.extend_tree(w, x)
+                even_nodes.append(x)
             else:
                 if not forest.node_to_tree_dict[w].is_distance_to_root_even(w):
                     pass
@@ -48,10 +56,14 @@ def find_augmenting_path(graph: Graph, matching: Matching) -> List[str]:
                         return v_path[::-1] + w_path
                     else:
                         blossom = forest.node_to_tree_dict[v].find_blossom(v, w)
-                        contracted_graph = graph.contract_blossom(blossom)
-                        contracted_matching = matching.contract_matching(blossom)
-                        contracted_path = find_augmenting_path(contracted_graph, contracted_matching)
-                        return lift_path(contracted_path, blossom, forest, graph)
-            marked_edges.add(e)
-        marked_nodes.add(v)
+                        with timed(stats, "contract"):
+                            contracted_graph = graph.contract_blossom(blossom)
+                            contracted_matching = matching.contract_matching(blossom)
+                        if stats is not None:
+                            stats.enter_blossom()
+                        contracted_path = find_augmenting_path(contracted_graph, contracted_matching, stats)
+                        if stats is not None:
+                            stats.leave_blossom()
+                        with timed(stats, "lift"):
+                            return lift_path(contracted_path, blossom, forest, graph)
     return []
@@ -0,0 +1,168 @@
+from data_structures import *
+from matching_stats import MatchingStats
+
+EVEN, ODD = 0, 1
+
+
+class _BlossomBases:
+    """
+    A union-find structure recording which blossom each node has been absorbed into.  Blossoms are never
+    contracted into new graphs, instead every node in a blossom points (via find) to the blossom's base.
+
+    Fields
+    ======
+
+    parent: Dict[str, str]
+        The union-find parent of each node.  A node that is its own parent is the base of its blossom
+    """
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, node: str) -> str:
+        parent = self.parent.get(node, node)
+        if parent == node:
+            return node
+        root = parent
+        while (next_root := self.parent.get(root, root)) != root:
+            root = next_root
+        while (next_node := self.parent.get(node, node)) != root:
+            self.parent[node] = root
+            node = next_node
+        return root
+
+    def absorb(self, node: str, base: str) -> None:
+        """Attach node, which must be the base of its own blossom, to the blossom with base 'base'"""
+        self.parent[node] = base
+
+
+def _path_to_root(node: str, mates: Dict[str, str], parents: Dict[str, str]) -> List[str]:
+    """Walk from an even node to the root of its tree, leaving every even node by its matched edge and every
+    odd node by its parent pointer.  Blossom formation rewrites the parent pointers of nodes inside a blossom
+    so that this walk expands the blossom in place"""
+    path = [node]
+    while (mate := mates.get(node)) is not None:
+        node = parents[mate]
+        path.append(mate)
+        path.append(node)
+    return path
+
+
+def _find_base_of_blossom(first_node: str, second_node: str, bases: _BlossomBases, mates: Dict[str, str],
+                          parents: Dict[str, str]) -> str:
+    """Walk up from both nodes in lockstep until one walk reaches a blossom base the other has already visited"""
+    visited = set()
+    nodes = [first_node, second_node]
+    while True:
+        for i, node in enumerate(nodes):
+            if node is None:
+                continue
+            base = bases.find(node)
+            if base in visited:
+                return base
+            visited.add(base)
+            mate = mates.get(base)
+            nodes[i] = None if mate is None else parents[mate]
+
+
+def _mark_blossom(node: str, neighbour: str, base: str, bases: _BlossomBases, mates: Dict[str, str],
+                  parents: Dict[str, str], labels: Dict[str, int], queue: List[str]) -> None:
+    """Absorb the path from node up to base into the blossom, pointing every node on it back across the edge
+    (node, neighbour) which closed the blossom.  Odd nodes on the path become even and are queued for scanning"""
+    while bases.find(node) != base:
+        parents[node] = neighbour
+        neighbour = mates[node]
+        if labels[neighbour] == ODD:
+            labels[neighbour] = EVEN
+            queue.append(neighbour)
+        if bases.find(node) == node:
+            bases.absorb(node, base)
+        if bases.find(neighbour) == neighbour:
+            bases.absorb(neighbour, base)
+        node = parents[neighbour]
+
+
+def _grow_forest(graph: Graph, matching: Matching, find_all: bool,
+                 stats: Optional[MatchingStats]) -> List[List[str]]:
+    """Grow an alternating forest from every exposed node in breadth first order.  When find_all is set, the
+    search carries on after finding an augmenting path, ignoring the two whole trees the path joined, so that the
+    paths it returns are vertex disjoint.  Ignoring whole trees can hide paths that only meet the ones found in
+    nodes off those paths, so the set of paths is not necessarily maximal"""
+    mates = matching.mates
+    parents = {}
+    labels = {}
+    roots = {}
+    used_roots = set()
+    bases = _BlossomBases()
+    queue = []
+    augmenting_paths = []
+    for node in graph.get_exposed_nodes(matching):
+        labels[node] = EVEN
+        roots[node] = node
+        queue.append(node)
+
+    queue_position = 0
+    while queue_position < len(queue):
+        v = queue[queue_position]
+        queue_position += 1
+        if roots[v] in used_roots:
+            continue
+        if stats is not None:
+            stats.edges_scanned += graph.get_degree(v)
+        for w in graph.get_neighbours(v):
+            w_label = labels.get(w)
+            if w_label is None:
+                x = mates[w]
+                labels[w], labels[x] = ODD, EVEN
+                roots[w] = roots[x] = roots[v]
+                parents[w] = v
+                queue.append(x)
+            elif w_label == EVEN:
+                if roots[v] != roots[w]:
+                    if roots[w] in used_roots:
+                        continue
+                    augmenting_paths.append(_path_to_root(v, mates, parents)[::-1] + _path_to_root(w, mates, parents))
+                    if not find_all:
+                        return augmenting_paths
+                    used_roots.update((roots[v], roots[w]))
+                    break
+                base = bases.find(v)
+                if base != bases.find(w):
+                    if stats is not None:
+                        stats.blossoms += 1
+                    base = _find_base_of_blossom(v, w, bases, mates, parents)
+                    _mark_blossom(v, w, base, bases, mates, parents, labels, queue)
+                    _mark_blossom(w, v, base, bases, mates, parents, labels, queue)
+    return augmenting_paths
+
+
+def find_augmenting_path_implicit(graph: Graph, matching: Matching,
+                                  stats: Optional[MatchingStats] = None) -> List[str]:
+    """
+    Find an augmenting path by growing a single alternating forest from every exposed node.  Unlike
+    find_augmenting_path, blossoms are never contracted into a copy of the graph: nodes are absorbed into their
+    blossom's base with a union-find structure, and the path is expanded through blossoms by following parent
+    pointers, so one call costs O(E) up to the inverse Ackermann factor of the union-find.
+    """
+    augmenting_paths = _grow_forest(graph, matching, False, stats)
+    return augmenting_paths[0] if augmenting_paths else []
+
+
+def find_disjoint_augmenting_paths(graph: Graph, matching: Matching,
+                                   stats: Optional[MatchingStats] = None) -> List[List[str]]:
+    """
+    Find a maximal set of vertex disjoint augmenting paths, so that every other augmenting path meets one of them.  A
+    single search skips the whole trees joined by each path it finds, which can hide paths through the rest of those
+    trees, so the search is repeated on the graph without the nodes of the paths found so far until it finds none.
+    Each search takes O(E), and usually only the first finds more than a few paths.  The paths are not necessarily
+    shortest ones, so unlike a Hopcroft-Karp or Micali-Vazirani phase there is no bound on the number of sets needed
+    beyond one per augmentation.  An empty list means the matching is maximum.
+    """
+    augmenting_paths = []
+    search_graph = graph
+    while True:
+        new_paths = _grow_forest(search_graph, matching, True, stats)
+        if not new_paths:
+            return augmenting_paths
+        augmenting_paths.extend(new_paths)
+        # every matched node on a path has its mate on the same path, so the rest of the matching is left intact
+        search_graph = search_graph.without([node for augmenting_path in new_paths for node in augmenting_path])
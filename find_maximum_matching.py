@@ -1,34 +1,245 @@
+from bipartite_matching import find_shortest_augmenting_paths, find_two_colouring
 from data_structures import *
 from find_augmenting_path import find_augmenting_path
+from find_augmenting_path_implicit import find_augmenting_path_implicit, find_disjoint_augmenting_paths
+from graph_cache import convert_graph, get_cache_name, read_graph_with_cache
+from initial_matching import INITIAL_MATCHINGS
+from kernelization import Kernel, find_kernel
+from matching_stats import MatchingStats, timed
 from matrix_io import *
+from weighted_matching import find_maximum_weight_matching, find_maximum_weight_perfect_matching, \
+    get_matching_weight
+from typing import Callable
 import argparse
+import sys
 
 
 def augment_matching_with_path(matching: Matching, path: List[str]) -> Matching:
-    matched_edges_in_path = {Edge(path[i], path[i + 1]) for i in range(len(path) - 1)}
-    return Matching(
-        matching.edges.difference(matched_edges_in_path).union(matched_edges_in_path.difference(matching.edges)))
+    """Flip the edges of the augmenting path in and out of the matching.  The matching is updated in place, and
+    returned for convenience"""
+    matching.augment(path)
+    return matching
 
 
-def find_maximum_matching_with_matching(graph: Graph, matching: Matching) -> Matching:
-    augmenting_path = find_augmenting_path(graph, matching)
-    if not augmenting_path:
-        return matching
+def _one_path_per_search(find_path: Callable[[Graph, Matching, Optional[MatchingStats]], List[str]]
+                         ) -> Callable[[Graph, Matching, Optional[MatchingStats]], List[List[str]]]:
+    def find_paths(graph: Graph, matching: Matching, stats: Optional[MatchingStats] = None) -> List[List[str]]:
+        augmenting_path = find_path(graph, matching, stats)
+        return [augmenting_path] if augmenting_path else []
+    return find_paths
+
+
+# Each algorithm returns a list of vertex disjoint augmenting paths for the matching, which is empty when the matching
+# is maximum.  "edmonds" contracts each blossom into a new graph and recurses, "gabow" keeps blossoms implicit in a
+# union-find, and "phases" repeats the "gabow" search to augment along a maximal set of disjoint paths at a time,
+# which unlike a Hopcroft-Karp phase need not be shortest paths
+AUGMENTING_PATH_FINDERS = {
+    "edmonds": _one_path_per_search(find_augmenting_path),
+    "gabow": _one_path_per_search(find_augmenting_path_implicit),
+    "phases": find_disjoint_augmenting_paths,
+}
+
+# As well as the AUGMENTING_PATH_FINDERS, "hopcroft-karp" searches a bipartite graph in phases of shortest augmenting
+# paths, taking O(E sqrt(V)) in all, and "auto" runs it if the graph is bipartite and falls back to "gabow" if not
+ALGORITHMS = ("auto", "hopcroft-karp") + tuple(sorted(AUGMENTING_PATH_FINDERS))
+
+FALLBACK_ALGORITHM = "gabow"
+
+
+def choose_augmenting_path_finder(graph: Graph, algorithm: str, stats: Optional[MatchingStats] = None
+                                  ) -> Callable[[Graph, Matching, Optional[MatchingStats]], List[List[str]]]:
+    """Look up the augmenting path search for one of the ALGORITHMS, two-colouring the graph first if the algorithm
+    needs to know whether it is bipartite.  The search chosen is recorded in stats.engine"""
+    if algorithm in AUGMENTING_PATH_FINDERS:
+        engine = algorithm
     else:
-        return find_maximum_matching_with_matching(graph, augment_matching_with_path(matching, augmenting_path))
+        with timed(stats, "colour"):
+            colouring = find_two_colouring(graph)
+        if colouring is not None:
+            engine = "hopcroft-karp"
+        elif algorithm == "hopcroft-karp":
+            raise ValueError("The hopcroft-karp algorithm needs a bipartite graph, but the graph has an odd cycle")
+        else:
+            engine = FALLBACK_ALGORITHM
+    if stats is not None:
+        stats.engine = engine
+    if engine != "hopcroft-karp":
+        return AUGMENTING_PATH_FINDERS[engine]
+
+    def find_paths(graph: Graph, matching: Matching, stats: Optional[MatchingStats] = None) -> List[List[str]]:
+        return find_shortest_augmenting_paths(graph, matching, colouring, stats)
+    return find_paths
+
+
+def find_maximum_matching_with_matching(graph: Graph, matching: Matching, algorithm: str = "auto",
+                                        on_augmentation: Optional[Callable[[Matching, List[str]], None]] = None,
+                                        stats: Optional[MatchingStats] = None) -> Matching:
+    """Repeatedly augment a copy of the matching until no augmenting path remains.  If given, on_augmentation is
+    called with the matching and the path after every augmentation, for example to report progress on long runs,
+    and stats collects counters and timings for the whole run"""
+    find_augmenting_paths = choose_augmenting_path_finder(graph, algorithm, stats)
+    matching = matching.copy()
+    if stats is not None:
+        stats.initial_matching_size = len(matching)
+    while True:
+        with timed(stats, "search"):
+            augmenting_paths = find_augmenting_paths(graph, matching, stats)
+        if stats is not None:
+            stats.searches += 1
+            stats.augmentations += len(augmenting_paths)
+        if not augmenting_paths:
+            return matching
+        with timed(stats, "augment"):
+            for augmenting_path in augmenting_paths:
+                augment_matching_with_path(matching, augmenting_path)
+                if on_augmentation is not None:
+                    on_augmentation(matching, augmenting_path)
 
 
-def find_maximum_matching(graph: Graph) -> Matching:
-    return find_maximum_matching_with_matching(graph, Matching(set()))
+def find_kernel_with_stats(graph: Graph, stats: Optional[MatchingStats] = None) -> Kernel:
+    with timed(stats, "kernelize"):
+        kernel = find_kernel(graph)
+    if stats is not None:
+        stats.kernel_nodes_removed = kernel.original_nodes - kernel.graph.number_of_nodes()
+        stats.kernel_edges_removed = kernel.original_edges - kernel.graph.number_of_edges()
+    return kernel
+
+
+def find_maximum_matching(graph: Graph, algorithm: str = "auto", initialiser: str = "empty",
+                          on_augmentation: Optional[Callable[[Matching, List[str]], None]] = None,
+                          stats: Optional[MatchingStats] = None, kernelize: bool = False) -> Matching:
+    """Find a maximum matching, starting the search from the matching found by one of the INITIAL_MATCHINGS
+    heuristics.  A good initial matching leaves far fewer augmenting paths for the algorithm to find.  If kernelize is
+    set, the graph is first shrunk by the reductions of kernelization.find_kernel, the search runs on the kernel (so
+    on_augmentation sees the kernel's matching and paths), and the result is lifted back to the original graph.  By
+    default bipartite graphs are searched with "hopcroft-karp" and others with "gabow", see ALGORITHMS"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unknown algorithm {}, expected one of {}".format(algorithm, list(ALGORITHMS)))
+    if initialiser not in INITIAL_MATCHINGS:
+        raise ValueError("Unknown initialiser {}, expected one of {}".format(initialiser, sorted(INITIAL_MATCHINGS)))
+    if kernelize:
+        kernel = find_kernel_with_stats(graph, stats)
+        kernel_matching = find_maximum_matching(kernel.graph, algorithm, initialiser, on_augmentation, stats)
+        with timed(stats, "kernelize"):
+            return kernel.lift(kernel_matching)
+    with timed(stats, "initialise"):
+        initial_matching = INITIAL_MATCHINGS[initialiser](graph)
+    return find_maximum_matching_with_matching(graph, initial_matching, algorithm, on_augmentation, stats)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Calculate the maximal matching of a graph")
+    parser.add_argument('--graph', '--graphcsv', dest='graph', type=argparse.FileType('r'), required=True,
+                        help="The file containing the graph, as a csv adjacency matrix, an edge list or a Matrix "
+                             "Market coordinate file")
+    parser.add_argument('--format', choices=("auto",) + GRAPH_FORMATS, default="auto",
+                        help="The format of the graph file (default: detected from its contents)")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS,
+                        help="The format to write the matching in (default: matrix for csv adjacency matrices, pairs "
+                             "of labels for edge lists and matrix-market for Matrix Market files)")
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default="auto",
+                        help="The augmenting path search to use.  auto uses hopcroft-karp if the graph is bipartite "
+                             "and gabow otherwise (default: auto)")
+    parser.add_argument('--initialiser', choices=sorted(INITIAL_MATCHINGS), default="empty",
+                        help="The heuristic used to find a matching to start the search from (default: empty)")
+    parser.add_argument('--stats', action='store_true',
+                        help="Print counters and timings for the search to stderr")
+    parser.add_argument('--kernelize', action='store_true',
+                        help="Shrink the graph by matching pendant nodes and folding nodes of degree two before the "
+                             "search, and report how much it shrank")
+    parser.add_argument('--workers', type=int,
+                        help="Match the connected components of the graph in parallel on this many processes")
+    parser.add_argument('--weighted', action='store_true',
+                        help="Read edge weights from the graph, the entries of a csv matrix or the third field of an "
+                             "edge list, and find a maximum weight matching.  The search options are ignored")
+    parser.add_argument('--perfect', action='store_true',
+                        help="With --weighted, find the heaviest matching that covers every node")
+    parser.add_argument('--convert', action='store_true',
+                        help="Write the graph in a binary form next to the graph file, with the extension .csr, and "
+                             "exit.  Later runs map the binary graph into memory instead of parsing the file, for as "
+                             "long as the file is unchanged")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Parse the graph file even if there is an up to date binary form of it")
+    parser.add_argument('--matching-cache',
+                        help="A directory of matchings found by earlier runs.  A graph that has been matched before is "
+                             "not searched again, and every new matching is added to the directory")
+    args = parser.parse_args(argv)
+    if args.perfect and not args.weighted:
+        parser.error("--perfect can only be used with --weighted")
+    if args.convert and args.graph is sys.stdin:
+        parser.error("--convert needs a graph file, not stdin")
+    if args.workers is not None and args.matching_cache is not None:
+        parser.error("--matching-cache cannot be used with --workers, which matches each component separately")
+    # the sniffed lines are buffered rather than the file rewound, so that the graph can be read from stdin
+    inhandle = args.graph
+    if args.format == "auto":
+        graph_format, inhandle = sniff_graph_format(args.graph, args.weighted)
+    else:
+        graph_format = args.format
+    if args.convert:
+        args.graph.close()
+        graph = convert_graph(args.graph.name, graph_format)
+        print("Wrote {} nodes and {} edges to {}".format(graph.number_of_nodes(), graph.number_of_edges(),
+                                                         get_cache_name(args.graph.name)), file=sys.stderr)
+        return
+    output_format = args.output_format or DEFAULT_OUTPUT_FORMATS[graph_format]
+    # a graph read from stdin has no file to write the matching next to, so it is written to stdout
+    if args.graph is sys.stdin:
+        outfile = STDOUT_NAME
+    else:
+        outfile = get_outfile_name(args.graph.name, OUTPUT_FORMAT_EXTENSIONS[output_format])
+    if args.weighted:
+        graph, weighted_edges = read_weighted_graph(inhandle, graph_format)
+        if args.perfect:
+            weighted_matching = find_maximum_weight_perfect_matching(weighted_edges,
+                                                                     range(graph.number_of_nodes()))
+        else:
+            weighted_matching = find_maximum_weight_matching(weighted_edges)
+        print("The matching has {} edges and weight {}".format(
+            len(weighted_matching), get_matching_weight(weighted_matching, weighted_edges)), file=sys.stderr)
+        write_matching(weighted_matching, graph, output_format, outfile)
+        return
+    if args.no_cache or args.graph is sys.stdin:
+        graph = read_graph(inhandle, graph_format)
+    else:
+        args.graph.close()
+        graph = read_graph_with_cache(args.graph.name, graph_format)
+    # the initialiser is reported from the statistics, so they are collected whenever it is used
+    stats = MatchingStats() if args.stats or args.initialiser != "empty" else None
+    kernel = find_kernel_with_stats(graph, stats) if args.kernelize else None
+    if kernel is not None:
+        print(kernel.report(), file=sys.stderr)
+    search_graph = graph if kernel is None else kernel.graph
+    initialised = args.initialiser != "empty"
+    if args.workers is not None:
+        # imported here as parallel_matching itself imports this module
+        from parallel_matching import find_maximum_matching_parallel
+        maximal_matching = find_maximum_matching_parallel(search_graph, args.algorithm, args.initialiser,
+                                                          args.workers, stats=stats)
+    elif args.matching_cache is not None:
+        # imported here as matching_cache itself imports this module
+        from matching_cache import MatchingCache, find_maximum_matching_cached
+        cache = MatchingCache(directory=args.matching_cache)
+        maximal_matching = find_maximum_matching_cached(search_graph, cache, args.algorithm, args.initialiser, stats)
+        print("The matching was {}".format("found in the cache" if cache.hits else "searched for"), file=sys.stderr)
+        # neither a matching found in the cache nor a search warm started from a cached matching runs the initialiser
+        initialised = initialised and not cache.hits and not cache.warm_starts
+    else:
+        with timed(stats, "initialise"):
+            initial_matching = INITIAL_MATCHINGS[args.initialiser](search_graph)
+        maximal_matching = find_maximum_matching_with_matching(search_graph, initial_matching, args.algorithm,
+                                                               stats=stats)
+    if initialised:
+        print("The {} initialiser matched {} of the {} edges in the maximum matching{}".format(
+            args.initialiser, stats.initial_matching_size, len(maximal_matching),
+            "" if kernel is None else " of the kernel"), file=sys.stderr)
+    if kernel is not None:
+        with timed(stats, "kernelize"):
+            maximal_matching = kernel.lift(maximal_matching)
+    if args.stats:
+        print(stats.report(), file=sys.stderr)
+    write_matching(maximal_matching, graph, output_format, outfile)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Calculate the maximal matching of an unweighted graph")
-    parser.add_argument('--graphcsv', type=argparse.FileType('r'), required=True,
-                        help="The csv file containing a graph adjacency matrix")
-    args = parser.parse_args()
-    graph_adjacency_matrix = parse_csv(args.graphcsv)
-    graph_size = len(graph_adjacency_matrix)
-    maximal_matching = find_maximum_matching(Graph.from_matrix(graph_adjacency_matrix))
-    outfile = get_outfile_name(args.graphcsv.name)
-    dump_csv(maximal_matching.to_matrix(graph_size), outfile)
+    main()
@@ -0,0 +1,185 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from csr_graph import CSRGraph, LabelTable
+from matrix_io import GRAPH_FORMATS, read_graph
+
+BINARY_GRAPH_MAGIC = b"EDGRAPH1"
+
+# the number of nodes, the number of neighbour entries, the length of the encoded labels (0 if node i is labelled
+# str(i)), the index of the source's format in GRAPH_FORMATS, and the source stamp
+_HEADER = struct.Struct("<QQQQQq32s")
+
+_HEADER_SIZE = len(BINARY_GRAPH_MAGIC) + _HEADER.size
+
+CACHE_EXTENSION = ".csr"
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class SourceStamp:
+    """
+    Identifies the contents of a graph file, so that a cache built from it can tell whether it is still up to date.
+
+    Fields
+    ======
+
+    size: int
+        The size of the file in bytes
+
+    mtime_ns: int
+        The modification time of the file in nanoseconds
+
+    digest: bytes
+        The SHA-256 hash of the contents of the file
+    """
+    size: int
+    mtime_ns: int
+    digest: bytes
+
+    @classmethod
+    def of_file(cls, filename: str) -> "SourceStamp":
+        status = os.stat(filename)
+        digest = hashlib.sha256()
+        with open(filename, mode="rb") as inhandle:
+            for chunk in iter(lambda: inhandle.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return cls(status.st_size, status.st_mtime_ns, digest.digest())
+
+    def matches_status(self, status: os.stat_result) -> bool:
+        """Whether a file's size and modification time are still those of the stamp, which is much cheaper to check
+        than the hash of its contents"""
+        return status.st_size == self.size and status.st_mtime_ns == self.mtime_ns
+
+
+def get_cache_name(filename: str) -> str:
+    return filename + CACHE_EXTENSION
+
+
+def _has_row_labels(labels: LabelTable) -> bool:
+    return all(label == str(node) for node, label in enumerate(labels.labels))
+
+
+def dump_binary_graph(graph: CSRGraph, filename: str, graph_format: str, stamp: SourceStamp) -> None:
+    """
+    Write a graph in a binary form that load_binary_graph can map into memory without parsing or copying: the magic
+    bytes and a header of little-endian integers, then the offsets as 64-bit integers, the neighbours as 32-bit
+    integers, and finally the labels as utf-8 text, one to a line.  Labels are left out when node i is labelled str(i),
+    as for dense csvs and Matrix Market files.  The header records the format the graph was read with and the stamp
+    of the file it was read from.
+    """
+    labels = b"" if _has_row_labels(graph.labels) else "\n".join(graph.labels.labels).encode()
+    offsets, neighbours = array('q', graph.offsets), array('i', graph.neighbours)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+        neighbours.byteswap()
+    # written to a temporary file and renamed, so that a run reading the cache never sees half of it
+    temporary_filename = filename + ".tmp"
+    with open(temporary_filename, mode="wb") as outhandle:
+        outhandle.write(BINARY_GRAPH_MAGIC)
+        outhandle.write(_HEADER.pack(graph.number_of_nodes(), len(neighbours), len(labels),
+                                     GRAPH_FORMATS.index(graph_format), stamp.size, stamp.mtime_ns, stamp.digest))
+        offsets.tofile(outhandle)
+        neighbours.tofile(outhandle)
+        outhandle.write(labels)
+    os.replace(temporary_filename, filename)
+
+
+def read_binary_graph_header(filename: str) -> Tuple[str, SourceStamp]:
+    """The format and stamp of the source a binary graph was written from, without loading the graph"""
+    with open(filename, mode="rb") as inhandle:
+        header = inhandle.read(_HEADER_SIZE)
+    if len(header) != _HEADER_SIZE or not header.startswith(BINARY_GRAPH_MAGIC):
+        raise ValueError("{} is not a binary graph file".format(filename))
+    _, _, _, format_index, size, mtime_ns, digest = _HEADER.unpack_from(header, len(BINARY_GRAPH_MAGIC))
+    return GRAPH_FORMATS[format_index], SourceStamp(size, mtime_ns, digest)
+
+
+def load_binary_graph(filename: str) -> CSRGraph:
+    """Map a file written by dump_binary_graph into memory.  The offsets and neighbours of the graph are memoryviews
+    of the mapped file, so loading takes time in the number of nodes only to rebuild the labels, and pages of the
+    neighbours are only read from disk when they are used"""
+    with open(filename, mode="rb") as inhandle:
+        mapped = mmap.mmap(inhandle.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(BINARY_GRAPH_MAGIC)] != BINARY_GRAPH_MAGIC:
+        raise ValueError("{} is not a binary graph file".format(filename))
+    number_of_nodes, number_of_neighbours, labels_size, _, _, _, _ = _HEADER.unpack_from(mapped,
+                                                                                         len(BINARY_GRAPH_MAGIC))
+    neighbours_start = _HEADER_SIZE + 8 * (number_of_nodes + 1)
+    labels_start = neighbours_start + 4 * number_of_neighbours
+    if len(mapped) != labels_start + labels_size:
+        raise ValueError("{} is truncated or corrupt".format(filename))
+    view = memoryview(mapped)
+    offsets = view[_HEADER_SIZE:neighbours_start].cast('q')
+    neighbours = view[neighbours_start:labels_start].cast('i')
+    if sys.byteorder == "big":
+        # the file is little-endian, so the arrays have to be copied and swapped after all
+        offsets, neighbours = array('q', offsets.tobytes()), array('i', neighbours.tobytes())
+        offsets.byteswap()
+        neighbours.byteswap()
+    if labels_size:
+        labels = LabelTable(bytes(view[labels_start:]).decode().split("\n"))
+    else:
+        labels = LabelTable(str(node) for node in range(number_of_nodes))
+    return CSRGraph(offsets, neighbours, labels)
+
+
+def _read_cached_stamp(filename: str, graph_format: str) -> Optional[SourceStamp]:
+    """The stamp recorded in the cache next to a graph file, or None if there is no readable cache of the graph read
+    in the given format"""
+    cache_name = get_cache_name(filename)
+    if not os.path.exists(cache_name):
+        return None
+    try:
+        cached_format, cached_stamp = read_binary_graph_header(cache_name)
+    except ValueError:
+        return None
+    return cached_stamp if cached_format == graph_format else None
+
+
+def is_cache_fresh(filename: str, graph_format: str, stamp: Optional[SourceStamp] = None) -> bool:
+    """Whether the cache next to a graph file was built from its current contents, read in the same format.  Unless
+    the stamp of the file is given, the file is only hashed if its size and modification time still match"""
+    cached_stamp = _read_cached_stamp(filename, graph_format)
+    if cached_stamp is None:
+        return False
+    if stamp is None:
+        if not cached_stamp.matches_status(os.stat(filename)):
+            return False
+        stamp = SourceStamp.of_file(filename)
+    return cached_stamp == stamp
+
+
+def convert_graph(filename: str, graph_format: str, stamp: Optional[SourceStamp] = None) -> CSRGraph:
+    """Read a graph file and write its binary cache next to it.  The stamp of the file is computed unless it is
+    given"""
+    stamp = stamp or SourceStamp.of_file(filename)
+    with open(filename) as inhandle:
+        graph = read_graph(inhandle, graph_format)
+    dump_binary_graph(graph, get_cache_name(filename), graph_format, stamp)
+    return graph
+
+
+def read_graph_with_cache(filename: str, graph_format: str) -> CSRGraph:
+    """Read a graph file, loading its binary cache instead if the file has not changed since the cache was written.
+    A cache that is out of date is rebuilt, while a graph without a cache is only parsed: caches are created by
+    convert_graph"""
+    if not os.path.exists(get_cache_name(filename)):
+        with open(filename) as inhandle:
+            return read_graph(inhandle, graph_format)
+    # the file is hashed at most once: not at all if its size or modification time show the cache is out of date, and
+    # otherwise the stamp is passed on to be written to the rebuilt cache
+    stamp = None
+    cached_stamp = _read_cached_stamp(filename, graph_format)
+    if cached_stamp is not None and cached_stamp.matches_status(os.stat(filename)):
+        stamp = SourceStamp.of_file(filename)
+        if stamp == cached_stamp:
+            return load_binary_graph(get_cache_name(filename))
+    return convert_graph(filename, graph_format, stamp)
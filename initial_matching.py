@@ -0,0 +1,58 @@
+from data_structures import *
+
+
+def empty_matching(graph: Graph) -> Matching:
+    return Matching(set())
+
+
+def greedy_matching(graph: Graph) -> Matching:
+    """Match every node, in turn, to its first neighbour that is still exposed"""
+    matching_dict = {}
+    for node in graph.node_to_edges:
+        if node in matching_dict:
+            continue
+        partner = next((neighbour for neighbour in graph.get_neighbours(node) if neighbour not in matching_dict), None)
+        if partner is not None:
+            matching_dict[node] = partner
+            matching_dict[partner] = node
+    return Matching.from_mates(matching_dict)
+
+
+def karp_sipser_matching(graph: Graph) -> Matching:
+    """
+    The Karp-Sipser heuristic: while any node has exactly one exposed neighbour, match it to that neighbour (which is
+    always consistent with some maximum matching), and otherwise match an arbitrary edge.  Matched nodes are removed
+    from the graph, so degrees are kept up to date as it shrinks and the whole heuristic runs in O(V + E).
+    """
+    degrees = {node: graph.get_degree(node) for node in graph.node_to_edges}
+    pendant_nodes = [node for node, degree in degrees.items() if degree == 1]
+    matching_dict = {}
+
+    def match(node: str, partner: str) -> None:
+        matching_dict[node] = partner
+        matching_dict[partner] = node
+        for matched_node in (node, partner):
+            for neighbour in graph.get_neighbours(matched_node):
+                if neighbour not in matching_dict:
+                    degrees[neighbour] -= 1
+                    if degrees[neighbour] == 1:
+                        pendant_nodes.append(neighbour)
+
+    def find_exposed_neighbour(node: str) -> Optional[str]:
+        return next((neighbour for neighbour in graph.get_neighbours(node) if neighbour not in matching_dict), None)
+
+    for node in graph.node_to_edges:
+        while pendant_nodes:
+            pendant_node = pendant_nodes.pop()
+            if pendant_node not in matching_dict and degrees[pendant_node] == 1:
+                match(pendant_node, find_exposed_neighbour(pendant_node))
+        if node not in matching_dict and degrees[node] > 0:
+            match(node, find_exposed_neighbour(node))
+    return Matching.from_mates(matching_dict)
+
+
+INITIAL_MATCHINGS = {
+    "empty": empty_matching,
+    "greedy": greedy_matching,
+    "karp-sipser": karp_sipser_matching,
+}
@@ -0,0 +1,164 @@
+from data_structures import *
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class FoldedVertex:
+    """
+    The node that replaces a node of degree two and both of its neighbours when they are folded together.  It only
+    holds the number of the fold, so that kernels stay cheap to hash and to send to other processes however deeply
+    folds nest
+
+    Fields
+    ======
+
+    index: int
+        The position of the fold in Kernel.folds
+    """
+    index: int
+
+    def __str__(self):
+        return "folded:{}".format(self.index)
+
+
+@dataclass
+class Fold:
+    """
+    A node of degree two that was removed, and its two neighbours that were folded into a FoldedVertex
+
+    Fields
+    ======
+
+    node: str
+        The node of degree two that was removed
+
+    first_neighbour: str
+        One of the neighbours of the removed node
+
+    second_neighbour: str
+        The other neighbour of the removed node
+
+    first_neighbours: Set[str]
+        The neighbours of first_neighbour when the fold was made, which decide how a match of the folded vertex is
+        lifted back
+    """
+    node: str
+    first_neighbour: str
+    second_neighbour: str
+    first_neighbours: Set[str] = field(repr=False)
+
+
+@dataclass
+class Kernel:
+    """
+    A graph reduced by find_kernel, together with what is needed to lift a maximum matching of it back to a maximum
+    matching of the original graph
+
+    Fields
+    ======
+
+    graph: Graph
+        The reduced graph.  Nodes that were folded together are replaced by a FoldedVertex
+
+    forced_mates: Dict[str, str]
+        The matches made by the reductions, in both directions, which may include folded vertices
+
+    folds: List[Fold]
+        Every fold, in the order it was made
+
+    original_nodes: int
+        The number of nodes in the graph before it was reduced
+
+    original_edges: int
+        The number of edges in the graph before it was reduced
+    """
+    graph: Graph
+    forced_mates: Dict[str, str]
+    folds: List[Fold]
+    original_nodes: int
+    original_edges: int
+
+    def lift(self, matching: Matching) -> Matching:
+        """Turn a maximum matching of the reduced graph into a maximum matching of the original graph, undoing the
+        folds in the reverse of the order they were made"""
+        mates = {**matching.mates, **self.forced_mates}
+        for index in reversed(range(len(self.folds))):
+            fold = self.folds[index]
+            partner = mates.pop(FoldedVertex(index), None)
+            first_partner, second_partner = fold.first_neighbour, fold.second_neighbour
+            if partner is not None:
+                if partner not in fold.first_neighbours:
+                    first_partner, second_partner = second_partner, first_partner
+                mates[partner] = first_partner
+                mates[first_partner] = partner
+            mates[fold.node] = second_partner
+            mates[second_partner] = fold.node
+        return Matching.from_mates(mates)
+
+    def report(self) -> str:
+        return "Kernelization reduced the graph from {} nodes and {} edges to {} nodes and {} edges".format(
+            self.original_nodes, self.original_edges, self.graph.number_of_nodes(), self.graph.number_of_edges())
+
+
+def find_kernel(graph: Graph) -> Kernel:
+    """
+    Shrink the graph with the Karp-Sipser reductions, applied until neither can be:
+
+      * a node of degree one is matched to its neighbour, and both are removed
+      * a node of degree two is removed and its two neighbours are folded into a single FoldedVertex.  Some maximum
+        matching matches the removed node, so a maximum matching of the folded graph is exactly one edge smaller
+
+    Isolated nodes are dropped, as no matching can cover them.  Every node is queued again whenever its degree falls,
+    so the reductions take O(V + E) time apart from the cost of merging the neighbours of folded nodes.
+    """
+    node_to_edges = {node: set(graph.get_neighbours(node)) for node in graph.node_to_edges}
+    forced_mates = {}
+    folds = []
+    pendant_nodes = [node for node, neighbours in node_to_edges.items() if len(neighbours) <= 1]
+    degree_two_nodes = [node for node, neighbours in node_to_edges.items() if len(neighbours) == 2]
+
+    def remove(node: str) -> Set[str]:
+        neighbours = node_to_edges.pop(node)
+        for neighbour in neighbours:
+            node_to_edges[neighbour].discard(node)
+            queue_if_reducible(neighbour)
+        return neighbours
+
+    def queue_if_reducible(node: str) -> None:
+        degree = len(node_to_edges[node])
+        if degree <= 1:
+            pendant_nodes.append(node)
+        elif degree == 2:
+            degree_two_nodes.append(node)
+
+    while pendant_nodes or degree_two_nodes:
+        if pendant_nodes:
+            node = pendant_nodes.pop()
+            if node not in node_to_edges or len(node_to_edges[node]) > 1:
+                continue
+            neighbours = remove(node)
+            if neighbours:
+                neighbour = neighbours.pop()
+                forced_mates[node] = neighbour
+                forced_mates[neighbour] = node
+                remove(neighbour)
+            continue
+
+        node = degree_two_nodes.pop()
+        if node not in node_to_edges or len(node_to_edges[node]) != 2:
+            continue
+        first_neighbour, second_neighbour = remove(node)
+        first_neighbours = node_to_edges.pop(first_neighbour)
+        second_neighbours = node_to_edges.pop(second_neighbour)
+        folded_vertex = FoldedVertex(len(folds))
+        folds.append(Fold(node, first_neighbour, second_neighbour, first_neighbours))
+        merged_neighbours = (first_neighbours | second_neighbours) - {first_neighbour, second_neighbour}
+        for neighbour in merged_neighbours:
+            node_to_edges[neighbour].discard(first_neighbour)
+            node_to_edges[neighbour].discard(second_neighbour)
+            node_to_edges[neighbour].add(folded_vertex)
+            queue_if_reducible(neighbour)
+        node_to_edges[folded_vertex] = merged_neighbours
+        queue_if_reducible(folded_vertex)
+
+    return Kernel(Graph(node_to_edges), forced_mates, folds, graph.number_of_nodes(), graph.number_of_edges())
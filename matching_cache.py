@@ -0,0 +1,168 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from data_structures import Graph, Matching
+from find_maximum_matching import find_maximum_matching, find_maximum_matching_with_matching
+from matching_stats import MatchingStats
+
+# the fraction of a cached matching's edges that must still be edges of a new graph for it to be used to start the
+# search on that graph
+WARM_START_THRESHOLD = 0.9
+
+_HASH_MODULUS = 1 << 256
+
+
+def hash_graph(graph: Graph) -> str:
+    """
+    A canonical hash of the graph, which does not depend on the order of its nodes or of their neighbours.  Each node
+    is hashed together with its sorted neighbours, and the node hashes are summed, so the hash takes one pass over the
+    graph.  Nodes are identified by their repr, so a CSRGraph is hashed on its node ids rather than its labels, which
+    is what its matchings are on too.
+    """
+    total = 0
+    for node in graph.node_to_edges:
+        node_hash = hashlib.blake2b(repr(node).encode(), digest_size=32)
+        for neighbour in sorted(repr(neighbour) for neighbour in graph.get_neighbours(node)):
+            node_hash.update(b"\0" + neighbour.encode())
+        total += int.from_bytes(node_hash.digest(), "little")
+    return format(total % _HASH_MODULUS, "064x")
+
+
+def restrict_matching(matching: Matching, graph: Graph) -> Matching:
+    """The edges of the matching that are also edges of the graph"""
+    mates = {}
+    for node, mate in matching.mates.items():
+        if node in graph.node_to_edges and mate in graph.get_neighbours(node):
+            mates[node] = mate
+    return Matching.from_mates(mates)
+
+
+class MatchingCache:
+    """
+    A cache of maximum matchings keyed by hash_graph, with a tier in memory and an optional tier on disk.  The memory
+    tier holds the most recently used matchings, and the disk tier a file per matching in a directory, both evicting
+    the least recently used matchings once they are full.  The files are pickles, so the directory must only be
+    writable by those trusted to run code.
+
+    Fields
+    ======
+
+    max_entries: int
+        The number of matchings kept in memory
+
+    directory: Optional[str]
+        The directory of the disk tier, or None to keep matchings in memory only
+
+    max_disk_bytes: int
+        The total size the files of the disk tier may grow to before the least recently used are deleted
+
+    hits: int
+        The number of lookups answered from either tier
+
+    misses: int
+        The number of lookups that found nothing
+
+    warm_starts: int
+        The number of misses for which find_warm_start found a matching of a similar graph
+    """
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None, max_disk_bytes: int = 1 << 30):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+        self._entries: OrderedDict[str, Matching] = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_filename(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".matching")
+
+    def get(self, key: str) -> Optional[Matching]:
+        """The matching stored under the key, which is then the most recently used.  A matching found on disk is also
+        brought into memory"""
+        matching = self._entries.get(key)
+        if matching is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None and os.path.exists(self._get_filename(key)):
+            with open(self._get_filename(key), mode="rb") as inhandle:
+                matching = Matching.from_mates(pickle.load(inhandle))
+            os.utime(self._get_filename(key))
+            self._remember(key, matching)
+        if matching is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return matching.copy()
+
+    def put(self, key: str, matching: Matching) -> None:
+        matching = matching.copy()
+        self._remember(key, matching)
+        if self.directory is None:
+            return
+        temporary_filename = self._get_filename(key) + ".tmp"
+        with open(temporary_filename, mode="wb") as outhandle:
+            pickle.dump(matching.mates, outhandle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_filename, self._get_filename(key))
+        self._evict_files()
+
+    def _remember(self, key: str, matching: Matching) -> None:
+        self._entries[key] = matching
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict_files(self) -> None:
+        """Delete the least recently used files until the disk tier fits in max_disk_bytes.  Files are ordered by
+        modification time, which get updates on every hit"""
+        files: List[Tuple[int, int, str]] = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".matching"):
+                status = os.stat(os.path.join(self.directory, filename))
+                files.append((status.st_mtime_ns, status.st_size, filename))
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, filename in sorted(files):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.directory, filename))
+            total_bytes -= size
+
+    def find_warm_start(self, graph: Graph, threshold: float = WARM_START_THRESHOLD) -> Optional[Matching]:
+        """Look through the matchings in memory for one of a graph that differs only slightly from this one, meaning
+        that at least the threshold fraction of its edges are still edges of this graph.  Returns the largest such
+        matching restricted to this graph, which is then a near maximum matching to start a search from"""
+        best_matching = None
+        for matching in self._entries.values():
+            restricted_matching = restrict_matching(matching, graph)
+            if len(restricted_matching) >= threshold * len(matching) and len(restricted_matching) > 0 and (
+                    best_matching is None or len(restricted_matching) > len(best_matching)):
+                best_matching = restricted_matching
+        if best_matching is not None:
+            self.warm_starts += 1
+        return best_matching
+
+
+def find_maximum_matching_cached(graph: Graph, cache: MatchingCache, algorithm: str = "auto",
+                                 initialiser: str = "empty", stats: Optional[MatchingStats] = None,
+                                 warm_start_threshold: float = WARM_START_THRESHOLD) -> Matching:
+    """Find a maximum matching through the cache.  A graph that has been matched before gets its stored matching back
+    without a search, and a graph that differs only slightly from one in memory is searched starting from that graph's
+    matching, see MatchingCache.find_warm_start.  Other graphs are searched as by find_maximum_matching"""
+    key = hash_graph(graph)
+    matching = cache.get(key)
+    if matching is not None:
+        return matching
+    warm_start = cache.find_warm_start(graph, warm_start_threshold)
+    if warm_start is not None:
+        matching = find_maximum_matching_with_matching(graph, warm_start, algorithm, stats=stats)
+    else:
+        matching = find_maximum_matching(graph, algorithm, initialiser, stats=stats)
+    cache.put(key, matching)
+    return matching
@@ -0,0 +1,108 @@
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from timeit import default_timer as timer
+from typing import ContextManager, Dict, Optional
+
+
+@dataclass
+class MatchingStats:
+    """
+    Counters and timings collected while finding a maximum matching.  Collection is opt-in: the searches only touch
+    a MatchingStats when one is passed to them, and otherwise pay for nothing more than a check against None.
+
+    Fields
+    ======
+
+    searches: int
+        The number of searches for augmenting paths, including the final one which finds none
+
+    augmentations: int
+        The number of times the matching was augmented
+
+    initial_matching_size: int
+        The number of edges in the matching the search was started from
+
+    blossoms: int
+        The number of blossoms found, whether contracted into a new graph or absorbed into a union-find
+
+    max_blossom_depth: int
+        The deepest nesting of contracted blossoms, which is also the deepest recursion of find_augmenting_path.
+        Searches that keep blossoms implicit leave this at 0
+
+    edges_scanned: int
+        The number of edges examined while growing alternating forests, counted as the degree of every node scanned
+
+    kernel_nodes_removed: int
+        The number of nodes removed by kernelization before the search, if it was asked for
+
+    kernel_edges_removed: int
+        The number of edges removed by kernelization before the search
+
+    engine: str
+        The augmenting path search that was run.  When the algorithm is chosen automatically this shows whether the
+        graph was found to be bipartite, and so searched with "hopcroft-karp", or not
+
+    seconds: Dict[str, float]
+        The wall time spent in each phase of the algorithm.  Contraction and lifting happen inside searches, so their
+        time is also counted towards "search"
+    """
+    searches: int = 0
+    augmentations: int = 0
+    initial_matching_size: int = 0
+    blossoms: int = 0
+    max_blossom_depth: int = 0
+    edges_scanned: int = 0
+    kernel_nodes_removed: int = 0
+    kernel_edges_removed: int = 0
+    engine: str = ""
+    seconds: Dict[str, float] = field(default_factory=dict)
+    _blossom_depth: int = field(default=0, init=False, repr=False, compare=False)
+
+    @contextmanager
+    def time(self, phase: str):
+        start = timer()
+        try:
+            yield
+        finally:
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + timer() - start
+
+    def enter_blossom(self) -> None:
+        self.blossoms += 1
+        self._blossom_depth += 1
+        self.max_blossom_depth = max(self.max_blossom_depth, self._blossom_depth)
+
+    def leave_blossom(self) -> None:
+        self._blossom_depth -= 1
+
+    def merge(self, other: "MatchingStats") -> None:
+        """Add the counters and timings of another run, such as one on a different component of the same graph"""
+        self.searches += other.searches
+        self.augmentations += other.augmentations
+        self.initial_matching_size += other.initial_matching_size
+        self.blossoms += other.blossoms
+        self.max_blossom_depth = max(self.max_blossom_depth, other.max_blossom_depth)
+        self.edges_scanned += other.edges_scanned
+        self.kernel_nodes_removed += other.kernel_nodes_removed
+        self.kernel_edges_removed += other.kernel_edges_removed
+        engines = set(self.engine.split(", ")) | set(other.engine.split(", "))
+        self.engine = ", ".join(sorted(engine for engine in engines if engine))
+        for phase, seconds in other.seconds.items():
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def report(self) -> str:
+        lines = ["searches: {}".format(self.searches),
+                 "augmentations: {}".format(self.augmentations),
+                 "initial matching size: {}".format(self.initial_matching_size),
+                 "blossoms: {}".format(self.blossoms),
+                 "max blossom depth: {}".format(self.max_blossom_depth),
+                 "edges scanned: {}".format(self.edges_scanned),
+                 "kernel nodes removed: {}".format(self.kernel_nodes_removed),
+                 "kernel edges removed: {}".format(self.kernel_edges_removed),
+                 "engine: {}".format(self.engine)]
+        lines += ["{} seconds: {:.6f}".format(phase, seconds) for phase, seconds in self.seconds.items()]
+        return "\n".join(lines)
+
+
+def timed(stats: Optional[MatchingStats], phase: str) -> ContextManager:
+    """Time a phase if stats are being collected, and otherwise do nothing"""
+    return nullcontext() if stats is None else stats.time(phase)
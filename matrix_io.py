@@ -1,6 +1,46 @@
 import csv
 import os
-from typing import List
+import struct
+import sys
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from csr_graph import CSRGraph, LabelTable
+from data_structures import Edge, Matching
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+GRAPH_FORMATS = ("dense", "edge-list", "matrix-market")
+
+OUTPUT_FORMATS = ("matrix", "pairs", "mates", "matrix-market", "binary")
+
+OUTPUT_FORMAT_EXTENSIONS = {"matrix": ".csv", "pairs": ".txt", "mates": ".mates", "matrix-market": ".mtx",
+                            "binary": ".bin"}
+
+# matchings are written in the same format as the graph unless asked otherwise
+DEFAULT_OUTPUT_FORMATS = {"dense": "matrix", "edge-list": "pairs", "matrix-market": "matrix-market"}
+
+BINARY_MATCHING_MAGIC = b"EDMATCH1"
+
+# the file name that stands for stdout when writing a matching, as a graph read from stdin has no name to write next to
+STDOUT_NAME = "-"
+
+_BINARY_CHUNK_SIZE = 1 << 16
+
+# the numbers of comma separated fields an edge list line can have, two nodes and an optional weight, and how many
+# lines of a file are read to tell a comma separated edge list from a dense matrix with as few columns
+_EDGE_LIST_FIELDS = (2, 3)
+_SNIFF_LINES = max(_EDGE_LIST_FIELDS)
+
+# the number of rows of a dense csv that parse_dense_graph_numpy converts at a time, which bounds its memory use to a
+# few blocks of rows rather than the whole matrix
+_DENSE_BLOCK_ROWS = 1024
 
 
 def parse_csv(inhandle) -> List[List[int]]:
@@ -9,12 +49,368 @@ def parse_csv(inhandle) -> List[List[int]]:
     return adjacency_matrix
 
 
-def get_outfile_name(infile_name: str) -> str:
-    return os.path.splitext(infile_name)[0] + "_matching.csv"
+def parse_dense_graph(inhandle) -> CSRGraph:
+    """Read a csv adjacency matrix, keeping only its nonzero entries.  As with Graph.from_matrix, row i becomes the
+    node labelled str(i).  Blank lines are rows without any edges, and the other rows must all have the same number of
+    entries.  The matrix is read with NumPy if it is installed, and a row at a time in Python if not"""
+    if numpy is not None:
+        return parse_dense_graph_numpy(inhandle)
+    return parse_dense_graph_rows(inhandle)
+
+
+def _check_row_length(row: int, length: int, row_length: Optional[int]) -> int:
+    """Check that a row of a csv matrix is as long as the rows before it, and return the length of the rows"""
+    if row_length is not None and length != row_length:
+        raise ValueError("Row {} of the matrix has {} entries, but the rows before it have {}".format(
+            row, length, row_length))
+    return length
+
+
+def parse_dense_graph_rows(inhandle) -> CSRGraph:
+    """Read a csv adjacency matrix a row at a time, without NumPy"""
+    labels = LabelTable()
+
+    def nonzero_entries() -> Iterator[Tuple[int, int]]:
+        row_length = None
+        for row in csv.reader(inhandle):
+            i = labels.intern(str(len(labels)))
+            if row:
+                row_length = _check_row_length(i, len(row), row_length)
+            for j, val in enumerate(row):
+                if int(val) != 0:
+                    yield i, j
+    return CSRGraph.from_id_pairs(nonzero_entries(), labels)
+
+
+def parse_dense_graph_numpy(inhandle) -> CSRGraph:
+    """
+    Read a csv adjacency matrix in blocks of rows, each converted by numpy.loadtxt and reduced to the positions of its
+    nonzero entries.  The entries are then symmetrised, stripped of self-loops and duplicates, and sorted into the
+    offsets and neighbours of a CSRGraph with array operations, so no Python code runs per cell or per edge.  Gives
+    the same graph as parse_dense_graph_rows, and rejects the same rows of differing lengths, which numpy.loadtxt
+    would only notice within a block.
+    """
+    sources, targets = [], []
+    number_of_rows = 0
+    row_length = None
+    while True:
+        lines = list(islice(inhandle, _DENSE_BLOCK_ROWS))
+        if not lines:
+            break
+        # blank lines are rows without any edges, but numpy.loadtxt would skip them
+        row_numbers = []
+        for row, line in enumerate(lines):
+            if line.strip():
+                row_length = _check_row_length(number_of_rows + row, line.count(",") + 1, row_length)
+                row_numbers.append(row)
+        row_numbers = numpy.array(row_numbers, dtype=numpy.int64)
+        if len(row_numbers):
+            block = numpy.loadtxt(lines, delimiter=",", dtype=numpy.int64, ndmin=2)
+            block_rows, block_columns = numpy.nonzero(block)
+            sources.append(row_numbers[block_rows] + number_of_rows)
+            targets.append(block_columns.astype(numpy.int64))
+        number_of_rows += len(lines)
+
+    sources = numpy.concatenate(sources) if sources else numpy.zeros(0, dtype=numpy.int64)
+    targets = numpy.concatenate(targets) if targets else numpy.zeros(0, dtype=numpy.int64)
+    if len(targets) and targets.max() >= number_of_rows:
+        raise ValueError("Edges refer to node ids outside the {} labelled nodes".format(number_of_rows))
+    not_loops = sources != targets
+    sources, targets = sources[not_loops], targets[not_loops]
+    # every edge in both directions, sorted by source and then target, with repeats dropped
+    sources, targets = numpy.concatenate((sources, targets)), numpy.concatenate((targets, sources))
+    order = numpy.lexsort((targets, sources))
+    sources, targets = sources[order], targets[order]
+    first_of_repeats = numpy.ones(len(sources), dtype=bool)
+    first_of_repeats[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    sources, targets = sources[first_of_repeats], targets[first_of_repeats]
+
+    offsets, neighbours = array('q'), array('i')
+    offsets.frombytes(numpy.searchsorted(sources, numpy.arange(number_of_rows + 1)).astype(numpy.int64).tobytes())
+    neighbours.frombytes(targets.astype(numpy.intc).tobytes())
+    return CSRGraph(offsets, neighbours, LabelTable(str(i) for i in range(number_of_rows)))
+
+
+def parse_edge_list(inhandle) -> CSRGraph:
+    """Read a graph with one edge per line, given as two node labels separated by whitespace or a comma.  Any further
+    fields on a line are ignored, as are blank lines and lines starting with '#' or '%'"""
+    def labelled_pairs() -> Iterator[Tuple[str, str]]:
+        for line_number, line in enumerate(inhandle, start=1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0][0] in "#%":
+                continue
+            if len(fields) < 2:
+                raise ValueError("Line {} of the edge list does not contain two nodes: {}".format(line_number, line))
+            yield fields[0], fields[1]
+    return CSRGraph.from_labelled_pairs(labelled_pairs())
+
+
+def parse_matrix_market(inhandle) -> CSRGraph:
+    """Read a Matrix Market coordinate file as an adjacency matrix.  Entries are 1-based, and as with dense csvs the
+    node in row i is labelled str(i - 1).  Explicit zero entries are skipped"""
+    header = inhandle.readline().split()
+    if len(header) < 4 or header[0] != "%%MatrixMarket" or header[1:3] != ["matrix", "coordinate"]:
+        raise ValueError("Expected a Matrix Market coordinate matrix header but got: {}".format(" ".join(header)))
+    has_values = header[3] != "pattern"
+    size_line = inhandle.readline()
+    while size_line.startswith("%"):
+        size_line = inhandle.readline()
+    rows, columns, _ = (int(field) for field in size_line.split())
+    labels = LabelTable(str(i) for i in range(max(rows, columns)))
+
+    def entries() -> Iterator[Tuple[int, int]]:
+        for line in inhandle:
+            fields = line.split()
+            if not fields or fields[0].startswith("%"):
+                continue
+            if has_values and float(fields[2]) == 0:
+                continue
+            yield int(fields[0]) - 1, int(fields[1]) - 1
+    return CSRGraph.from_id_pairs(entries(), labels)
+
+
+def _parse_weight(text: str) -> float:
+    """Keep integer weights as ints, so that the weighted matching can handle them exactly"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_weighted_dense_graph(inhandle) -> Tuple[CSRGraph, List[Edge]]:
+    """Read a csv matrix of edge weights, where a zero entry means there is no edge.  Returns the graph on row
+    numbers, as parse_dense_graph does, and the weighted edges between them.  The matrix may give the weight of an
+    edge in either or both triangles, but if it gives both they must agree"""
+    labels = LabelTable()
+    weights = {}
+    for row in csv.reader(inhandle):
+        i = labels.intern(str(len(labels)))
+        for j, val in enumerate(row):
+            weight = _parse_weight(val)
+            if weight == 0 or i == j:
+                continue
+            key = (min(i, j), max(i, j))
+            if weights.setdefault(key, weight) != weight:
+                raise ValueError("The weight matrix gives the edge between rows {} and {} the weights {} and {}".format(
+                    key[0], key[1], weights[key], weight))
+    graph = CSRGraph.from_id_pairs(iter(weights), labels)
+    return graph, [Edge(i, j, weight) for (i, j), weight in weights.items()]
+
+
+def parse_weighted_edge_list(inhandle) -> Tuple[CSRGraph, List[Edge]]:
+    """Read an edge list as parse_edge_list does, taking the third field on each line as the weight of the edge.
+    Edges without a third field have weight 1"""
+    labels = LabelTable()
+    edges = []
+    for line_number, line in enumerate(inhandle, start=1):
+        fields = line.replace(",", " ").split()
+        if not fields or fields[0][0] in "#%":
+            continue
+        if len(fields) < 2:
+            raise ValueError("Line {} of the edge list does not contain two nodes: {}".format(line_number, line))
+        first_node, second_node = labels.intern(fields[0]), labels.intern(fields[1])
+        if first_node != second_node:
+            edges.append(Edge(first_node, second_node, _parse_weight(fields[2]) if len(fields) > 2 else 1))
+    graph = CSRGraph.from_id_pairs(((edge.node_one, edge.node_two) for edge in edges), labels)
+    return graph, edges
+
+
+def read_weighted_graph(inhandle, graph_format: str) -> Tuple[CSRGraph, List[Edge]]:
+    if graph_format == "dense":
+        return parse_weighted_dense_graph(inhandle)
+    if graph_format == "edge-list":
+        return parse_weighted_edge_list(inhandle)
+    raise ValueError("Weighted graphs can only be read from the dense and edge-list formats, not {}".format(
+        graph_format))
+
+
+class PeekedHandle:
+    """A text file some of whose first lines have already been read, which gives those lines back before reading on,
+    so that a stream such as stdin can be sniffed without seeking"""
+    def __init__(self, lines: Iterable[str], inhandle):
+        self._lines = deque(lines)
+        self._inhandle = inhandle
+        self.name = getattr(inhandle, "name", None)
+
+    def readline(self) -> str:
+        return self._lines.popleft() if self._lines else self._inhandle.readline()
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+
+def _is_adjacency_matrix(rows: List[List[str]], weighted: bool) -> bool:
+    """Whether the rows can be a whole adjacency matrix: square, and of zeros and ones or, if weighted, symmetric
+    weights with a zero diagonal"""
+    if not all(len(row) == len(rows) for row in rows):
+        return False
+    if not weighted:
+        return all(field.strip() in ("0", "1") for row in rows for field in row)
+    try:
+        matrix = [[float(field) for field in row] for row in rows]
+    except ValueError:
+        return False
+    return all(matrix[i][i] == 0 for i in range(len(matrix))) and \
+        all(matrix[i][j] == matrix[j][i] for i in range(len(matrix)) for j in range(i))
+
+
+def sniff_graph_format(inhandle, weighted: bool = False) -> Tuple[str, PeekedHandle]:
+    """
+    Guess the format of a graph file from its first few lines, returning the format and a handle that reads the file
+    from the start.  A file is taken to be a dense adjacency matrix unless its rows have as few fields as an edge list
+    and cannot be a square matrix of zeros and ones, which for so few columns can be told from the whole file.  For a
+    weighted graph the matrix may hold any weights, but must then be symmetric with a zero diagonal.
+    """
+    read_lines, data_lines = [], []
+    for line in inhandle:
+        read_lines.append(line)
+        if line.startswith("%%MatrixMarket"):
+            return "matrix-market", PeekedHandle(read_lines, inhandle)
+        if line.strip() and line[0] not in "#%":
+            data_lines.append(line)
+        if len(data_lines) > _SNIFF_LINES:
+            break
+    handle = PeekedHandle(read_lines, inhandle)
+    rows = [line.strip().split(",") for line in data_lines]
+    if not rows or len(rows[0]) > max(_EDGE_LIST_FIELDS) or _is_adjacency_matrix(rows, weighted):
+        return "dense", handle
+    return "edge-list", handle
+
+
+def detect_graph_format(inhandle, weighted: bool = False) -> str:
+    """Guess the format of a graph file as sniff_graph_format does, then rewind it.  Streams that cannot be rewound
+    should use sniff_graph_format instead"""
+    graph_format, _ = sniff_graph_format(inhandle, weighted)
+    inhandle.seek(0)
+    return graph_format
+
+
+def read_graph(inhandle, graph_format: str) -> CSRGraph:
+    if graph_format == "dense":
+        return parse_dense_graph(inhandle)
+    if graph_format == "edge-list":
+        return parse_edge_list(inhandle)
+    if graph_format == "matrix-market":
+        return parse_matrix_market(inhandle)
+    raise ValueError("Unknown graph format {}, expected one of {}".format(graph_format, GRAPH_FORMATS))
+
+
+def get_outfile_name(infile_name: str, extension: str = ".csv") -> str:
+    return os.path.splitext(infile_name)[0] + "_matching" + extension
+
+
+@contextmanager
+def open_output(filename: str, mode: str = "w+"):
+    """Open a file to write to, or give stdout for STDOUT_NAME.  Stdout is flushed rather than closed afterwards"""
+    if filename != STDOUT_NAME:
+        with open(filename, mode=mode) as outhandle:
+            yield outhandle
+        return
+    outhandle = sys.stdout.buffer if "b" in mode else sys.stdout
+    yield outhandle
+    outhandle.flush()
 
 
 def dump_csv(matrix: List[List[int]], filename: str) -> None:
-    with open(filename, mode="w+") as outhandle:
+    with open_output(filename) as outhandle:
         filewriter = csv.writer(outhandle, lineterminator="\n")
         for row in matrix:
             filewriter.writerow([str(val) for val in row])
+
+
+def dump_matrix_rows(mates: Dict[int, int], number_of_nodes: int, filename: str) -> None:
+    """Write the same csv as dump_csv(matching.to_matrix(number_of_nodes)), one row at a time"""
+    with open_output(filename) as outhandle:
+        for node in range(number_of_nodes):
+            row = ["0"] * number_of_nodes
+            if node in mates:
+                row[mates[node]] = "1"
+            outhandle.write(",".join(row) + "\n")
+
+
+def dump_edge_list(labelled_pairs: Iterable[Tuple[str, str]], filename: str) -> None:
+    with open_output(filename) as outhandle:
+        for first_node, second_node in labelled_pairs:
+            outhandle.write("{} {}\n".format(first_node, second_node))
+
+
+def dump_mates(mates: Dict[int, int], number_of_nodes: int, filename: str) -> None:
+    """Write one line per node id, holding the id of its mate or -1 if it is exposed"""
+    with open_output(filename) as outhandle:
+        for node in range(number_of_nodes):
+            outhandle.write("{}\n".format(mates.get(node, -1)))
+
+
+def dump_matrix_market(id_pairs: Iterable[Tuple[int, int]], number_of_nodes: int, number_of_pairs: int,
+                       filename: str) -> None:
+    """Write pairs of 0-based node ids as the lower triangle of a symmetric Matrix Market pattern matrix"""
+    with open_output(filename) as outhandle:
+        outhandle.write("%%MatrixMarket matrix coordinate pattern symmetric\n")
+        outhandle.write("{} {} {}\n".format(number_of_nodes, number_of_nodes, number_of_pairs))
+        for first_node, second_node in id_pairs:
+            outhandle.write("{} {}\n".format(max(first_node, second_node) + 1, min(first_node, second_node) + 1))
+
+
+def dump_binary_matching(id_pairs: Iterable[Tuple[int, int]], number_of_nodes: int, number_of_pairs: int,
+                         filename: str) -> None:
+    """Write pairs of node ids in a compact binary format: the magic bytes, the number of nodes and the number of
+    pairs as little-endian unsigned 64-bit integers, then every pair as two little-endian signed 32-bit integers"""
+    with open_output(filename, mode="wb") as outhandle:
+        outhandle.write(BINARY_MATCHING_MAGIC + struct.pack("<QQ", number_of_nodes, number_of_pairs))
+        chunk = array('i')
+        for first_node, second_node in id_pairs:
+            chunk.append(first_node)
+            chunk.append(second_node)
+            if len(chunk) >= _BINARY_CHUNK_SIZE:
+                _write_little_endian(chunk, outhandle)
+                chunk = array('i')
+        _write_little_endian(chunk, outhandle)
+
+
+def load_binary_matching(filename: str) -> Tuple[int, Matching]:
+    """Read a file written by dump_binary_matching, returning the number of nodes and the matching on node ids"""
+    with open(filename, mode="rb") as inhandle:
+        if inhandle.read(len(BINARY_MATCHING_MAGIC)) != BINARY_MATCHING_MAGIC:
+            raise ValueError("{} is not a binary matching file".format(filename))
+        number_of_nodes, number_of_pairs = struct.unpack("<QQ", inhandle.read(16))
+        id_pairs = array('i')
+        id_pairs.frombytes(inhandle.read(8 * number_of_pairs))
+    if sys.byteorder == "big":
+        id_pairs.byteswap()
+    mates = {}
+    for i in range(0, len(id_pairs), 2):
+        mates[id_pairs[i]] = id_pairs[i + 1]
+        mates[id_pairs[i + 1]] = id_pairs[i]
+    return number_of_nodes, Matching.from_mates(mates)
+
+
+def _write_little_endian(values: array, outhandle) -> None:
+    if sys.byteorder == "big":
+        values.byteswap()
+    values.tofile(outhandle)
+
+
+def write_matching(matching: Matching, graph: CSRGraph, output_format: str, filename: str) -> None:
+    """Write a matching on the node ids of the graph, to stdout if the filename is STDOUT_NAME.  Only the "pairs"
+    format writes the original node labels, the others identify nodes by their id, which for dense csvs and Matrix
+    Market files is their row"""
+    id_pairs = ((node, mate) for node, mate in matching.mates.items() if node < mate)
+    if output_format == "matrix":
+        dump_matrix_rows(matching.mates, graph.number_of_nodes(), filename)
+    elif output_format == "pairs":
+        dump_edge_list(((graph.labels.get_label(node), graph.labels.get_label(mate)) for node, mate in id_pairs),
+                       filename)
+    elif output_format == "mates":
+        dump_mates(matching.mates, graph.number_of_nodes(), filename)
+    elif output_format == "matrix-market":
+        dump_matrix_market(id_pairs, graph.number_of_nodes(), len(matching), filename)
+    elif output_format == "binary":
+        dump_binary_matching(id_pairs, graph.number_of_nodes(), len(matching), filename)
+    else:
+        raise ValueError("Unknown output format {}, expected one of {}".format(output_format, OUTPUT_FORMATS))
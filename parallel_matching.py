@@ -0,0 +1,102 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from data_structures import Graph, Matching
+from find_maximum_matching import find_maximum_matching
+from matching_stats import MatchingStats
+
+# components are grouped into batches of at least this many edges before being sent to a worker, so that graphs made
+# of thousands of tiny components are not dominated by the cost of pickling each one separately
+MIN_BATCH_EDGES = 10000
+
+
+def find_connected_components(graph: Graph) -> List[List[str]]:
+    """Split the nodes of the graph into connected components with a breadth first search, in O(V + E)"""
+    component_of_node = {}
+    components = []
+    for start_node in graph.node_to_edges:
+        if start_node in component_of_node:
+            continue
+        component = [start_node]
+        component_of_node[start_node] = len(components)
+        queue_position = 0
+        while queue_position < len(component):
+            node = component[queue_position]
+            queue_position += 1
+            for neighbour in graph.get_neighbours(node):
+                if neighbour not in component_of_node:
+                    component_of_node[neighbour] = len(components)
+                    component.append(neighbour)
+        components.append(component)
+    return components
+
+
+def batch_components(graph: Graph, components: List[List[str]], min_batch_edges: int = MIN_BATCH_EDGES
+                     ) -> Tuple[List[List[Dict[str, Set[str]]]], Dict[str, str]]:
+    """Group the components that need a search into batches of subgraphs, each with at least min_batch_edges edges
+    where possible.  Components with a single edge are matched straight away and returned as a dictionary of mates,
+    and isolated nodes are dropped"""
+    batches = []
+    current_batch, current_batch_edges = [], 0
+    trivial_mates = {}
+    for component in components:
+        if len(component) == 1:
+            continue
+        if len(component) == 2:
+            trivial_mates[component[0]] = component[1]
+            trivial_mates[component[1]] = component[0]
+            continue
+        subgraph = {node: set(graph.get_neighbours(node)) for node in component}
+        current_batch.append(subgraph)
+        current_batch_edges += sum(len(neighbours) for neighbours in subgraph.values()) // 2
+        if current_batch_edges >= min_batch_edges:
+            batches.append(current_batch)
+            current_batch, current_batch_edges = [], 0
+    if current_batch:
+        batches.append(current_batch)
+    return batches, trivial_mates
+
+
+def match_components(subgraphs: List[Dict[str, Set[str]]], algorithm: str, initialiser: str,
+                     collect_stats: bool) -> Tuple[Dict[str, str], Optional[MatchingStats]]:
+    """Find a maximum matching of every subgraph in a batch.  This runs in the worker processes, so it takes and
+    returns plain dictionaries that are cheap to pickle"""
+    stats = MatchingStats() if collect_stats else None
+    mates = {}
+    for subgraph in subgraphs:
+        # each component gets its own statistics, as "auto" can choose a different engine for each of them
+        subgraph_stats = MatchingStats() if collect_stats else None
+        mates.update(find_maximum_matching(Graph(subgraph), algorithm, initialiser, stats=subgraph_stats).mates)
+        if stats is not None:
+            stats.merge(subgraph_stats)
+    return mates, stats
+
+
+def find_maximum_matching_parallel(graph: Graph, algorithm: str = "auto", initialiser: str = "empty",
+                                   max_workers: Optional[int] = None, min_batch_edges: int = MIN_BATCH_EDGES,
+                                   stats: Optional[MatchingStats] = None,
+                                   executor: Optional[Executor] = None) -> Matching:
+    """
+    Find a maximum matching by splitting the graph into its connected components and matching batches of them in
+    parallel, since a maximum matching of a graph is the union of maximum matchings of its components.  The batches
+    are run on the given executor, or else on a new pool of max_workers processes.  If there is only one batch it is
+    solved in this process, as a pool would only add overhead.
+    """
+    batches, mates = batch_components(graph, find_connected_components(graph), min_batch_edges)
+    if len(batches) <= 1 or max_workers == 1:
+        results = [match_components(batch, algorithm, initialiser, stats is not None) for batch in batches]
+    elif executor is not None:
+        results = list(executor.map(match_components, batches, [algorithm] * len(batches),
+                                    [initialiser] * len(batches), [stats is not None] * len(batches)))
+    else:
+        with ProcessPoolExecutor(max_workers) as process_pool:
+            results = list(process_pool.map(match_components, batches, [algorithm] * len(batches),
+                                            [initialiser] * len(batches), [stats is not None] * len(batches)))
+    if stats is not None:
+        # the single edges matched straight away are part of the matching the search starts from
+        stats.initial_matching_size += len(mates) // 2
+    for batch_mates, batch_stats in results:
+        mates.update(batch_mates)
+        if stats is not None:
+            stats.merge(batch_stats)
+    return Matching.from_mates(mates)
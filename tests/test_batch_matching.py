@@ -0,0 +1,73 @@
+from batch_matching import *
+from concurrent.futures import ThreadPoolExecutor
+from test_util import create_random_graph, create_odd_cycle_graph
+import random
+import time
+
+
+def sleep_and_return(value, seconds):
+    time.sleep(seconds)
+    return value
+
+
+def test_stream_results():
+    arguments = [(value, 0.05 if value == 0 else 0) for value in range(10)]
+    with ThreadPoolExecutor(4) as executor:
+        assert list(stream_results(executor, sleep_and_return, arguments, ordered=True, window=3)) == \
+               [(value, value) for value in range(10)]
+        unordered_results = list(stream_results(executor, sleep_and_return, iter(arguments), ordered=False, window=3))
+    assert sorted(unordered_results) == [(value, value) for value in range(10)]
+    # the slow first call finishes after the ones submitted alongside it
+    assert unordered_results[0] != (0, 0)
+
+
+def test_find_maximum_matchings():
+    random.seed(5)
+    graphs = [create_random_graph(12, 0.3) for _ in range(8)] + [create_odd_cycle_graph(9)]
+    expected_sizes = [len(find_maximum_matching(graph)) for graph in graphs]
+    results = list(find_maximum_matchings(graphs, max_workers=2))
+    assert [index for index, _ in results] == list(range(len(graphs)))
+    assert [len(matching) for _, matching in results] == expected_sizes
+
+    with ThreadPoolExecutor(2) as executor:
+        results = find_maximum_matchings(iter(graphs), "gabow", "greedy", ordered=False, executor=executor)
+        assert sorted((index, len(matching)) for index, matching in results) == list(enumerate(expected_sizes))
+
+
+def test_read_graph_blocks():
+    blocks = list(read_graph_blocks(["0,1\n", "1,0\n", "\n", "\n", "A B\n", "B C\n"]))
+    assert blocks == ["0,1\n1,0\n", "A B\nB C\n"]
+
+
+def test_match_graph_text_of_short_edge_lists():
+    # short comma separated edge lists are not mistaken for dense matrices
+    assert set(match_graph_text("0,1\n1,2\n", "auto", "empty").splitlines()) in ({"0 1"}, {"1 2"})
+    assert match_graph_text("A,B\n", "auto", "empty") == "A B\n"
+    assert match_graph_text("0,1\n1,0\n", "auto", "empty") == "0 1\n"
+
+
+def test_batch_cli(tmp_path):
+    graph_directory = tmp_path / "graphs"
+    graph_directory.mkdir()
+    (graph_directory / "first.csv").write_text("0,1,0,0\n1,0,1,1\n0,1,0,1\n0,1,1,0\n")
+    (graph_directory / "second.txt").write_text("A B\nB C\nC D\n")
+    main(['--input', str(graph_directory), '--workers', '2'])
+    assert (graph_directory / "first_matching.csv").read_text() == "0,1,0,0\n1,0,0,0\n0,0,0,1\n0,0,1,0\n"
+    assert set((graph_directory / "second_matching.txt").read_text().splitlines()) == {"A B", "C D"}
+    # a second run skips the matchings written by the first
+    assert len(list_graph_files(str(graph_directory))) == 2
+
+    graphs_file = tmp_path / "graphs.txt"
+    graphs_file.write_text("0,1\n1,0\n\nA B\nB C\nC D\n\nX Y\n")
+    main(['--input', str(graphs_file), '--workers', '2'])
+    blocks = (tmp_path / "graphs_matching.txt").read_text().split("# graph ")[1:]
+    assert [block.splitlines()[0] for block in blocks] == ["0", "1", "2"]
+    assert set(blocks[1].splitlines()[1:-1]) == {"A B", "C D"}
+    assert blocks[2].splitlines()[1] == "X Y"
+
+
+if __name__ == "__main__":
+    test_stream_results()
+    test_find_maximum_matchings()
+    test_read_graph_blocks()
+    test_match_graph_text_of_short_edge_lists()
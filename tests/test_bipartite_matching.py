@@ -0,0 +1,77 @@
+from bipartite_matching import find_two_colouring, find_shortest_augmenting_paths
+from find_maximum_matching import find_maximum_matching
+from matching_stats import MatchingStats
+from data_structures import Graph, Matching, Edge
+from test_util import create_csr_graph, create_grid_graph, create_odd_cycle_graph, find_max_matchings_brute_force
+import pytest
+import random
+
+
+def test_find_two_colouring():
+    graph = Graph({'A': {'B'}, 'B': {'C'}, 'C': {'D'}, 'D': {'A'}, 'E': {'F'}, 'G': set()})
+    colouring = find_two_colouring(graph)
+    assert all(colouring[node] != colouring[neighbour]
+               for node in graph.node_to_edges for neighbour in graph.get_neighbours(node))
+    assert set(colouring) == {'A', 'B', 'C', 'D', 'E', 'F', 'G'}
+
+
+def test_find_two_colouring_of_odd_cycle():
+    assert find_two_colouring(create_odd_cycle_graph(5)) is None
+    assert find_two_colouring(Graph({'A': {'B'}, 'C': {'D', 'E'}, 'D': {'E'}})) is None
+
+
+def test_find_shortest_augmenting_paths():
+    graph = Graph({'A': {'B'}, 'B': {'C'}, 'C': {'D'}, 'E': {'F'}})
+    matching = Matching({Edge('B', 'C')})
+    colouring = find_two_colouring(graph)
+    paths = find_shortest_augmenting_paths(graph, matching, colouring)
+    # only the edge E-F is a shortest augmenting path, the path through B and C is longer
+    assert [set(path) for path in paths] == [{'E', 'F'}]
+    matching.augment(paths[0])
+    paths = find_shortest_augmenting_paths(graph, matching, colouring)
+    assert len(paths) == 1 and set(paths[0]) == {'A', 'B', 'C', 'D'} and len(paths[0]) == 4
+    matching.augment(paths[0])
+    assert find_shortest_augmenting_paths(graph, matching, colouring) == []
+
+
+def test_bipartite_graphs_use_hopcroft_karp():
+    stats = MatchingStats()
+    matching = find_maximum_matching(create_grid_graph(6, 7), stats=stats)
+    assert stats.engine == "hopcroft-karp"
+    assert len(matching) == 21
+    assert "engine: hopcroft-karp" in stats.report()
+
+
+def test_other_graphs_fall_back():
+    stats = MatchingStats()
+    assert len(find_maximum_matching(create_odd_cycle_graph(7), stats=stats)) == 3
+    assert stats.engine == "gabow"
+
+    stats = MatchingStats()
+    find_maximum_matching(create_grid_graph(3, 3), "gabow", stats=stats)
+    assert stats.engine == "gabow"
+
+    with pytest.raises(ValueError):
+        find_maximum_matching(create_odd_cycle_graph(7), "hopcroft-karp")
+
+
+def test_hopcroft_karp_against_brute_force():
+    rng = random.Random(7)
+    for _ in range(50):
+        left, right = rng.randint(1, 5), rng.randint(1, 5)
+        graph = Graph({"l{}".format(i): {"r{}".format(j) for j in range(right) if rng.random() < 0.4}
+                       for i in range(left)})
+        max_size, _ = find_max_matchings_brute_force(graph)
+        assert len(find_maximum_matching(graph, "hopcroft-karp", rng.choice(["empty", "greedy"]))) == max_size
+
+
+def test_hopcroft_karp_on_csr_graphs():
+    rng = random.Random(11)
+    for _ in range(50):
+        edges = [(i, 20 + j) for i in range(20) for j in range(15) if rng.random() < 0.1]
+        graph = create_csr_graph(35, edges)
+        stats = MatchingStats()
+        matching = find_maximum_matching(graph, stats=stats)
+        assert stats.engine == "hopcroft-karp"
+        assert len(matching) == len(find_maximum_matching(graph, "gabow"))
+        assert all(mate in graph.get_neighbours(node) for node, mate in matching.mates.items())
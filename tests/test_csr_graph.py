@@ -0,0 +1,68 @@
+from csr_graph import *
+from find_maximum_matching import find_maximum_matching
+from test_util import create_random_graph
+
+
+def test_label_table():
+    labels = LabelTable(['B', 'A'])
+    assert labels.intern('C') == 2
+    assert labels.intern('A') == 1
+    assert len(labels) == 3
+    assert labels.get_id('B') == 0
+    assert labels.get_label(2) == 'C'
+    assert labels.matching_to_labels(Matching({Edge(0, 2)})).edges == {Edge('B', 'C')}
+    assert labels.matching_to_ids(Matching({Edge('A', 'C')})).edges == {Edge(1, 2)}
+
+
+def test_csr_graphs():
+    test_graph = CSRGraph.from_labelled_pairs([('A', 'B'), ('A', 'C'), ('D', 'C'), ('C', 'A')])
+    assert list(test_graph.offsets) == [0, 2, 3, 5, 6]
+    assert list(test_graph.neighbours) == [1, 2, 0, 0, 3, 2]
+    assert test_graph.node_to_edges == {0: {1, 2}, 1: {0}, 2: {0, 3}, 3: {2}}
+    assert test_graph.get_nodes() == {0, 1, 2, 3}
+    assert test_graph.get_edges() == {Edge(0, 1), Edge(0, 2), Edge(2, 3)}
+    assert test_graph.get_degree(2) == 2
+    assert test_graph.number_of_nodes() == 4
+    assert test_graph.number_of_edges() == 3
+    assert test_graph.get_exposed_nodes(Matching({Edge(0, 2)})) == {1, 3}
+    assert test_graph.get_unmarked_edge(0, {Edge(0, 2)}) == Edge(0, 1)
+
+    test_graph_from_matrix = CSRGraph.from_matrix([[0, 1, 1], [1, 0, 0], [1, 0, 0]])
+    assert test_graph_from_matrix.node_to_edges == {0: {1, 2}, 1: {0}, 2: {0}}
+    assert test_graph_from_matrix.labels.labels == ['0', '1', '2']
+
+    dict_graph = Graph({'A': {'B', 'C'}, 'D': {'C'}})
+    csr_graph_from_graph = CSRGraph.from_graph(dict_graph)
+    assert {Edge(*(csr_graph_from_graph.labels.get_label(node) for node in edge.nodes))
+            for edge in csr_graph_from_graph.get_edges()} == dict_graph.get_edges()
+    assert test_graph.delete_node(0).node_to_edges == {1: set(), 2: {3}, 3: {2}}
+
+    # the arrays cannot be changed in place, so the mutators of Graph refuse rather than change a copy
+    for change in (lambda: test_graph.add_node(4), lambda: test_graph.add_edge(1, 3),
+                   lambda: test_graph.remove_edge(0, 1), lambda: test_graph.remove_node(0)):
+        try:
+            change()
+            assert False
+        except TypeError:
+            pass
+    assert test_graph.get_edges() == {Edge(0, 1), Edge(0, 2), Edge(2, 3)}
+
+
+def test_matching_on_csr_graph():
+    graph = Graph(
+        {'a': {'b', 'f', 'c'}, 'b': {'a', 'g', 'd'}, 'c': {'a', 'e', 'h'}, 'd': {'b', 'e', 'i'}, 'e': {'c', 'd', 'j'},
+         'j': {'e', 'k'}, 'k': {'l'}})
+    csr_graph = CSRGraph.from_graph(graph)
+    csr_matching = find_maximum_matching(csr_graph)
+    assert csr_graph.labels.matching_to_labels(csr_matching).edges == find_maximum_matching(graph).edges
+
+    for i in range(20):
+        random_graph = create_random_graph(12, 0.3)
+        assert len(find_maximum_matching(CSRGraph.from_graph(random_graph)).edges) == \
+               len(find_maximum_matching(random_graph).edges)
+
+
+if __name__ == "__main__":
+    test_label_table()
+    test_csr_graphs()
+    test_matching_on_csr_graph()
@@ -6,6 +6,14 @@ def test_edges():
     assert not Edge('A', 'B') == Edge('A', 'C')
     assert {Edge('A', 'B'), Edge('A', 'C')} == {Edge('C', 'A'), Edge('B', 'A')}
     assert Edge('A', 'B').find_partner('A') == 'B'
+    assert Edge('A', 'B').nodes == frozenset({'A', 'B'})
+    assert hash(Edge('A', 'B', 2)) == hash(Edge('B', 'A', 2)) and Edge('A', 'B', 2) != Edge('A', 'B')
+    assert not hasattr(Edge('A', 'B'), '__dict__')
+    try:
+        Edge('A', 'B').find_partner('C')
+        assert False
+    except ValueError:
+        pass
 
 
 def test_matchings():
@@ -14,11 +22,28 @@ def test_matchings():
     assert matching1.matching_to_dictionary() == {'A': 'B', 'B': 'A', 'C': 'D', 'D': 'C'}
     matching2 = Matching({Edge('A', 'B'), Edge('C', 'D'), Edge('E', 'F')})
     blossom = Blossom('D', ['D', 'E', 'F'], [])
-    assert matching2.contract_matching(blossom).edges == {Edge('A', 'B'), Edge('C', str(hash('DEF')))}
+    assert matching2.contract_matching(blossom).edges == {Edge('A', 'B'), Edge('C', blossom.get_label())}
 
     int_matching = Matching({Edge('0', '1')})
     assert int_matching.to_matrix(2) == [[0, 1], [1, 0]]
 
+    assert matching1.mate('A') == 'B'
+    assert matching1.mate('E') is None
+    assert matching1.is_exposed('E') and not matching1.is_exposed('C')
+    assert len(matching1) == 2
+
+    augmented_matching = matching1.copy()
+    augmented_matching.augment(['E', 'A', 'B', 'C', 'D', 'F'])
+    assert augmented_matching.edges == {Edge('E', 'A'), Edge('B', 'C'), Edge('D', 'F')}
+    assert matching1.edges == {Edge('A', 'B'), Edge('C', 'D')}
+    assert Matching.from_mates({'A': 'B', 'B': 'A'}).edges == {Edge('A', 'B')}
+
+    try:
+        Matching({Edge('A', 'B'), Edge('B', 'C')})
+        assert False
+    except ValueError:
+        pass
+
 
 def test_graphs():
     test_graph = Graph({'A': {'B', 'C'}, 'D': {'C'}})
@@ -38,7 +63,7 @@ def test_graphs():
 
     graph_with_blossom = Graph({'A': {'B'}, 'B': {'C', 'D'}, 'C': {'E'}, 'D': {'F'}, 'E': {'D'}})
     blossom = Blossom('B', ['C', 'D'], ['E'])
-    blossom_hash = str(hash('BCDE'))
+    blossom_hash = blossom.get_label()
     assert graph_with_blossom.contract_blossom(blossom).node_to_edges == {'A': {blossom_hash}, blossom_hash: {'A', 'F'},
                                                                           'F': {blossom_hash}}
 
@@ -49,12 +74,49 @@ def test_graphs():
     assert graph_to_be_deleted.delete_edge(Edge('B', 'C')).node_to_edges == {'A': set()}
 
 
+def test_graph_views():
+    graph = Graph({'A': {'B', 'C'}, 'B': {'C'}, 'C': {'D'}})
+    view = graph.delete_node('D').without(edges=[Edge('A', 'B')])
+    assert isinstance(view, GraphView) and view.base is graph
+    assert view.node_to_edges == {'A': {'C'}, 'B': {'C'}, 'C': {'A', 'B'}}
+    assert 'D' not in view.node_to_edges and len(view.node_to_edges) == 3
+    assert view.get_degree('C') == 2 and view.number_of_edges() == 2
+    assert view.get_edges() == {Edge('A', 'C'), Edge('B', 'C')}
+    assert view.deleted_nodes == frozenset({'D'})
+    try:
+        view.get_neighbours('D')
+        assert False
+    except KeyError:
+        pass
+
+    # the base graph is shared rather than copied, and is left as it was
+    assert graph.node_to_edges == {'A': {'B', 'C'}, 'B': {'A', 'C'}, 'C': {'A', 'B', 'D'}, 'D': {'C'}}
+    assert view.delete_node('Z').node_to_edges == view.node_to_edges
+
+    # a long chain of views is read without recursing through it
+    chained_view = graph
+    for _ in range(5000):
+        chained_view = chained_view.without(edges=[Edge('A', 'B')])
+    assert chained_view.get_neighbours('A') == ['C']
+
+    copied_graph = Graph(view.node_to_edges)
+    copied_graph.add_edge('A', 'B')
+    assert view.number_of_edges() == 2
+    try:
+        view.add_edge('A', 'B')
+        assert False
+    except TypeError:
+        pass
+
+
 def test_trees():
     tree_dict = {'A': {'B'}, 'B': {'C', 'D'}}
     test_tree = Tree(tree_dict, 'A', {'A': 0, 'B': 1, 'C': 2, 'D': 2})
     assert test_tree.is_distance_to_root_even('C')
     assert not test_tree.is_distance_to_root_even('B')
     assert test_tree.path_to_root('C') == ['C', 'B', 'A']
+    assert test_tree.parents == {'B': 'A', 'C': 'B', 'D': 'B'}
+    assert test_tree.get_parent('D') == 'B'
 
     small_blossom_tree = Tree({'A': {'B'}, 'B': {'C'}, 'C': {'D'}, 'D': {'E'}}, 'A', {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4})
     small_blossom = small_blossom_tree.find_blossom('C', 'E')
@@ -70,6 +132,12 @@ def test_trees():
     assert large_blossom.left_branch == ['C', 'E']
     assert large_blossom.right_branch == ['D']
 
+    # the stem is found by walking up from the deeper node first, whichever order the nodes are given in
+    reversed_blossom = large_blossom_tree.find_blossom('D', 'E')
+    assert reversed_blossom.stem == 'B'
+    assert reversed_blossom.left_branch == ['D']
+    assert reversed_blossom.right_branch == ['C', 'E']
+
 
 def test_forests():
     test_tree_1_dict = {'A': {'B', 'C'}}
@@ -83,11 +151,21 @@ def test_forests():
     assert test_forest.get_nodes() == {'A', 'B', 'C', 'D', 'E', 'F'}
     assert test_forest.get_relevant_nodes({'A', 'D'}) == {'F'}
 
+    test_forest.extend_tree('F', 'G')
+    assert test_tree_2.get_parent('G') == 'F'
+    assert test_tree_2.path_to_root('G') == ['G', 'F', 'E', 'D']
+
 
 def test_blossoms():
     blossom = Blossom('H', ['G', 'F'], ['I', 'J'])
     assert blossom.get_branch('G') == (['G', 'F'], ['I', 'J'])
     assert blossom.get_branch('I') == (['I', 'J'], ['G', 'F'])
+    assert blossom.get_nodes() == {'F', 'G', 'H', 'I', 'J'}
+    assert blossom.get_direct_path_from_stem('F') == ['H', 'G', 'F']
+    assert blossom.get_indirect_path_from_stem('I') == ['H', 'G', 'F', 'J', 'I']
+
+    # every blossom gets its own label, even one with the same nodes
+    assert blossom.get_label() != Blossom('H', ['G', 'F'], ['I', 'J']).get_label()
 
 
 if __name__ == "__main__":
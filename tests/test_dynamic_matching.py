@@ -0,0 +1,104 @@
+from dynamic_matching import *
+from find_maximum_matching import ALGORITHMS
+from test_util import create_random_graph, create_odd_cycle_graph
+import random
+
+
+def assert_maximum(matcher):
+    assert len(matcher.matching) == len(find_maximum_matching(matcher.graph))
+    assert all(matcher.matching.mate(partner) == node and partner in matcher.graph.get_neighbours(node)
+               for node, partner in matcher.matching.mates.items())
+
+
+def test_graph_updates_in_place():
+    graph = Graph({'A': {'B'}})
+    graph.add_edge('B', 'C')
+    graph.add_node('D')
+    assert graph.node_to_edges == {'A': {'B'}, 'B': {'A', 'C'}, 'C': {'B'}, 'D': set()}
+    graph.remove_edge('A', 'B')
+    graph.remove_node('C')
+    assert graph.node_to_edges == {'A': set(), 'B': set(), 'D': set()}
+
+
+def test_matching_unmatch():
+    matching = Matching({Edge('A', 'B')})
+    assert matching.unmatch('C') is None
+    assert matching.unmatch('B') == 'A'
+    assert len(matching) == 0 and matching.edges == frozenset()
+
+
+def test_dynamic_matcher_on_odd_cycle():
+    graph = create_odd_cycle_graph(5)
+    stats = MatchingStats()
+    matcher = DynamicMatcher(graph, stats=stats)
+    assert len(matcher.matching) == 2
+    searches = stats.searches
+
+    # the matcher works on its own copy of the graph
+    matcher.add_vertex('5')
+    assert '5' not in graph.node_to_edges
+
+    # which node of the cycle is left exposed depends on set iteration order, so hang the new node off a matched one
+    # to be sure that the new edge needs a search
+    exposed_node, = graph.get_exposed_nodes(matcher.matching)
+    matched_node = next(iter(graph.get_neighbours(exposed_node)))
+    matcher.add_edge(matched_node, '5')
+    assert matcher.matching.mate(exposed_node) is not None
+    assert len(matcher.matching) == 3
+    assert stats.searches == searches + 1
+
+    # an edge between two exposed nodes is matched without a search
+    matcher.add_edge('6', '7')
+    assert len(matcher.matching) == 4
+    assert stats.searches == searches + 1
+
+    matcher.remove_vertex('5')
+    matcher.remove_vertex('6')
+    assert len(matcher.matching) == 2
+    matched_node = next(iter(matcher.matching.mates))
+    matcher.remove_edge(matched_node, matcher.matching.mate(matched_node))
+    assert_maximum(matcher)
+
+
+def test_dynamic_matcher_chooses_search():
+    stats = MatchingStats()
+    matcher = DynamicMatcher(Graph.from_path(['A', 'B', 'C', 'D']), "auto", stats=stats)
+    matcher.remove_edge('A', 'B')
+    assert len(matcher.matching) == 1 and stats.engine == "hopcroft-karp"
+
+    # closing an odd cycle makes the graph non-bipartite, so the next repair falls back to a general search
+    matcher.add_edge('B', 'D')
+    assert_maximum(matcher)
+    assert stats.engine == "gabow"
+
+
+def test_dynamic_matcher_stays_maximum():
+    random.seed(3)
+    for algorithm in ALGORITHMS:
+        if algorithm == "hopcroft-karp":
+            continue
+        matcher = DynamicMatcher(create_random_graph(12, 0.2), algorithm)
+        for update in range(100):
+            nodes = sorted(matcher.graph.get_nodes())
+            node = random.choice(nodes)
+            update_type = random.random()
+            if update_type < 0.5:
+                other_node = random.choice(nodes)
+                if other_node != node:
+                    matcher.add_edge(node, other_node)
+            elif update_type < 0.8:
+                if matcher.graph.get_degree(node) > 0:
+                    matcher.remove_edge(node, random.choice(sorted(matcher.graph.get_neighbours(node))))
+            elif update_type < 0.9:
+                matcher.remove_vertex(node)
+            else:
+                matcher.add_vertex(str(len(nodes) + update))
+            assert_maximum(matcher)
+
+
+if __name__ == "__main__":
+    test_graph_updates_in_place()
+    test_matching_unmatch()
+    test_dynamic_matcher_on_odd_cycle()
+    test_dynamic_matcher_chooses_search()
+    test_dynamic_matcher_stays_maximum()
@@ -4,8 +4,8 @@ from test_util import *
 
 
 def test_lift_path_blossom_not_endpoint():
-    test_augmenting_path = ['A', 'B', str(hash('CDEFG')), 'H']
     test_blossom = Blossom('C', ['D', 'F'], ['E', 'G'])
+    test_augmenting_path = ['A', 'B', test_blossom.get_label(), 'H']
     test_blossom_tree = Tree({'A': {'B'}, 'B': {'C'}, 'C': {'D', 'E'}, 'D': {'F'}, 'E': {'G'}}, 'A',
                              {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 3, 'F': 4, 'G': 4})
     test_non_blossom_tree = Tree({'H': set()}, 'H', {'H': 0})
@@ -23,8 +23,8 @@ def test_lift_path_blossom_not_endpoint():
 
 
 def test_lift_path_blossom_is_endpoint():
-    test_augmenting_path = ['A', 'B', 'C', str(hash('DEFGH'))]
     test_blossom = Blossom('G', ['H', 'D'], ['F', 'E'])
+    test_augmenting_path = ['A', 'B', 'C', test_blossom.get_label()]
     test_blossom_tree = Tree({'G': {'F', 'H'}, 'H': {'D'}, 'F': {'E'}}, 'G', {'G': 0, 'H': 1, 'F': 1, 'D': 2, 'E': 2})
     test_non_blossom_tree = Tree({'A': {'B'}, 'B': {'C'}}, 'A', {'A': 0, 'B': 1, 'C': 2})
     test_forest = Forest({test_blossom_tree, test_non_blossom_tree})
@@ -0,0 +1,104 @@
+from find_augmenting_path_implicit import *
+from find_augmenting_path_implicit import _BlossomBases
+from find_maximum_matching import find_maximum_matching, augment_matching_with_path
+from csr_graph import CSRGraph
+from initial_matching import greedy_matching
+from test_util import test_path_equality as assert_path_equality, create_random_graph
+
+
+def assert_is_augmenting_path(graph: Graph, matching: Matching, path: List[str]):
+    assert len(set(path)) == len(path)
+    assert path[0] in graph.get_exposed_nodes(matching) and path[-1] in graph.get_exposed_nodes(matching)
+    matching_dict = matching.matching_to_dictionary()
+    for i in range(len(path) - 1):
+        assert path[i + 1] in graph.node_to_edges[path[i]]
+        assert (matching_dict.get(path[i]) == path[i + 1]) == (i % 2 == 1)
+
+
+def test_blossom_bases():
+    bases = _BlossomBases()
+    bases.absorb('B', 'A')
+    bases.absorb('C', 'B')
+    assert bases.find('C') == 'A'
+    assert bases.parent['C'] == 'A'
+    assert bases.find('D') == 'D'
+
+
+def test_find_augmenting_path_implicit():
+    unaugmentable_graph = Graph({'A': {'B'}, 'B': {'C'}})
+    assert find_augmenting_path_implicit(unaugmentable_graph, Matching({Edge('B', 'C')})) == []
+
+    augmentable_graph = Graph({'A': {'B'}, 'B': {'C'}, 'C': {'D'}})
+    augmenting_path = find_augmenting_path_implicit(augmentable_graph, Matching({Edge('B', 'C')}))
+    assert_path_equality(augmenting_path, ['A', 'B', 'C', 'D'])
+
+
+def test_find_augmenting_path_implicit_through_blossom():
+    # the only augmenting path goes around the odd cycle A, B, D, E, C
+    test_graph = Graph(
+        {'A': {'B', 'C'}, 'B': {'A', 'D'}, 'D': {'B', 'E'}, 'E': {'C', 'D'}, 'C': {'A', 'E', 'H'}, 'H': {'C', 'G'},
+         'G': {'H', 'F'}, 'F': {'G'}})
+    test_matching = Matching({Edge('B', 'D'), Edge('C', 'E'), Edge('G', 'H')})
+    augmenting_path = find_augmenting_path_implicit(test_graph, test_matching)
+    assert_path_equality(augmenting_path, ['A', 'B', 'D', 'E', 'C', 'H', 'G', 'F'])
+
+    # nested blossoms: the triangle C, D, E sits inside the pentagon A, B, C, E, F
+    nested_graph = Graph({'R': {'A'}, 'A': {'B', 'F'}, 'B': {'C'}, 'C': {'D', 'E'}, 'D': {'E'}, 'E': {'F'},
+                          'D2': {'D'}, 'X': {'F'}, 'Z': {'R'}})
+    nested_matching = Matching({Edge('R', 'A'), Edge('B', 'C'), Edge('D', 'E'), Edge('F', 'X')})
+    nested_path = find_augmenting_path_implicit(nested_graph, nested_matching)
+    assert nested_path != []
+    assert_is_augmenting_path(nested_graph, nested_matching, nested_path)
+
+
+def test_against_edmonds():
+    for i in range(100):
+        graph = create_random_graph(14, 0.25)
+        matching = Matching(set())
+        while augmenting_path := find_augmenting_path_implicit(graph, matching):
+            assert_is_augmenting_path(graph, matching, augmenting_path)
+            matching = augment_matching_with_path(matching, augmenting_path)
+        assert len(matching.edges) == len(find_maximum_matching(graph).edges)
+        assert len(find_maximum_matching(graph, "gabow").edges) == len(matching.edges)
+
+
+def test_find_disjoint_augmenting_paths():
+    # two separate paths, each of which is augmenting
+    graph = Graph({'A': {'B'}, 'B': {'C'}, 'C': {'D'}, 'E': {'F'}, 'F': {'G'}, 'G': {'H'}})
+    matching = Matching({Edge('B', 'C'), Edge('F', 'G')})
+    augmenting_paths = find_disjoint_augmenting_paths(graph, matching)
+    assert len(augmenting_paths) == 2
+    for augmenting_path in augmenting_paths:
+        assert_is_augmenting_path(graph, matching, augmenting_path)
+    assert len({node for augmenting_path in augmenting_paths for node in augmenting_path}) == 8
+
+    for i in range(50):
+        graph = create_random_graph(14, 0.2)
+        augmenting_paths = find_disjoint_augmenting_paths(graph, Matching(set()))
+        nodes_in_paths = [node for augmenting_path in augmenting_paths for node in augmenting_path]
+        assert len(nodes_in_paths) == len(set(nodes_in_paths))
+        assert bool(augmenting_paths) == bool(graph.get_edges())
+
+    # the first path found joins the trees of X and Y, which a single search then skips, hiding Z - M1 - M2 - W
+    graph = CSRGraph.from_labelled_pairs([('X', 'M1'), ('X', 'Y'), ('M1', 'M2'), ('Z', 'M1'), ('W', 'M2')])
+    augmenting_paths = find_disjoint_augmenting_paths(graph, Matching({Edge(1, 3)}))
+    assert sorted(map(sorted, augmenting_paths)) == [[0, 2], [1, 3, 4, 5]]
+
+    # the set of paths is maximal: no augmenting path is left once the nodes of the paths are deleted
+    for i in range(50):
+        graph = create_random_graph(20, 0.15)
+        matching = greedy_matching(graph)
+        augmenting_paths = find_disjoint_augmenting_paths(graph, matching)
+        for augmenting_path in augmenting_paths:
+            assert_is_augmenting_path(graph, matching, augmenting_path)
+        nodes_in_paths = [node for augmenting_path in augmenting_paths for node in augmenting_path]
+        assert len(nodes_in_paths) == len(set(nodes_in_paths))
+        assert find_augmenting_path_implicit(graph.without(nodes_in_paths), matching) == []
+
+
+if __name__ == "__main__":
+    test_blossom_bases()
+    test_find_augmenting_path_implicit()
+    test_find_augmenting_path_implicit_through_blossom()
+    test_against_edmonds()
+    test_find_disjoint_augmenting_paths()
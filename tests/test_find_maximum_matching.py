@@ -42,9 +42,54 @@ def test_against_brute_force():
             print("ValueError encountered!  The graph was: {}".format(graph.node_to_edges))
 
 
+def test_algorithms_agree():
+    for i in range(100):
+        graph = create_random_graph(16, 0.2)
+        maximum_matching_size = len(find_maximum_matching(graph).edges)
+        for algorithm in AUGMENTING_PATH_FINDERS:
+            assert len(find_maximum_matching(graph, algorithm).edges) == maximum_matching_size
+
+
+def test_graph_views():
+    for i in range(50):
+        graph = create_random_graph(16, 0.2)
+        edges = sorted(graph.get_edges(), key=lambda edge: sorted(edge.nodes))
+        view = graph.delete_node('0').without(edges=edges[:3])
+        maximum_matching_size = len(find_maximum_matching(Graph(view.node_to_edges)).edges)
+        for algorithm in ALGORITHMS:
+            if algorithm == "hopcroft-karp":
+                continue
+            matching = find_maximum_matching(view, algorithm)
+            assert len(matching.edges) == maximum_matching_size
+            assert all(edge not in matching.edges for edge in edges[:3])
+
+
+def test_find_maximum_matching_large_matching():
+    # one augmentation per edge of the matching would overflow the stack if the driver recursed
+    path = [str(i) for i in range(2002)]
+    assert len(find_maximum_matching(Graph.from_path(path), "gabow").edges) == 1001
+
+
+def test_on_augmentation_callback():
+    graph = Graph.from_path(['A', 'B', 'C', 'D'])
+    initial_matching = Matching({Edge('B', 'C')})
+    augmentations = []
+    maximum_matching = find_maximum_matching_with_matching(
+        graph, initial_matching, on_augmentation=lambda matching, path: augmentations.append((len(matching.edges), path)))
+    assert maximum_matching.edges == {Edge('A', 'B'), Edge('C', 'D')}
+    assert initial_matching.edges == {Edge('B', 'C')}
+    assert len(augmentations) == 1
+    assert augmentations[0][0] == 2
+    test_path_equality(augmentations[0][1], ['A', 'B', 'C', 'D'])
+
+
 if __name__ == "__main__":
     test_augment_matching_with_path()
     test_find_maximum_basic_example()
     test_find_maximum_more_complex_example()
     test_against_brute_force()
+    test_algorithms_agree()
+    test_graph_views()
+    test_find_maximum_matching_large_matching()
+    test_on_augmentation_callback()
 
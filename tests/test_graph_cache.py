@@ -0,0 +1,111 @@
+import os
+import pickle
+from array import array
+
+import pytest
+
+from graph_cache import *
+from find_maximum_matching import main, find_maximum_matching
+
+
+def test_binary_graph_round_trip(tmp_path):
+    edge_list_file = tmp_path / "edges.txt"
+    edge_list_file.write_text("A B\nB C\nC D\nD A\nE F\n")
+    graph = convert_graph(str(edge_list_file), "edge-list")
+    loaded_graph = load_binary_graph(get_cache_name(str(edge_list_file)))
+    assert isinstance(loaded_graph.neighbours, memoryview)
+    assert loaded_graph.node_to_edges == graph.node_to_edges
+    assert loaded_graph.labels.labels == ['A', 'B', 'C', 'D', 'E', 'F']
+    assert len(find_maximum_matching(loaded_graph)) == 3
+    assert pickle.loads(pickle.dumps(loaded_graph)).node_to_edges == graph.node_to_edges
+
+    dense_file = tmp_path / "dense.csv"
+    dense_file.write_text("0,1,0\n1,0,0\n0,0,0\n")
+    convert_graph(str(dense_file), "dense")
+    loaded_graph = load_binary_graph(get_cache_name(str(dense_file)))
+    assert loaded_graph.node_to_edges == {0: {1}, 1: {0}, 2: set()}
+    assert loaded_graph.labels.labels == ['0', '1', '2']
+
+
+def test_load_binary_graph_rejects_other_files(tmp_path):
+    (tmp_path / "graph.csr").write_bytes(b"not a graph")
+    with pytest.raises(ValueError):
+        load_binary_graph(str(tmp_path / "graph.csr"))
+
+    edge_list_file = tmp_path / "edges.txt"
+    edge_list_file.write_text("A B\n")
+    convert_graph(str(edge_list_file), "edge-list")
+    cache_name = get_cache_name(str(edge_list_file))
+    with open(cache_name, mode="r+b") as handle:
+        handle.truncate(os.path.getsize(cache_name) - 1)
+    with pytest.raises(ValueError):
+        load_binary_graph(cache_name)
+
+
+def test_cache_is_only_used_while_fresh(tmp_path):
+    edge_list_file = tmp_path / "edges.txt"
+    edge_list_file.write_text("A B\n")
+    assert not is_cache_fresh(str(edge_list_file), "edge-list")
+    assert isinstance(read_graph_with_cache(str(edge_list_file), "edge-list").neighbours, array)
+    assert not os.path.exists(get_cache_name(str(edge_list_file)))
+
+    convert_graph(str(edge_list_file), "edge-list")
+    assert is_cache_fresh(str(edge_list_file), "edge-list")
+    assert not is_cache_fresh(str(edge_list_file), "dense")
+    assert isinstance(read_graph_with_cache(str(edge_list_file), "edge-list").neighbours, memoryview)
+
+    edge_list_file.write_text("A B\nC D\n")
+    assert not is_cache_fresh(str(edge_list_file), "edge-list")
+    graph = read_graph_with_cache(str(edge_list_file), "edge-list")
+    assert graph.number_of_edges() == 2
+    # the stale cache was rebuilt from the new contents
+    assert is_cache_fresh(str(edge_list_file), "edge-list")
+    assert load_binary_graph(get_cache_name(str(edge_list_file))).number_of_edges() == 2
+
+    # a file touched without changing its contents no longer matches the stamp in the cache
+    os.utime(edge_list_file, ns=(0, 0))
+    assert not is_cache_fresh(str(edge_list_file), "edge-list")
+
+
+def test_files_are_hashed_at_most_once(tmp_path, monkeypatch):
+    edge_list_file = tmp_path / "edges.txt"
+    edge_list_file.write_text("A B\n")
+    convert_graph(str(edge_list_file), "edge-list")
+    hashed_files = []
+    of_file = SourceStamp.of_file
+
+    def count_hashes(filename):
+        hashed_files.append(filename)
+        return of_file(filename)
+    monkeypatch.setattr(SourceStamp, "of_file", count_hashes)
+
+    read_graph_with_cache(str(edge_list_file), "edge-list")
+    assert len(hashed_files) == 1
+
+    # a change of size is seen without hashing the file, which is only hashed to rebuild the cache
+    edge_list_file.write_text("A B\nC D\n")
+    assert not is_cache_fresh(str(edge_list_file), "edge-list")
+    assert len(hashed_files) == 1
+    read_graph_with_cache(str(edge_list_file), "edge-list")
+    assert len(hashed_files) == 2
+
+    # new contents of the same size and modification time are only found by the hash, which is then reused
+    mtime_ns = os.stat(edge_list_file).st_mtime_ns
+    edge_list_file.write_text("A B\nC E\n")
+    os.utime(edge_list_file, ns=(mtime_ns, mtime_ns))
+    assert set(read_graph_with_cache(str(edge_list_file), "edge-list").labels.labels) == {'A', 'B', 'C', 'E'}
+    assert len(hashed_files) == 3
+    assert is_cache_fresh(str(edge_list_file), "edge-list")
+
+
+def test_cli_convert(tmp_path):
+    dense_file = tmp_path / "dense.csv"
+    dense_file.write_text("0,1,0,0\n1,0,1,1\n0,1,0,1\n0,1,1,0\n")
+    main(['--graph', str(dense_file), '--convert'])
+    assert os.path.exists(get_cache_name(str(dense_file)))
+    assert not os.path.exists(tmp_path / "dense_matching.csv")
+
+    main(['--graph', str(dense_file)])
+    assert (tmp_path / "dense_matching.csv").read_text() == "0,1,0,0\n1,0,0,0\n0,0,0,1\n0,0,1,0\n"
+    main(['--graph', str(dense_file), '--no-cache', '--output-format', 'pairs'])
+    assert set((tmp_path / "dense_matching.txt").read_text().splitlines()) == {"0 1", "2 3"}
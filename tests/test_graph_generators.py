@@ -0,0 +1,82 @@
+from test_util import create_random_graph, create_random_graph_fixed_vertices_edges, generate_gnp_edges, \
+    generate_gnm_edges, generate_random_regular_edges, generate_power_law_edges, create_sparse_random_graph, \
+    create_random_graph_with_edges, create_random_regular_graph, create_power_law_graph
+import random
+
+
+def assert_simple(edges):
+    assert all(first_vertex != second_vertex for first_vertex, second_vertex in edges)
+    assert len({frozenset(edge) for edge in edges}) == len(edges)
+
+
+def test_generate_gnp_edges():
+    assert list(generate_gnp_edges(4, 0)) == []
+    assert len(list(generate_gnp_edges(5, 1))) == 10
+
+    edges = list(generate_gnp_edges(2000, 0.01, random.Random(0)))
+    assert_simple(edges)
+    assert all(0 <= first_vertex < second_vertex < 2000 for first_vertex, second_vertex in edges)
+    # the expected number of edges is 19990, with a standard deviation of about 140
+    assert 19000 < len(edges) < 21000
+    assert edges == list(generate_gnp_edges(2000, 0.01, random.Random(0)))
+
+
+def test_generate_gnm_edges():
+    for number_of_edges in (0, 7, 40, 45):
+        edges = list(generate_gnm_edges(10, number_of_edges, random.Random(1)))
+        assert_simple(edges)
+        assert len(edges) == number_of_edges
+    try:
+        list(generate_gnm_edges(10, 46))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_generate_random_regular_edges():
+    for number_of_vertices, degree in ((10, 3), (50, 4), (20, 7)):
+        edges = generate_random_regular_edges(number_of_vertices, degree, random.Random(2))
+        assert_simple(edges)
+        degrees = [0] * number_of_vertices
+        for first_vertex, second_vertex in edges:
+            degrees[first_vertex] += 1
+            degrees[second_vertex] += 1
+        assert degrees == [degree] * number_of_vertices
+    try:
+        generate_random_regular_edges(5, 3)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_generate_power_law_edges():
+    edges = list(generate_power_law_edges(1000, 3000, 2.5, random.Random(3)))
+    assert_simple(edges)
+    assert len(edges) == 3000
+    degrees = [0] * 1000
+    for first_vertex, second_vertex in edges:
+        degrees[first_vertex] += 1
+        degrees[second_vertex] += 1
+    # the lowest numbered vertices are the hubs
+    assert degrees[0] > 10 * sum(degrees) / len(degrees)
+
+
+def test_create_graphs():
+    sparse_graph = create_sparse_random_graph(20000, 0.0002, seed=4)
+    assert sparse_graph.number_of_nodes() == 20000
+    assert sparse_graph.get_edges() == create_sparse_random_graph(20000, 0.0002, seed=4).get_edges()
+    assert create_random_graph_with_edges(100, 150, seed=5).number_of_edges() == 150
+    regular_graph = create_random_regular_graph(100, 3, seed=6)
+    assert all(regular_graph.get_degree(node) == 3 for node in regular_graph.get_nodes())
+    assert create_power_law_graph(100, 200, seed=7).number_of_edges() == 200
+
+    assert create_random_graph(10, 1).get_edges() == create_random_graph_fixed_vertices_edges(10, 45).get_edges()
+    assert len(create_random_graph(10, 0).get_nodes()) == 10
+
+
+if __name__ == "__main__":
+    test_generate_gnp_edges()
+    test_generate_gnm_edges()
+    test_generate_random_regular_edges()
+    test_generate_power_law_edges()
+    test_create_graphs()
@@ -0,0 +1,54 @@
+from initial_matching import *
+from find_maximum_matching import find_maximum_matching, find_maximum_matching_with_matching, main
+from test_util import create_random_graph
+
+
+def test_greedy_matching():
+    graph = Graph({'A': {'B'}, 'B': {'C'}, 'C': {'D'}})
+    matching = greedy_matching(graph)
+    assert len(matching.edges) in (1, 2)
+    assert all(edge.nodes.issubset(graph.get_nodes()) for edge in matching.edges)
+
+
+def test_karp_sipser_matching():
+    # matching the pendant nodes first finds the maximum matching of a path, whatever order the nodes are visited in
+    path_graph = Graph.from_path(['A', 'B', 'C', 'D', 'E', 'F'])
+    assert karp_sipser_matching(path_graph).edges == {Edge('A', 'B'), Edge('C', 'D'), Edge('E', 'F')}
+
+    star_graph = Graph({'A': {'B', 'C', 'D'}, 'D': {'E'}})
+    assert karp_sipser_matching(star_graph).edges in ({Edge('A', 'B'), Edge('D', 'E')}, {Edge('A', 'C'), Edge('D', 'E')})
+
+    assert karp_sipser_matching(Graph({'A': set()})).edges == set()
+
+
+def test_initial_matchings_are_valid_warm_starts():
+    for i in range(50):
+        graph = create_random_graph(14, 0.2)
+        maximum_matching_size = len(find_maximum_matching(graph).edges)
+        for initialiser in INITIAL_MATCHINGS:
+            initial_matching = INITIAL_MATCHINGS[initialiser](graph)
+            assert initial_matching.edges.issubset(graph.get_edges())
+            assert len(find_maximum_matching_with_matching(graph, initial_matching).edges) == maximum_matching_size
+            assert len(find_maximum_matching(graph, initialiser=initialiser).edges) == maximum_matching_size
+
+
+def test_cli_reports_initial_matching(tmp_path, capsys):
+    edge_list_file = tmp_path / "edges.txt"
+    edge_list_file.write_text("A B\nB C\nC D\nD E\nE F\nG H\n")
+    for options in ([], ['--workers', '1'], ['--matching-cache', str(tmp_path / "cache")]):
+        main(['--graph', str(edge_list_file), '--initialiser', 'karp-sipser'] + options)
+        assert "The karp-sipser initialiser matched 4 of the 4 edges in the maximum matching" in \
+               capsys.readouterr().err
+
+    # a matching found in the cache is not searched for, so no initialiser is run
+    main(['--graph', str(edge_list_file), '--initialiser', 'karp-sipser', '--matching-cache', str(tmp_path / "cache")])
+    assert "initialiser" not in capsys.readouterr().err
+
+    main(['--graph', str(edge_list_file), '--initialiser', 'karp-sipser', '--kernelize'])
+    assert "edges in the maximum matching of the kernel" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    test_greedy_matching()
+    test_karp_sipser_matching()
+    test_initial_matchings_are_valid_warm_starts()
@@ -0,0 +1,58 @@
+from kernelization import *
+from find_maximum_matching import find_maximum_matching
+from matching_stats import MatchingStats
+from test_util import create_random_graph, create_odd_cycle_graph, create_complete_graph
+
+
+def assert_valid_matching(matching, graph):
+    assert all(matching.mate(partner) == node and partner in graph.get_neighbours(node)
+               for node, partner in matching.mates.items())
+
+
+def test_pendant_nodes_are_matched():
+    graph = Graph({'A': {'B'}, 'B': {'C', 'D'}, 'E': set()})
+    kernel = find_kernel(graph)
+    assert kernel.graph.number_of_nodes() == 0
+    assert kernel.forced_mates in ({'A': 'B', 'B': 'A'}, {'C': 'B', 'B': 'C'}, {'D': 'B', 'B': 'D'})
+    assert len(kernel.lift(Matching(set()))) == 1
+
+
+def test_degree_two_nodes_are_folded():
+    # every node of a complete graph on four nodes has degree three, so nothing can be reduced
+    assert find_kernel(create_complete_graph(4)).folds == []
+
+    # B has degree two, so A and C are folded into a vertex adjacent to D and E
+    graph = Graph({'A': {'B', 'D', 'E'}, 'B': {'C'}, 'C': {'D', 'E'}, 'D': {'E'}})
+    kernel = find_kernel(graph)
+    first_fold = kernel.folds[0]
+    assert first_fold.node == 'B' and {first_fold.first_neighbour, first_fold.second_neighbour} == {'A', 'C'}
+    matching = kernel.lift(find_maximum_matching(kernel.graph))
+    assert len(matching) == 2
+    assert_valid_matching(matching, graph)
+
+
+def test_odd_cycle_folds_away():
+    kernel = find_kernel(create_odd_cycle_graph(101))
+    assert kernel.graph.number_of_edges() == 0
+    assert "to 0 nodes and 0 edges" in kernel.report()
+    assert len(kernel.lift(Matching(set()))) == 50
+
+
+def test_kernelized_matchings_are_maximum():
+    for i in range(200):
+        graph = create_random_graph(12, 0.25)
+        matching = find_maximum_matching(graph, kernelize=True)
+        assert len(matching) == len(find_maximum_matching(graph))
+        assert_valid_matching(matching, graph)
+
+    stats = MatchingStats()
+    find_maximum_matching(create_odd_cycle_graph(9), stats=stats, kernelize=True)
+    assert stats.kernel_nodes_removed == 9 and stats.kernel_edges_removed == 9
+    assert "kernelize" in stats.seconds
+
+
+if __name__ == "__main__":
+    test_pendant_nodes_are_matched()
+    test_degree_two_nodes_are_folded()
+    test_odd_cycle_folds_away()
+    test_kernelized_matchings_are_maximum()
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from matching_cache import MatchingCache, find_maximum_matching_cached, hash_graph, restrict_matching
+from find_maximum_matching import find_maximum_matching, main
+from matching_stats import MatchingStats
+from data_structures import Graph, Matching, Edge
+from test_util import create_csr_graph, create_grid_graph, create_random_graph_fixed_vertices_edges
+
+
+def test_hash_graph_ignores_order():
+    graph = Graph({'A': {'B', 'C'}, 'C': {'D'}})
+    reordered_graph = Graph({'D': {'C'}, 'C': {'A', 'D'}, 'B': {'A'}, 'A': {'C', 'B'}})
+    assert hash_graph(graph) == hash_graph(reordered_graph)
+    assert hash_graph(graph) != hash_graph(Graph({'A': {'B', 'C'}, 'B': {'D'}}))
+    assert hash_graph(graph) != hash_graph(Graph({'A': {'B', 'C'}, 'C': {'D'}, 'E': set()}))
+    assert hash_graph(create_csr_graph(4, [(0, 1), (1, 2)])) == hash_graph(create_csr_graph(4, [(2, 1), (1, 0)]))
+
+
+def test_restrict_matching():
+    graph = Graph({'A': {'B'}, 'C': {'E'}})
+    matching = Matching({Edge('A', 'B'), Edge('C', 'D')})
+    assert restrict_matching(matching, graph).edges == {Edge('A', 'B')}
+
+
+def test_memory_tier_is_least_recently_used():
+    cache = MatchingCache(max_entries=2)
+    cache.put("first", Matching({Edge('A', 'B')}))
+    cache.put("second", Matching({Edge('C', 'D')}))
+    assert cache.get("first").edges == {Edge('A', 'B')}
+    cache.put("third", Matching(set()))
+    assert cache.get("second") is None
+    assert cache.get("first") is not None and cache.get("third") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    # the stored matching cannot be changed through the one handed out
+    cache.get("first").unmatch('A')
+    assert len(cache.get("first")) == 1
+
+
+def test_disk_tier(tmp_path):
+    cache = MatchingCache(max_entries=1, directory=str(tmp_path))
+    cache.put("first", Matching({Edge('A', 'B')}))
+    cache.put("second", Matching({Edge('C', 'D')}))
+    assert cache.get("first").edges == {Edge('A', 'B')}
+    assert MatchingCache(directory=str(tmp_path)).get("second").edges == {Edge('C', 'D')}
+
+    file_size = os.path.getsize(tmp_path / "first.matching")
+    os.utime(tmp_path / "first.matching", ns=(0, 0))
+    small_cache = MatchingCache(directory=str(tmp_path), max_disk_bytes=2 * file_size)
+    small_cache.put("third", Matching({Edge('E', 'F')}))
+    assert sorted(os.listdir(tmp_path)) == ["second.matching", "third.matching"]
+
+
+def test_find_maximum_matching_cached():
+    cache = MatchingCache()
+    graph = create_random_graph_fixed_vertices_edges(40, 80)
+    matching = find_maximum_matching_cached(graph, cache)
+    assert len(matching) == len(find_maximum_matching(graph))
+    stats = MatchingStats()
+    assert find_maximum_matching_cached(Graph(dict(graph.node_to_edges)), cache, stats=stats).edges == matching.edges
+    assert cache.hits == 1 and stats.searches == 0
+
+
+def test_warm_start_from_similar_graph():
+    cache = MatchingCache()
+    graph = create_grid_graph(10, 10)
+    find_maximum_matching_cached(graph, cache)
+    graph.add_node("extra")
+    graph.add_edge("extra", "0,0")
+    stats = MatchingStats()
+    matching = find_maximum_matching_cached(graph, cache, stats=stats)
+    assert cache.warm_starts == 1
+    assert stats.initial_matching_size == 50
+    assert len(matching) == 50
+
+    # a matching that mostly does not fit the graph is not used
+    unrelated_graph = Graph({"{},{}".format(row, 0): {"{},{}".format(row + 1, 0)} for row in range(9)})
+    find_maximum_matching_cached(unrelated_graph, cache)
+    assert cache.warm_starts == 1
+
+
+def test_cli_matching_cache(tmp_path, capsys):
+    dense_file = tmp_path / "dense.csv"
+    dense_file.write_text("0,1,0,0\n1,0,1,1\n0,1,0,1\n0,1,1,0\n")
+    main(['--graph', str(dense_file), '--matching-cache', str(tmp_path / "cache")])
+    assert "searched for" in capsys.readouterr().err
+    main(['--graph', str(dense_file), '--matching-cache', str(tmp_path / "cache")])
+    assert "found in the cache" in capsys.readouterr().err
+    assert (tmp_path / "dense_matching.csv").read_text() == "0,1,0,0\n1,0,0,0\n0,0,0,1\n0,0,1,0\n"
+
+    # the parallel search does not look in the cache, so the two are not accepted together
+    with pytest.raises(SystemExit):
+        main(['--graph', str(dense_file), '--matching-cache', str(tmp_path / "cache"), '--workers', '2'])
@@ -0,0 +1,57 @@
+from matching_stats import *
+from find_maximum_matching import find_maximum_matching, find_maximum_matching_with_matching, AUGMENTING_PATH_FINDERS
+from data_structures import Edge, Graph, Matching
+from test_util import create_nested_blossom_graph, create_odd_cycle_graph
+
+
+def test_matching_stats():
+    stats = MatchingStats()
+    with stats.time("search"):
+        pass
+    with stats.time("search"):
+        pass
+    assert set(stats.seconds) == {"search"}
+    stats.enter_blossom()
+    stats.enter_blossom()
+    stats.leave_blossom()
+    stats.enter_blossom()
+    assert stats.blossoms == 3
+    assert stats.max_blossom_depth == 2
+    assert "blossoms: 3" in stats.report()
+
+    with timed(None, "search"):
+        pass
+
+
+def test_stats_from_find_maximum_matching():
+    graph = create_nested_blossom_graph(3)
+    for algorithm in AUGMENTING_PATH_FINDERS:
+        stats = MatchingStats()
+        matching = find_maximum_matching(graph, algorithm, stats=stats)
+        assert stats.augmentations == len(matching)
+        assert stats.searches > 0
+        assert stats.edges_scanned > 0
+        assert {"initialise", "search", "augment"}.issubset(stats.seconds)
+
+    # an odd cycle is a single blossom that the last augmenting path has to pass through
+    edmonds_stats = MatchingStats()
+    find_maximum_matching(create_odd_cycle_graph(9), "edmonds", initialiser="greedy", stats=edmonds_stats)
+    assert edmonds_stats.initial_matching_size > 0
+    assert edmonds_stats.searches == edmonds_stats.augmentations + 1
+
+    # the only augmenting path runs from R around the long side of one five cycle and on around the long side of the
+    # other to F, so whichever end the search finds it from, it has to contract a blossom
+    graph = Graph({'R': {'S1'}, 'S1': {'A1'}, 'A1': {'B1', 'E1'}, 'B1': {'C1', 'B2'}, 'C1': {'D1'}, 'D1': {'E1'},
+                   'F': {'S2'}, 'S2': {'A2'}, 'A2': {'B2', 'E2'}, 'B2': {'C2'}, 'C2': {'D2'}, 'D2': {'E2'}})
+    matching = Matching({Edge('S1', 'A1'), Edge('B1', 'C1'), Edge('D1', 'E1'),
+                         Edge('S2', 'A2'), Edge('B2', 'C2'), Edge('D2', 'E2')})
+    blossom_stats = MatchingStats()
+    assert len(find_maximum_matching_with_matching(graph, matching, "edmonds", stats=blossom_stats)) == 7
+    assert blossom_stats.augmentations == 1
+    assert blossom_stats.blossoms > 0 and blossom_stats.max_blossom_depth > 0
+    assert {"contract", "lift"}.issubset(blossom_stats.seconds)
+
+
+if __name__ == "__main__":
+    test_matching_stats()
+    test_stats_from_find_maximum_matching()
@@ -0,0 +1,206 @@
+from array import array
+from io import StringIO
+import io
+import os
+import random
+import sys
+
+import pytest
+
+import matrix_io
+from matrix_io import *
+from data_structures import Edge
+from find_maximum_matching import main
+
+
+def test_parse_dense_graph():
+    graph = parse_dense_graph(StringIO("0,1,0,0\n1,0,1,1\n0,1,0,1\n0,1,1,0\n"))
+    assert graph.node_to_edges == {0: {1}, 1: {0, 2, 3}, 2: {1, 3}, 3: {1, 2}}
+    assert graph.labels.labels == ['0', '1', '2', '3']
+
+
+def test_parse_dense_graph_without_numpy(monkeypatch):
+    monkeypatch.setattr(matrix_io, "numpy", None)
+    graph = parse_dense_graph(StringIO("0,1,0\n1,0,0\n\n"))
+    assert isinstance(graph.neighbours, array)
+    assert graph.node_to_edges == {0: {1}, 1: {0}, 2: set()}
+
+    with pytest.raises(ValueError):
+        parse_dense_graph(StringIO("0,1\n1,0,0\n"))
+
+
+def test_parse_dense_graph_numpy():
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    for _ in range(50):
+        size = rng.randint(1, 20)
+        rows = [",".join(str(rng.choice([0, 0, 0, 1, 2, -1])) for _ in range(size)) for _ in range(size)]
+        rows.insert(rng.randint(0, size), "")
+        text = "\n".join(rows) + "\n"
+        numpy_graph = parse_dense_graph_numpy(StringIO(text))
+        graph = parse_dense_graph_rows(StringIO(text))
+        assert list(numpy_graph.offsets) == list(graph.offsets)
+        assert list(numpy_graph.neighbours) == list(graph.neighbours)
+        assert numpy_graph.labels.labels == graph.labels.labels
+
+    with pytest.raises(ValueError):
+        parse_dense_graph_numpy(StringIO("0,1,1\n1,0,0\n"))
+
+    # ragged rows are rejected by both parsers, even when they fall in different blocks
+    for text in ("0,1\n1,0,0\n", "0,1\n\n1,0,0\n", "0,1,0\n" * matrix_io._DENSE_BLOCK_ROWS + "1,0\n"):
+        for parse in (parse_dense_graph_numpy, parse_dense_graph_rows):
+            with pytest.raises(ValueError):
+                parse(StringIO(text))
+
+
+def test_parse_edge_list():
+    graph = parse_edge_list(StringIO("# a comment\nA B\nB,C 2.5\n\nC\tA\n"))
+    assert graph.labels.labels == ['A', 'B', 'C']
+    assert graph.node_to_edges == {0: {1, 2}, 1: {0, 2}, 2: {0, 1}}
+
+    try:
+        parse_edge_list(StringIO("A B\nC\n"))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_parse_matrix_market():
+    graph = parse_matrix_market(StringIO(
+        "%%MatrixMarket matrix coordinate real symmetric\n% a comment\n4 4 3\n2 1 1.0\n3 2 0\n4 3 2.0\n"))
+    assert graph.node_to_edges == {0: {1}, 1: {0}, 2: {3}, 3: {2}}
+    assert graph.labels.labels == ['0', '1', '2', '3']
+
+    try:
+        parse_matrix_market(StringIO("%%MatrixMarket matrix array real general\n2 2\n"))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_parse_weighted_graphs():
+    graph, edges = parse_weighted_dense_graph(StringIO("0,3,0\n3,0,2.5\n0,0,0\n"))
+    assert graph.node_to_edges == {0: {1}, 1: {0, 2}, 2: {1}}
+    assert set(edges) == {Edge(0, 1, 3), Edge(1, 2, 2.5)}
+
+    try:
+        parse_weighted_dense_graph(StringIO("0,3\n4,0\n"))
+        assert False
+    except ValueError:
+        pass
+
+    graph, edges = read_weighted_graph(StringIO("A B 4\nB,C\n"), "edge-list")
+    assert graph.labels.labels == ['A', 'B', 'C']
+    assert set(edges) == {Edge(0, 1, 4), Edge(1, 2, 1)}
+
+
+def test_detect_graph_format():
+    assert detect_graph_format(StringIO("0,1,0\n1,0,1\n0,1,0\n")) == "dense"
+    assert detect_graph_format(StringIO("0,1\n1,0\n")) == "dense"
+    assert detect_graph_format(StringIO("0,1\n1,2\n2,3\n")) == "edge-list"
+    assert detect_graph_format(StringIO("A B\n")) == "edge-list"
+    assert detect_graph_format(StringIO("0,1\n1,2\n")) == "edge-list"
+    assert detect_graph_format(StringIO("A,B\n")) == "edge-list"
+    assert detect_graph_format(StringIO("0,1\n")) == "edge-list"
+    assert detect_graph_format(StringIO("0,1,5\n1,2,3\n2,0,4\n")) == "edge-list"
+    assert detect_graph_format(StringIO("0,1,5\n1,2,3\n2,3,4\n3,0,1\n")) == "edge-list"
+    # a file is only read as an edge list if it cannot be a square matrix of zeros and ones
+    assert detect_graph_format(StringIO("0\n")) == "dense"
+    assert detect_graph_format(StringIO("0,1,1\n0,0,0\n0,0,0\n")) == "dense"
+    assert detect_graph_format(StringIO("0,1\n0,0\n")) == "dense"
+    assert detect_graph_format(StringIO("0,1,0,0\n")) == "dense"
+    assert detect_graph_format(StringIO("0,5,0\n5,0,0\n0,0,0\n"), weighted=True) == "dense"
+    assert detect_graph_format(StringIO("0,1,5\n1,2,3\n2,0,4\n"), weighted=True) == "edge-list"
+    assert detect_graph_format(StringIO("%%MatrixMarket matrix coordinate pattern general\n1 1 0\n")) == \
+           "matrix-market"
+
+    # detection rewinds the file so that it can be parsed from the start
+    inhandle = StringIO("A B\nB C\n")
+    detect_graph_format(inhandle)
+    assert inhandle.readline() == "A B\n"
+
+    # sniffing gives back the lines it read instead, so streams that cannot seek can be sniffed too
+    graph_format, graph_lines = sniff_graph_format(StringIO(
+        "%%MatrixMarket matrix coordinate pattern general\n2 2 1\n2 1\n"))
+    assert graph_format == "matrix-market"
+    assert read_graph(graph_lines, graph_format).node_to_edges == {0: {1}, 1: {0}}
+
+
+def test_cli_reads_stdin(tmp_path, monkeypatch, capsys):
+    read_end, write_end = os.pipe()
+    with open(write_end, "w") as outhandle:
+        outhandle.write("0,1,0,0\n1,0,1,1\n0,1,0,1\n0,1,1,0\n")
+    # a pipe cannot seek, just like a real stdin
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(open(read_end, "rb")))
+    monkeypatch.chdir(tmp_path)
+    main(['--graph', '-'])
+    # with no graph file to write next to, the matching goes to stdout
+    assert capsys.readouterr().out == "0,1,0,0\n1,0,0,0\n0,0,0,1\n0,0,1,0\n"
+    assert os.listdir(tmp_path) == []
+
+
+def test_sparse_outputs(tmp_path):
+    graph = CSRGraph.from_labelled_pairs([('A', 'B'), ('B', 'C'), ('C', 'D')])
+    matching = Matching({Edge(0, 1), Edge(2, 3)})
+
+    write_matching(matching, graph, "matrix", str(tmp_path / "matching.csv"))
+    assert (tmp_path / "matching.csv").read_text() == "0,1,0,0\n1,0,0,0\n0,0,0,1\n0,0,1,0\n"
+    assert parse_csv(open(tmp_path / "matching.csv")) == matching.to_matrix(4)
+
+    write_matching(matching, graph, "pairs", str(tmp_path / "matching.txt"))
+    assert set((tmp_path / "matching.txt").read_text().splitlines()) == {"A B", "C D"}
+
+    write_matching(Matching({Edge(0, 1)}), graph, "mates", str(tmp_path / "matching.mates"))
+    assert (tmp_path / "matching.mates").read_text() == "1\n0\n-1\n-1\n"
+
+    write_matching(matching, graph, "binary", str(tmp_path / "matching.bin"))
+    assert os.path.getsize(tmp_path / "matching.bin") == len(BINARY_MATCHING_MAGIC) + 16 + 2 * 8
+    number_of_nodes, loaded_matching = load_binary_matching(str(tmp_path / "matching.bin"))
+    assert number_of_nodes == 4
+    assert loaded_matching.edges == matching.edges
+
+
+def test_cli_round_trips(tmp_path):
+    dense_file = tmp_path / "dense.csv"
+    dense_file.write_text("0,1,0,0\n1,0,1,1\n0,1,0,1\n0,1,1,0\n")
+    main(['--graph', str(dense_file)])
+    assert (tmp_path / "dense_matching.csv").read_text() == "0,1,0,0\n1,0,0,0\n0,0,0,1\n0,0,1,0\n"
+
+    edge_list_file = tmp_path / "edges.txt"
+    edge_list_file.write_text("A B\nB C\nC D\n")
+    main(['--graph', str(edge_list_file), '--algorithm', 'gabow'])
+    assert set((tmp_path / "edges_matching.txt").read_text().splitlines()) == {"A B", "C D"}
+
+    matrix_market_file = tmp_path / "graph.mtx"
+    matrix_market_file.write_text("%%MatrixMarket matrix coordinate pattern symmetric\n3 3 2\n2 1\n3 2\n")
+    main(['--graph', str(matrix_market_file)])
+    matrix_market_lines = (tmp_path / "graph_matching.mtx").read_text().splitlines()
+    assert matrix_market_lines[1] == "3 3 1"
+    assert matrix_market_lines[2] in ("2 1", "3 2")
+
+    main(['--graph', str(dense_file), '--output-format', 'pairs'])
+    assert set((tmp_path / "dense_matching.txt").read_text().splitlines()) == {"0 1", "2 3"}
+
+    weighted_file = tmp_path / "weighted.csv"
+    weighted_file.write_text("0,3,0,0\n3,0,5,0\n0,5,0,4\n0,0,4,0\n")
+    main(['--graph', str(weighted_file), '--weighted', '--output-format', 'pairs'])
+    assert set((tmp_path / "weighted_matching.txt").read_text().splitlines()) == {"0 1", "2 3"}
+
+    weighted_edge_list_file = tmp_path / "weighted_edges.txt"
+    weighted_edge_list_file.write_text("0,1,5\n1,2,3\n2,0,4\n")
+    main(['--graph', str(weighted_edge_list_file), '--weighted'])
+    assert (tmp_path / "weighted_edges_matching.txt").read_text() == "0 1\n"
+
+    isolated_node_file = tmp_path / "isolated.csv"
+    isolated_node_file.write_text("0,5,0\n5,0,0\n0,0,0\n")
+    with pytest.raises(ValueError):
+        main(['--graph', str(isolated_node_file), '--weighted', '--perfect'])
+    assert not os.path.exists(tmp_path / "isolated_matching.csv")
+
+
+if __name__ == "__main__":
+    test_parse_dense_graph()
+    test_parse_edge_list()
+    test_parse_matrix_market()
+    test_parse_weighted_graphs()
+    test_detect_graph_format()
@@ -0,0 +1,59 @@
+from parallel_matching import find_connected_components, batch_components, find_maximum_matching_parallel
+from find_maximum_matching import find_maximum_matching
+from matching_stats import MatchingStats
+from data_structures import Graph
+from csr_graph import CSRGraph
+from concurrent.futures import ThreadPoolExecutor
+from test_util import create_random_graph_fixed_vertices_edges, create_odd_cycle_graph
+import random
+
+
+def create_disjoint_union(graphs):
+    """Relabel the nodes of each graph with its index so that the graphs do not share any nodes"""
+    return Graph({"{}_{}".format(index, node): {"{}_{}".format(index, neighbour) for neighbour in neighbours}
+                  for index, graph in enumerate(graphs) for node, neighbours in graph.node_to_edges.items()})
+
+
+def test_find_connected_components():
+    graph = Graph({'A': {'B'}, 'B': {'A', 'C'}, 'C': {'B'}, 'D': {'E'}, 'E': {'D'}, 'F': set()})
+    components = find_connected_components(graph)
+    assert sorted(sorted(component) for component in components) == [['A', 'B', 'C'], ['D', 'E'], ['F']]
+
+
+def test_batch_components():
+    graph = create_disjoint_union([create_odd_cycle_graph(5), create_odd_cycle_graph(3), Graph({'A': {'B'}}),
+                                   Graph({'C': set()})])
+    batches, trivial_mates = batch_components(graph, find_connected_components(graph), min_batch_edges=4)
+    assert trivial_mates == {'2_A': '2_B', '2_B': '2_A'}
+    assert [len(batch) for batch in batches] == [1, 1]
+
+    batches, _ = batch_components(graph, find_connected_components(graph), min_batch_edges=100)
+    assert [len(batch) for batch in batches] == [2]
+
+
+def test_find_maximum_matching_parallel():
+    random.seed(0)
+    graph = create_disjoint_union([create_random_graph_fixed_vertices_edges(20, 25) for _ in range(12)] +
+                                  [create_odd_cycle_graph(7), Graph({'A': {'B'}}), Graph({'C': set()})])
+    expected_size = len(find_maximum_matching(graph))
+
+    stats = MatchingStats()
+    matching = find_maximum_matching_parallel(graph, max_workers=2, min_batch_edges=50, stats=stats)
+    assert len(matching) == expected_size
+    assert all(matching.mate(matching.mate(node)) == node for node in matching.get_nodes())
+    assert all(graph.get_neighbours(node) & {matching.mate(node)} for node in matching.get_nodes())
+    assert stats.searches > 0 and stats.augmentations > 0
+
+    with ThreadPoolExecutor(2) as executor:
+        matching = find_maximum_matching_parallel(graph, "gabow", "greedy", min_batch_edges=50, executor=executor)
+    assert len(matching) == expected_size
+
+    assert len(find_maximum_matching_parallel(CSRGraph.from_graph(graph), max_workers=1)) == expected_size
+
+
+def test_parallel_stats_report_every_engine():
+    # a triangle and a path in one batch are searched by different engines, whichever comes first
+    graph = create_disjoint_union([create_odd_cycle_graph(3), Graph.from_path(['A', 'B', 'C', 'D'])])
+    stats = MatchingStats()
+    assert len(find_maximum_matching_parallel(graph, max_workers=2, stats=stats)) == 3
+    assert stats.engine == "gabow, hopcroft-karp"
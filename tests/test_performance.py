@@ -0,0 +1,213 @@
+from find_maximum_matching import *
+from test_util import create_random_graph_fixed_vertices_edges, create_odd_cycle_graph, \
+    create_nested_blossom_graph, create_complete_graph, create_grid_graph, create_sparse_random_graph, create_csr_graph
+from dataclasses import dataclass, asdict
+from timeit import default_timer as timer
+import json
+import os
+import random
+import tracemalloc
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "performance_baseline.json")
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The cost of finding a maximum matching of one benchmark graph
+
+    Fields
+    ======
+
+    name: str
+        The name of the benchmark graph
+
+    algorithm: str
+        The algorithm passed to find_maximum_matching
+
+    vertices: int
+        The number of vertices in the graph
+
+    edges: int
+        The number of edges in the graph
+
+    matching_size: int
+        The number of edges in the maximum matching
+
+    augmentations: int
+        The number of times the matching was augmented
+
+    seconds: float
+        The wall time taken to find the matching
+
+    peak_memory_bytes: int
+        The peak memory allocated by Python while finding the matching, measured in a separate run
+
+    edge_set_bytes: int
+        The memory allocated by graph.get_edges(), which shows the cost of each Edge object
+    """
+    name: str
+    algorithm: str
+    vertices: int
+    edges: int
+    matching_size: int
+    augmentations: int
+    seconds: float
+    peak_memory_bytes: int
+    edge_set_bytes: int = 0
+
+    def key(self) -> str:
+        return "{}/{}".format(self.name, self.algorithm)
+
+
+def benchmark_graphs(scale: int = 1) -> Dict[str, Graph]:
+    """The benchmark graphs: random graphs of increasing size, and families that are adversarial for Edmonds'
+    algorithm.  The random graphs are seeded so that every run measures the same graphs"""
+    random.seed(0)
+    graphs = {}
+    for vertices, edges in [(100, 200), (100, 400), (100, 800), (200, 400), (400, 400)]:
+        graphs["random_v{}_e{}".format(vertices * scale, edges * scale)] = \
+            create_random_graph_fixed_vertices_edges(vertices * scale, edges * scale)
+    graphs["sparse_csr_v{}".format(2000 * scale)] = create_sparse_random_graph(2000 * scale, 3 / (2000 * scale), seed=0)
+    side = 200 * scale
+    graphs["bipartite_v{}".format(2 * side)] = \
+        create_csr_graph(2 * side, {(random.randrange(side), side + random.randrange(side)) for _ in range(3 * side)})
+    graphs["odd_cycle_{}".format(201 * scale)] = create_odd_cycle_graph(201 * scale)
+    graphs["nested_blossoms_{}".format(3 + scale)] = create_nested_blossom_graph(3 + scale)
+    graphs["complete_{}".format(31 * scale)] = create_complete_graph(31 * scale)
+    graphs["grid_{}x{}".format(10 * scale, 10 * scale)] = create_grid_graph(10 * scale, 10 * scale)
+    return graphs
+
+
+def run_benchmark(name: str, graph: Graph, algorithm: str) -> BenchmarkResult:
+    augmentations = 0
+
+    def count_augmentation(matching: Matching, path: List[str]) -> None:
+        nonlocal augmentations
+        augmentations += 1
+
+    start = timer()
+    matching = find_maximum_matching(graph, algorithm, on_augmentation=count_augmentation)
+    seconds = timer() - start
+
+    tracemalloc.start()
+    find_maximum_matching(graph, algorithm)
+    _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    edges = graph.get_edges()
+    edge_set_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del edges
+    return BenchmarkResult(name, algorithm, graph.number_of_nodes(), graph.number_of_edges(), len(matching),
+                           augmentations, seconds, peak_memory_bytes, edge_set_bytes)
+
+
+def run_benchmarks(algorithms: List[str], scale: int = 1) -> List[BenchmarkResult]:
+    """Run every algorithm on every benchmark graph, except hopcroft-karp on graphs that are not bipartite"""
+    return [run_benchmark(name, graph, algorithm) for name, graph in benchmark_graphs(scale).items()
+            for algorithm in algorithms if algorithm != "hopcroft-karp" or find_two_colouring(graph) is not None]
+
+
+def write_results(results: List[BenchmarkResult], filename: str) -> None:
+    with open(filename, mode="w+") as outhandle:
+        json.dump([asdict(result) for result in results], outhandle, indent=2)
+
+
+def read_results(filename: str) -> List[BenchmarkResult]:
+    with open(filename) as inhandle:
+        return [BenchmarkResult(**result) for result in json.load(inhandle)]
+
+
+def compare_with_baseline(results: List[BenchmarkResult], baseline: List[BenchmarkResult],
+                          tolerance: float = 1.5, slack_seconds: float = 0.05) -> List[str]:
+    """Describe every result that is more than tolerance times slower or larger than the baseline, or that found a
+    different sized matching.  Timings also get slack_seconds of leeway so that noise in very short benchmarks is not
+    reported.  Benchmarks missing from the baseline are not compared"""
+    baseline_by_key = {result.key(): result for result in baseline}
+    regressions = []
+    for result in results:
+        expected = baseline_by_key.get(result.key())
+        if expected is None:
+            continue
+        if result.matching_size != expected.matching_size:
+            regressions.append("{}: found a matching of size {} but the baseline found {}".format(
+                result.key(), result.matching_size, expected.matching_size))
+        if result.seconds > tolerance * expected.seconds + slack_seconds:
+            regressions.append("{}: took {:.3f}s against a baseline of {:.3f}s".format(
+                result.key(), result.seconds, expected.seconds))
+        if result.peak_memory_bytes > tolerance * expected.peak_memory_bytes:
+            regressions.append("{}: peaked at {} bytes against a baseline of {} bytes".format(
+                result.key(), result.peak_memory_bytes, expected.peak_memory_bytes))
+    return regressions
+
+
+def time_maximum_matching(graph: Graph) -> float:
+    start = timer()
+    find_maximum_matching(graph)
+    return timer() - start
+
+
+def test_linear_in_edges():
+    random.seed(1)
+    vertices = 100
+    times = [time_maximum_matching(create_random_graph_fixed_vertices_edges(vertices, edges)) for edges in (150, 600)]
+    # quadrupling the edges should cost well under the sixteen times a quadratic algorithm would
+    assert times[1] < 10 * times[0]
+
+
+def test_quadratic_in_vertices():
+    random.seed(2)
+    edges = 200
+    times = [time_maximum_matching(create_random_graph_fixed_vertices_edges(vertices, edges))
+             for vertices in (50, 200)]
+    # quadrupling the vertices should cost well under the sixty four times a cubic algorithm would
+    assert times[1] < 32 * times[0]
+
+
+def test_benchmark_results_round_trip(tmp_path):
+    results = [run_benchmark("odd_cycle_21", create_odd_cycle_graph(21), algorithm)
+               for algorithm in list(AUGMENTING_PATH_FINDERS) + ["auto"]]
+    assert all(result.matching_size == 10 and result.edges == 21 for result in results)
+    assert all(result.augmentations > 0 and result.peak_memory_bytes > 0 and result.edge_set_bytes > 0
+               for result in results)
+
+    results_file = str(tmp_path / "results.json")
+    write_results(results, results_file)
+    assert read_results(results_file) == results
+    assert compare_with_baseline(results, results) == []
+
+    slower_results = [BenchmarkResult(**{**asdict(result), "seconds": 10 * result.seconds + 1}) for result in results]
+    assert len(compare_with_baseline(slower_results, results)) == len(results)
+
+
+def test_baseline_is_readable():
+    baseline = read_results(BASELINE_FILE)
+    assert baseline and {result.algorithm for result in baseline} == set(ALGORITHMS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark find_maximum_matching and compare against a baseline")
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=list(ALGORITHMS),
+                        help="The algorithms to benchmark (default: all, with hopcroft-karp on bipartite graphs only)")
+    parser.add_argument('--scale', type=int, default=1, help="Multiply the size of every benchmark graph")
+    parser.add_argument('--output', default="performance_results.json",
+                        help="The json file to write the results to (default: performance_results.json)")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="The json file of baseline results to compare to")
+    parser.add_argument('--update-baseline', action='store_true', help="Overwrite the baseline with these results")
+    args = parser.parse_args()
+
+    benchmark_results = run_benchmarks(args.algorithms, args.scale)
+    for benchmark_result in benchmark_results:
+        print("{:<30} {:>8} vertices {:>8} edges {:>6} augmentations {:>9.3f}s {:>12} bytes {:>9} edge bytes".format(
+            benchmark_result.key(), benchmark_result.vertices, benchmark_result.edges, benchmark_result.augmentations,
+            benchmark_result.seconds, benchmark_result.peak_memory_bytes, benchmark_result.edge_set_bytes))
+    write_results(benchmark_results, args.output)
+    if args.update_baseline:
+        write_results(benchmark_results, args.baseline)
+    elif os.path.exists(args.baseline):
+        baseline_regressions = compare_with_baseline(benchmark_results, read_results(args.baseline))
+        print("\n".join(baseline_regressions) if baseline_regressions else "No regressions against the baseline")
+        if baseline_regressions:
+            sys.exit(1)
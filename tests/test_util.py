@@ -1,6 +1,9 @@
 from data_structures import Graph, Matching, Edge
-from typing import List
-from itertools import product
+from csr_graph import CSRGraph, LabelTable
+from typing import Iterable, Iterator, List, Tuple
+from collections import Counter
+from itertools import accumulate, combinations
+import math
 import random
 
 
@@ -8,35 +11,187 @@ def test_path_equality(path1, path2):
     assert path1 == path2 or path1 == path2[::-1]
 
 
-def create_random_graph(number_of_vertices: int, edge_probability: float) -> Graph:
-    """Creates a random graph on a given number of vertices by flipping a coin for every edge"""
-    graph_matrix = [[0 for _ in range(number_of_vertices)] for _ in range(number_of_vertices)]
-    for i in range(number_of_vertices):
-        for j in range(i + 1, number_of_vertices):
-            if random.random() < edge_probability: # flip a biased coin for every edge
-                graph_matrix[i][j] = 1
-                graph_matrix[j][i] = 1
-    return Graph.from_matrix(graph_matrix)
+def generate_gnp_edges(number_of_vertices: int, edge_probability: float, rng=random) -> Iterator[Tuple[int, int]]:
+    """Stream the edges of an Erdos-Renyi G(n, p) graph in O(V + E) time, by jumping straight from one edge to the next
+    with geometrically distributed skips instead of flipping a coin for every pair (Batagelj and Brandes, 2005)"""
+    if edge_probability <= 0:
+        return
+    if edge_probability >= 1:
+        yield from combinations(range(number_of_vertices), 2)
+        return
+    log_no_edge_probability = math.log(1 - edge_probability)
+    v, w = 1, -1
+    while v < number_of_vertices:
+        w += 1 + int(math.log(1 - rng.random()) / log_no_edge_probability)
+        while w >= v and v < number_of_vertices:
+            w -= v
+            v += 1
+        if v < number_of_vertices:
+            yield w, v
 
 
-def create_random_graph_fixed_vertices_edges(v: int, e: int) -> Graph:
-    """Creates a random graph with a given number of edges and vertices"""
-    if not (v > 0 and 0 <= e <= v*(v - 1)/2):
+def generate_gnm_edges(number_of_vertices: int, number_of_edges: int, rng=random) -> Iterator[Tuple[int, int]]:
+    """Stream the edges of a uniformly random graph with a fixed number of edges.  Sparse graphs draw random pairs and
+    reject repeats, dense ones instead choose which of all the pairs to leave out"""
+    max_edges = number_of_vertices * (number_of_vertices - 1) // 2
+    if not (number_of_vertices > 0 and 0 <= number_of_edges <= max_edges):
         raise ValueError(
             "Unable to create a graph with invalid input.  " +
-            "Number of vertices in input was {} and number of edges was {}".format(v, e))
-    possible_edges = list(filter((lambda x:  x[0] != x[1]), product(range(v), range(v))))
+            "Number of vertices in input was {} and number of edges was {}".format(number_of_vertices, number_of_edges))
+    if number_of_edges > max_edges // 2:
+        left_out = set(generate_gnm_edges(number_of_vertices, max_edges - number_of_edges, rng))
+        yield from (edge for edge in combinations(range(number_of_vertices), 2) if edge not in left_out)
+        return
     chosen_edges = set()
-    while len(chosen_edges) < e:
-        new_edge_vertices = random.choice(possible_edges)
-        new_edge = Edge(str(new_edge_vertices[0]), str(new_edge_vertices[1]))
-        if new_edge not in chosen_edges:
-            chosen_edges.add(new_edge)
-    chosen_graph = Graph.from_edges(chosen_edges)
+    while len(chosen_edges) < number_of_edges:
+        first_vertex, second_vertex = rng.randrange(number_of_vertices), rng.randrange(number_of_vertices)
+        edge = (min(first_vertex, second_vertex), max(first_vertex, second_vertex))
+        if first_vertex != second_vertex and edge not in chosen_edges:
+            chosen_edges.add(edge)
+            yield edge
+
+
+def generate_random_regular_edges(number_of_vertices: int, degree: int, rng=random) -> List[Tuple[int, int]]:
+    """The edges of a random graph in which every vertex has the same degree.  Vertices are paired up at random as in
+    the configuration model, and then any self-loops and repeated edges are removed by swapping endpoints with other
+    randomly chosen edges, which keeps every degree the same"""
+    if degree >= number_of_vertices or (number_of_vertices * degree) % 2 != 0:
+        raise ValueError("There is no {}-regular graph on {} vertices".format(degree, number_of_vertices))
+    endpoints = [vertex for vertex in range(number_of_vertices) for _ in range(degree)]
+    rng.shuffle(endpoints)
+    edges = [(min(endpoints[i], endpoints[i + 1]), max(endpoints[i], endpoints[i + 1]))
+             for i in range(0, len(endpoints), 2)]
+    edge_counts = Counter(edges)
+    bad_edges = [i for i, edge in enumerate(edges) if edge[0] == edge[1] or edge_counts[edge] > 1]
+    attempts = 0
+    while bad_edges:
+        attempts += 1
+        if attempts > 1000 * (len(edges) + 1):
+            raise ValueError("Unable to remove repeated edges from a random {}-regular graph".format(degree))
+        i, j = bad_edges[-1], rng.randrange(len(edges))
+        (a, b), (c, d) = edges[i], edges[j]
+        if rng.random() < 0.5:
+            c, d = d, c
+        new_edges = (min(a, c), max(a, c)), (min(b, d), max(b, d))
+        if i == j or any(u == v or edge_counts[(u, v)] > 0 for u, v in new_edges) or new_edges[0] == new_edges[1]:
+            continue
+        for old_edge in (edges[i], edges[j]):
+            edge_counts[old_edge] -= 1
+        for new_edge in new_edges:
+            edge_counts[new_edge] += 1
+        edges[i], edges[j] = new_edges
+        bad_edges = [k for k in bad_edges if edges[k][0] == edges[k][1] or edge_counts[edges[k]] > 1]
+    return edges
+
+
+def generate_power_law_edges(number_of_vertices: int, number_of_edges: int, exponent: float = 2.5,
+                             rng=random) -> Iterator[Tuple[int, int]]:
+    """Stream the edges of a Chung-Lu style random graph whose degrees follow a power law with the given exponent.
+    The endpoints of each edge are drawn with probability proportional to a weight of (i + 1) ** (-1 / (exponent - 1))
+    for vertex i, and self-loops and repeated edges are rejected"""
+    if exponent <= 1:
+        raise ValueError("The power law exponent must be greater than 1 but was {}".format(exponent))
+    cumulative_weights = list(accumulate((i + 1) ** (-1 / (exponent - 1)) for i in range(number_of_vertices)))
+    vertices = range(number_of_vertices)
+    chosen_edges = set()
+    attempts = 0
+    while len(chosen_edges) < number_of_edges:
+        attempts += 1
+        if attempts > 100 * number_of_edges:
+            raise ValueError("Unable to draw {} distinct edges from a power law on {} vertices".format(
+                number_of_edges, number_of_vertices))
+        first_vertex, second_vertex = rng.choices(vertices, cum_weights=cumulative_weights, k=2)
+        edge = (min(first_vertex, second_vertex), max(first_vertex, second_vertex))
+        if first_vertex != second_vertex and edge not in chosen_edges:
+            chosen_edges.add(edge)
+            yield edge
+
+
+def create_csr_graph(number_of_vertices: int, edges: Iterable[Tuple[int, int]]) -> CSRGraph:
+    """Build a generated graph straight into compressed sparse row form, labelling vertex i as str(i)"""
+    return CSRGraph.from_id_pairs(edges, LabelTable(str(i) for i in range(number_of_vertices)))
+
+
+def create_sparse_random_graph(number_of_vertices: int, edge_probability: float, seed: int = None) -> CSRGraph:
+    return create_csr_graph(number_of_vertices,
+                            generate_gnp_edges(number_of_vertices, edge_probability, random.Random(seed)))
+
+
+def create_random_graph_with_edges(number_of_vertices: int, number_of_edges: int, seed: int = None) -> CSRGraph:
+    return create_csr_graph(number_of_vertices,
+                            generate_gnm_edges(number_of_vertices, number_of_edges, random.Random(seed)))
+
+
+def create_random_regular_graph(number_of_vertices: int, degree: int, seed: int = None) -> CSRGraph:
+    return create_csr_graph(number_of_vertices,
+                            generate_random_regular_edges(number_of_vertices, degree, random.Random(seed)))
+
+
+def create_power_law_graph(number_of_vertices: int, number_of_edges: int, exponent: float = 2.5,
+                           seed: int = None) -> CSRGraph:
+    return create_csr_graph(number_of_vertices, generate_power_law_edges(
+        number_of_vertices, number_of_edges, exponent, random.Random(seed)))
+
+
+def create_random_graph(number_of_vertices: int, edge_probability: float) -> Graph:
+    """Creates a random graph on a given number of vertices, in which every edge is present with a given probability"""
+    graph_dict = {str(i): set() for i in range(number_of_vertices)}
+    for first_vertex, second_vertex in generate_gnp_edges(number_of_vertices, edge_probability):
+        graph_dict[str(first_vertex)].add(str(second_vertex))
+        graph_dict[str(second_vertex)].add(str(first_vertex))
+    return Graph(graph_dict)
+
+
+def create_random_graph_fixed_vertices_edges(v: int, e: int) -> Graph:
+    """Creates a random graph with a given number of edges and vertices"""
+    chosen_graph = Graph.from_edges({Edge(str(first_vertex), str(second_vertex))
+                                     for first_vertex, second_vertex in generate_gnm_edges(v, e)})
     assert len(chosen_graph.get_edges()) == e
     return chosen_graph
 
 
+def create_odd_cycle_graph(number_of_vertices: int) -> Graph:
+    """A single cycle, which is one large blossom when the number of vertices is odd"""
+    return Graph({str(i): {str((i + 1) % number_of_vertices)} for i in range(number_of_vertices)})
+
+
+def create_nested_blossom_graph(depth: int) -> Graph:
+    """Three copies of the graph of the previous depth joined in a triangle, starting from a single vertex, so that
+    blossoms are nested depth deep.  Each level also hangs a pendant vertex off the triangle so augmenting paths have
+    to pass through the nested blossoms"""
+    edges = set()
+    next_label = 0
+
+    def build(level: int) -> str:
+        nonlocal next_label
+        if level == 0:
+            next_label += 1
+            return str(next_label)
+        corners = [build(level - 1) for _ in range(3)]
+        for i in range(3):
+            edges.add(Edge(corners[i], corners[(i + 1) % 3]))
+        next_label += 1
+        edges.add(Edge(corners[0], str(next_label)))
+        return corners[1]
+
+    build(depth)
+    return Graph.from_edges(edges)
+
+
+def create_complete_graph(number_of_vertices: int) -> Graph:
+    return Graph({str(i): {str(j) for j in range(number_of_vertices) if j != i} for i in range(number_of_vertices)})
+
+
+def create_grid_graph(rows: int, columns: int) -> Graph:
+    graph_dict = {}
+    for row in range(rows):
+        for column in range(columns):
+            graph_dict["{},{}".format(row, column)] = (
+                    ({"{},{}".format(row + 1, column)} if row + 1 < rows else set()) |
+                    ({"{},{}".format(row, column + 1)} if column + 1 < columns else set()))
+    return Graph(graph_dict)
+
+
 def brute_force_matchings(graph: Graph, partial_matchings: List[Matching]) -> List[Matching]:
     """Recursive algorithm for brute force maximum matching search"""
     if len(graph.get_edges()) == 0:
@@ -0,0 +1,88 @@
+from weighted_matching import *
+from find_maximum_matching import find_maximum_matching
+from test_util import create_random_graph
+import itertools
+import random
+
+
+def find_heaviest_matching_brute_force(edges, max_cardinality=False):
+    """The size and weight of the best matching, trying every subset of the edges"""
+    best = (0, 0)
+    for number_of_edges in range(1, len(edges) + 1):
+        for subset in itertools.combinations(edges, number_of_edges):
+            nodes = [node for edge in subset for node in (edge.node_one, edge.node_two)]
+            if len(nodes) == len(set(nodes)):
+                best = max(best, (len(subset) if max_cardinality else 0, sum(edge.weight for edge in subset)))
+    return best
+
+
+def test_maximum_weight_matching():
+    # the heavy middle edge of a path is worth less than the two edges either side of it
+    edges = [Edge('A', 'B', 3), Edge('B', 'C', 5), Edge('C', 'D', 4)]
+    matching = find_maximum_weight_matching(edges)
+    assert matching.edges == {Edge('A', 'B'), Edge('C', 'D')}
+    assert get_matching_weight(matching, edges) == 7
+
+    assert len(find_maximum_weight_matching([Edge('A', 'B', -1)])) == 0
+    assert len(find_maximum_weight_matching([Edge('A', 'B', -1)], max_cardinality=True)) == 1
+    assert len(find_maximum_weight_matching([])) == 0
+
+
+def test_maximum_weight_matching_through_blossoms():
+    # a triangle with a pendant edge hanging off two of its corners
+    edges = [Edge('A', 'B', 8), Edge('B', 'C', 9), Edge('A', 'C', 10), Edge('C', 'D', 6), Edge('A', 'E', 7)]
+    matching = find_maximum_weight_matching(edges)
+    assert matching.edges == {Edge('A', 'E'), Edge('B', 'C')}
+    assert get_matching_weight(matching, edges) == 16
+
+
+def test_maximum_weight_perfect_matching():
+    # the heaviest matching leaves A and D exposed, but a perfect one exists
+    edges = [Edge('A', 'B', 1), Edge('B', 'C', 10), Edge('C', 'D', 1), Edge('E', 'F', 1)]
+    assert get_matching_weight(find_maximum_weight_matching(edges), edges) == 11
+    perfect_matching = find_maximum_weight_perfect_matching(edges)
+    assert len(perfect_matching) == 3 and get_matching_weight(perfect_matching, edges) == 3
+
+    try:
+        find_maximum_weight_perfect_matching([Edge('A', 'B', 1), Edge('B', 'C', 1)])
+        assert False
+    except ValueError:
+        pass
+
+    # an isolated node cannot be covered, although it does not appear in the edges
+    assert len(find_maximum_weight_perfect_matching([Edge('A', 'B', 5)], ['A', 'B'])) == 1
+    try:
+        find_maximum_weight_perfect_matching([Edge('A', 'B', 5)], ['A', 'B', 'C'])
+        assert False
+    except ValueError:
+        pass
+
+
+def test_weighted_matchings_are_heaviest():
+    random.seed(4)
+    for i in range(200):
+        nodes = [str(node) for node in range(random.randint(2, 7))]
+        edges = [Edge(first_node, second_node, random.randint(-2, 10) if i % 2 else random.random())
+                 for first_node, second_node in itertools.combinations(nodes, 2) if random.random() < 0.5]
+        for max_cardinality in (False, True):
+            matching = find_maximum_weight_matching(edges, max_cardinality)
+            expected_size, expected_weight = find_heaviest_matching_brute_force(edges, max_cardinality)
+            assert abs(get_matching_weight(matching, edges) - expected_weight) < 1e-9
+            if max_cardinality:
+                assert len(matching) == expected_size
+
+
+def test_unit_weights_give_maximum_matching():
+    for i in range(20):
+        graph = create_random_graph(16, 0.2)
+        matching = find_maximum_weight_matching(
+            Edge(node, neighbour) for node in graph.node_to_edges for neighbour in graph.get_neighbours(node))
+        assert len(matching) == len(find_maximum_matching(graph))
+
+
+if __name__ == "__main__":
+    test_maximum_weight_matching()
+    test_maximum_weight_matching_through_blossoms()
+    test_maximum_weight_perfect_matching()
+    test_weighted_matchings_are_heaviest()
+    test_unit_weights_give_maximum_matching()
@@ -0,0 +1,402 @@
+from typing import Iterable, List, Optional, Tuple
+
+from csr_graph import LabelTable
+from data_structures import Edge, Matching
+
+# the labels given to the top level blossoms of the alternating forest.  Even blossoms are at an even distance from an
+# exposed root and odd blossoms at an odd distance.  _VISITED is added to the label of even blossoms while
+# _scan_for_base walks up the forest
+_FREE, _EVEN, _ODD, _VISITED = 0, 1, 2, 4
+
+
+def _deduplicate_edges(edges: Iterable[Edge]) -> Tuple[LabelTable, List[Tuple[int, int, float]]]:
+    """Intern the labels of the edges and keep the heaviest edge between each pair of nodes"""
+    labels = LabelTable()
+    weights = {}
+    for edge in edges:
+        first_node, second_node = sorted((labels.intern(edge.node_one), labels.intern(edge.node_two)))
+        if weights.get((first_node, second_node), edge.weight) <= edge.weight:
+            weights[(first_node, second_node)] = edge.weight
+    return labels, [(first_node, second_node, weight) for (first_node, second_node), weight in weights.items()]
+
+
+def _find_maximum_weight_mates(number_of_nodes: int, edges: List[Tuple[int, int, float]],
+                               max_cardinality: bool) -> List[int]:
+    """
+    The primal-dual blossom algorithm of Edmonds and Galil, in the O(V^3) form described by Galil's "Efficient
+    algorithms for finding maximum matching in graphs" and popularised by Joris van Rantwijk's implementation.
+
+    Nodes are the integers 0 to number_of_nodes - 1, and blossoms are number_of_nodes to 2 * number_of_nodes - 1.
+    Edge k has the two endpoints 2k and 2k + 1, so that an endpoint p and the other end of its edge, p ^ 1, can be
+    stored as plain integers: mate[v] is the endpoint at the far end of v's matched edge, and label_end[b] the
+    endpoint through which blossom b was labelled.  Each of the O(V) stages grows an alternating forest along edges
+    of zero slack, adjusting the dual variables by the largest step that keeps every slack non-negative whenever the
+    forest gets stuck, until it finds an augmenting path or the duals prove the matching is optimal.
+
+    Returns the mate of every node, or -1 for exposed nodes.
+    """
+    integer_weights = all(isinstance(weight, int) for _, _, weight in edges)
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * len(edges))]
+    neighbour_endpoints = [[] for _ in range(number_of_nodes)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbour_endpoints[i].append(2 * k + 1)
+        neighbour_endpoints[j].append(2 * k)
+
+    mate = [-1] * number_of_nodes
+    label = [_FREE] * (2 * number_of_nodes)
+    label_end = [-1] * (2 * number_of_nodes)
+    in_blossom = list(range(number_of_nodes))
+    blossom_parent = [-1] * (2 * number_of_nodes)
+    blossom_children = [None] * (2 * number_of_nodes)
+    blossom_base = list(range(number_of_nodes)) + [-1] * number_of_nodes
+    blossom_endpoints = [None] * (2 * number_of_nodes)
+    best_edge = [-1] * (2 * number_of_nodes)
+    blossom_best_edges = [None] * (2 * number_of_nodes)
+    unused_blossoms = list(range(number_of_nodes, 2 * number_of_nodes))
+    max_weight = max([0] + [weight for _, _, weight in edges])
+    dual = [max_weight] * number_of_nodes + [0] * number_of_nodes
+    allowed_edge = [False] * len(edges)
+    queue = []
+
+    def slack(k: int) -> float:
+        i, j, weight = edges[k]
+        return dual[i] + dual[j] - 2 * weight
+
+    def blossom_leaves(b: int) -> Iterable[int]:
+        if b < number_of_nodes:
+            yield b
+        else:
+            for child in blossom_children[b]:
+                yield from blossom_leaves(child)
+
+    def assign_label(w: int, t: int, p: int) -> None:
+        b = in_blossom[w]
+        label[w] = label[b] = t
+        label_end[w] = label_end[b] = p
+        best_edge[w] = best_edge[b] = -1
+        if t == _EVEN:
+            queue.extend(blossom_leaves(b))
+        else:
+            base = blossom_base[b]
+            assign_label(endpoint[mate[base]], _EVEN, mate[base] ^ 1)
+
+    def scan_for_base(v: int, w: int) -> int:
+        """Walk up the forest from v and w in turn.  Return the base of the new blossom if they meet, or -1 if they
+        reach different roots and so have found an augmenting path"""
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = in_blossom[v]
+            if label[b] & _VISITED:
+                base = blossom_base[b]
+                break
+            path.append(b)
+            label[b] = _EVEN | _VISITED
+            if label_end[b] == -1:
+                v = -1
+            else:
+                v = endpoint[label_end[b]]
+                b = in_blossom[v]
+                v = endpoint[label_end[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = _EVEN
+        return base
+
+    def add_blossom(base: int, k: int) -> None:
+        v, w, _ = edges[k]
+        base_blossom, v_blossom, w_blossom = in_blossom[base], in_blossom[v], in_blossom[w]
+        b = unused_blossoms.pop()
+        blossom_base[b] = base
+        blossom_parent[b] = -1
+        blossom_parent[base_blossom] = b
+        blossom_children[b] = path = []
+        blossom_endpoints[b] = endpoints = []
+        while v_blossom != base_blossom:
+            blossom_parent[v_blossom] = b
+            path.append(v_blossom)
+            endpoints.append(label_end[v_blossom])
+            v = endpoint[label_end[v_blossom]]
+            v_blossom = in_blossom[v]
+        path.append(base_blossom)
+        path.reverse()
+        endpoints.reverse()
+        endpoints.append(2 * k)
+        while w_blossom != base_blossom:
+            blossom_parent[w_blossom] = b
+            path.append(w_blossom)
+            endpoints.append(label_end[w_blossom] ^ 1)
+            w = endpoint[label_end[w_blossom]]
+            w_blossom = in_blossom[w]
+        label[b] = _EVEN
+        label_end[b] = label_end[base_blossom]
+        dual[b] = 0
+        for leaf in blossom_leaves(b):
+            if label[in_blossom[leaf]] == _ODD:
+                queue.append(leaf)
+            in_blossom[leaf] = b
+
+        # keep the least slack edge from the new blossom to each neighbouring even blossom
+        best_edge_to = [-1] * (2 * number_of_nodes)
+        for child in path:
+            if blossom_best_edges[child] is None:
+                edge_lists = [[p // 2 for p in neighbour_endpoints[leaf]] for leaf in blossom_leaves(child)]
+            else:
+                edge_lists = [blossom_best_edges[child]]
+            for edge_list in edge_lists:
+                for edge in edge_list:
+                    i, j, _ = edges[edge]
+                    if in_blossom[j] == b:
+                        i, j = j, i
+                    j_blossom = in_blossom[j]
+                    if j_blossom != b and label[j_blossom] == _EVEN and \
+                            (best_edge_to[j_blossom] == -1 or slack(edge) < slack(best_edge_to[j_blossom])):
+                        best_edge_to[j_blossom] = edge
+            blossom_best_edges[child] = None
+            best_edge[child] = -1
+        blossom_best_edges[b] = [edge for edge in best_edge_to if edge != -1]
+        best_edge[b] = min(blossom_best_edges[b], key=slack, default=-1)
+
+    def expand_blossom(b: int, end_of_stage: bool) -> None:
+        for child in blossom_children[b]:
+            blossom_parent[child] = -1
+            if child < number_of_nodes:
+                in_blossom[child] = child
+            elif end_of_stage and dual[child] == 0:
+                expand_blossom(child, end_of_stage)
+            else:
+                for leaf in blossom_leaves(child):
+                    in_blossom[leaf] = child
+
+        if not end_of_stage and label[b] == _ODD:
+            # relabel the children on the even length path from the child the blossom was entered by to its base
+            entry_child = in_blossom[endpoint[label_end[b] ^ 1]]
+            j = blossom_children[b].index(entry_child)
+            if j & 1:
+                j -= len(blossom_children[b])
+                step, endpoint_trick = 1, 0
+            else:
+                step, endpoint_trick = -1, 1
+            p = label_end[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = _FREE
+                label[endpoint[blossom_endpoints[b][j - endpoint_trick] ^ endpoint_trick ^ 1]] = _FREE
+                assign_label(endpoint[p ^ 1], _ODD, p)
+                allowed_edge[blossom_endpoints[b][j - endpoint_trick] // 2] = True
+                j += step
+                p = blossom_endpoints[b][j - endpoint_trick] ^ endpoint_trick
+                allowed_edge[p // 2] = True
+                j += step
+            child = blossom_children[b][j]
+            label[endpoint[p ^ 1]] = label[child] = _ODD
+            label_end[endpoint[p ^ 1]] = label_end[child] = p
+            best_edge[child] = -1
+            j += step
+            # the children on the other path may have been reached from outside the blossom, and become odd again
+            while blossom_children[b][j] != entry_child:
+                child = blossom_children[b][j]
+                if label[child] == _EVEN:
+                    j += step
+                    continue
+                labelled_leaf = next((leaf for leaf in blossom_leaves(child) if label[leaf] != _FREE), None)
+                if labelled_leaf is not None:
+                    label[labelled_leaf] = _FREE
+                    label[endpoint[mate[blossom_base[child]]]] = _FREE
+                    assign_label(labelled_leaf, _ODD, label_end[labelled_leaf])
+                j += step
+
+        label[b] = label_end[b] = -1
+        blossom_children[b] = blossom_endpoints[b] = None
+        blossom_base[b] = -1
+        blossom_best_edges[b] = None
+        best_edge[b] = -1
+        unused_blossoms.append(b)
+
+    def augment_blossom(b: int, v: int) -> None:
+        """Swap the matched and unmatched edges on the path from v to the base of blossom b, which makes v the base"""
+        t = v
+        while blossom_parent[t] != b:
+            t = blossom_parent[t]
+        if t >= number_of_nodes:
+            augment_blossom(t, v)
+        i = j = blossom_children[b].index(t)
+        if i & 1:
+            j -= len(blossom_children[b])
+            step, endpoint_trick = 1, 0
+        else:
+            step, endpoint_trick = -1, 1
+        while j != 0:
+            j += step
+            t = blossom_children[b][j]
+            p = blossom_endpoints[b][j - endpoint_trick] ^ endpoint_trick
+            if t >= number_of_nodes:
+                augment_blossom(t, endpoint[p])
+            j += step
+            t = blossom_children[b][j]
+            if t >= number_of_nodes:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossom_children[b] = blossom_children[b][i:] + blossom_children[b][:i]
+        blossom_endpoints[b] = blossom_endpoints[b][i:] + blossom_endpoints[b][:i]
+        blossom_base[b] = blossom_base[blossom_children[b][0]]
+
+    def augment_matching(k: int) -> None:
+        """Augment along the path through edge k, which joins the trees of two different exposed roots"""
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                s_blossom = in_blossom[s]
+                if s_blossom >= number_of_nodes:
+                    augment_blossom(s_blossom, s)
+                mate[s] = p
+                if label_end[s_blossom] == -1:
+                    break
+                t = endpoint[label_end[s_blossom]]
+                t_blossom = in_blossom[t]
+                s = endpoint[label_end[t_blossom]]
+                j = endpoint[label_end[t_blossom] ^ 1]
+                if t_blossom >= number_of_nodes:
+                    augment_blossom(t_blossom, j)
+                mate[j] = label_end[t_blossom]
+                p = label_end[t_blossom] ^ 1
+
+    for _ in range(number_of_nodes):
+        label[:] = [_FREE] * (2 * number_of_nodes)
+        best_edge[:] = [-1] * (2 * number_of_nodes)
+        blossom_best_edges[number_of_nodes:] = [None] * number_of_nodes
+        allowed_edge[:] = [False] * len(edges)
+        queue[:] = []
+        for v in range(number_of_nodes):
+            if mate[v] == -1 and label[in_blossom[v]] == _FREE:
+                assign_label(v, _EVEN, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbour_endpoints[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if in_blossom[v] == in_blossom[w]:
+                        continue
+                    if not allowed_edge[k]:
+                        k_slack = slack(k)
+                        if k_slack <= 0:
+                            allowed_edge[k] = True
+                    if allowed_edge[k]:
+                        if label[in_blossom[w]] == _FREE:
+                            assign_label(w, _ODD, p ^ 1)
+                        elif label[in_blossom[w]] == _EVEN:
+                            base = scan_for_base(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == _FREE:
+                            label[w] = _ODD
+                            label_end[w] = p ^ 1
+                    elif label[in_blossom[w]] == _EVEN:
+                        b = in_blossom[v]
+                        if best_edge[b] == -1 or k_slack < slack(best_edge[b]):
+                            best_edge[b] = k
+                    elif label[w] == _FREE:
+                        if best_edge[w] == -1 or k_slack < slack(best_edge[w]):
+                            best_edge[w] = k
+            if augmented:
+                break
+
+            # no tight edge grows the forest, so find the largest change to the duals that keeps them feasible:
+            # 1. the smallest dual of a node, when the matching is already optimal
+            # 2. the least slack edge from an even node to a free node
+            # 3. half the least slack edge between two even blossoms
+            # 4. the smallest dual of an odd blossom, which is then expanded
+            delta_type, delta, delta_edge, delta_blossom = -1, None, None, None
+            if not max_cardinality:
+                delta_type, delta = 1, min(dual[:number_of_nodes])
+            for v in range(number_of_nodes):
+                if label[in_blossom[v]] == _FREE and best_edge[v] != -1:
+                    d = slack(best_edge[v])
+                    if delta_type == -1 or d < delta:
+                        delta_type, delta, delta_edge = 2, d, best_edge[v]
+            for b in range(2 * number_of_nodes):
+                if blossom_parent[b] == -1 and label[b] == _EVEN and best_edge[b] != -1:
+                    d = slack(best_edge[b]) // 2 if integer_weights else slack(best_edge[b]) / 2
+                    if delta_type == -1 or d < delta:
+                        delta_type, delta, delta_edge = 3, d, best_edge[b]
+            for b in range(number_of_nodes, 2 * number_of_nodes):
+                if blossom_base[b] >= 0 and blossom_parent[b] == -1 and label[b] == _ODD and \
+                        (delta_type == -1 or dual[b] < delta):
+                    delta_type, delta, delta_blossom = 4, dual[b], b
+            if delta_type == -1:
+                # with max_cardinality there is no augmenting path left, so finish by making the duals optimal
+                delta_type, delta = 1, max(0, min(dual[:number_of_nodes]))
+
+            for v in range(number_of_nodes):
+                if label[in_blossom[v]] == _EVEN:
+                    dual[v] -= delta
+                elif label[in_blossom[v]] == _ODD:
+                    dual[v] += delta
+            for b in range(number_of_nodes, 2 * number_of_nodes):
+                if blossom_base[b] >= 0 and blossom_parent[b] == -1:
+                    if label[b] == _EVEN:
+                        dual[b] += delta
+                    elif label[b] == _ODD:
+                        dual[b] -= delta
+
+            if delta_type == 1:
+                break
+            elif delta_type == 2:
+                allowed_edge[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                queue.append(j if label[in_blossom[i]] == _FREE else i)
+            elif delta_type == 3:
+                allowed_edge[delta_edge] = True
+                queue.append(edges[delta_edge][0])
+            else:
+                expand_blossom(delta_blossom, False)
+
+        if not augmented:
+            break
+        # even blossoms whose dual has reached zero are no longer needed
+        for b in range(number_of_nodes, 2 * number_of_nodes):
+            if blossom_parent[b] == -1 and blossom_base[b] >= 0 and label[b] == _EVEN and dual[b] == 0:
+                expand_blossom(b, True)
+
+    return [endpoint[mate[v]] if mate[v] >= 0 else -1 for v in range(number_of_nodes)]
+
+
+def find_maximum_weight_matching(edges: Iterable[Edge], max_cardinality: bool = False) -> Matching:
+    """
+    Find a matching of the greatest total weight, using the weight of each Edge.  Edges with negative weight are never
+    worth matching unless max_cardinality is set, in which case the heaviest of the matchings of greatest size is
+    found.  If there are several edges between the same nodes only the heaviest is used.  Runs in O(V^3), and integer
+    weights are handled exactly.
+    """
+    labels, weighted_edges = _deduplicate_edges(edges)
+    mates = _find_maximum_weight_mates(len(labels), weighted_edges, max_cardinality)
+    return Matching.from_mates({labels.get_label(node): labels.get_label(mate)
+                                for node, mate in enumerate(mates) if mate != -1})
+
+
+def find_maximum_weight_perfect_matching(edges: Iterable[Edge], nodes: Optional[Iterable] = None) -> Matching:
+    """Find the heaviest matching that covers every node, raising a ValueError if there is no such matching.  The
+    nodes default to those of the edges, so a graph with isolated nodes must pass all of its nodes"""
+    edges = list(edges)
+    nodes = set(node for edge in edges for node in (edge.node_one, edge.node_two)).union(() if nodes is None else nodes)
+    matching = find_maximum_weight_matching(edges, max_cardinality=True)
+    if 2 * len(matching) != len(nodes):
+        raise ValueError("The graph has no perfect matching: at most {} of its {} nodes can be matched".format(
+            2 * len(matching), len(nodes)))
+    return matching
+
+
+def get_matching_weight(matching: Matching, edges: Iterable[Edge]) -> float:
+    """The total weight of the matched edges, taking the heaviest edge between each pair of nodes"""
+    weights = {}
+    for edge in edges:
+        weights[edge.nodes] = max(weights.get(edge.nodes, edge.weight), edge.weight)
+    return sum(weights[edge.nodes] for edge in matching.edges)